@@ -24,6 +24,7 @@ from api.routes.chat import router as chat_router
 from api.routes.models import router as models_router
 from api.routes.packs import router as packs_router
 from api.routes.files import router as files_router
+from api.routes.batch import router as batch_router
 from api.schemas import StatsResponse
 from api.storage import init_storage, get_storage
 
@@ -52,6 +53,7 @@ app.include_router(chat_router)
 app.include_router(models_router)
 app.include_router(packs_router)
 app.include_router(files_router)
+app.include_router(batch_router)
 
 
 @app.get("/")
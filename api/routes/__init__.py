@@ -7,6 +7,7 @@ from api.routes.chat import router as chat_router
 from api.routes.models import router as models_router
 from api.routes.packs import router as packs_router
 from api.routes.files import router as files_router
+from api.routes.batch import router as batch_router
 
 __all__ = [
     "capes_router",
@@ -14,4 +15,5 @@ __all__ = [
     "models_router",
     "packs_router",
     "files_router",
+    "batch_router",
 ]
@@ -0,0 +1,186 @@
+"""
+Batch Routes - Multiple API calls in a single HTTP round-trip.
+
+Provides:
+- POST /api/batch - Dispatch a multipart/mixed body of embedded HTTP requests
+
+Each part of the request body has ``Content-Type: application/http`` and
+contains a raw HTTP request (request line, headers, optional body). The
+response mirrors that layout: one ``application/http`` part per sub-request,
+in the same order, carrying the raw sub-response. An optional ``Content-ID``
+on a request part is echoed back as ``response-<id>``.
+
+Example part:
+
+    --batch_boundary
+    Content-Type: application/http
+    Content-ID: 1
+
+    GET /api/files/stats HTTP/1.1
+
+    --batch_boundary--
+"""
+
+import posixpath
+import uuid
+from email.message import Message
+from email.parser import BytesParser
+from email.policy import HTTP
+from http import HTTPStatus
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import unquote, urlsplit
+
+import httpx
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import Response
+
+# Upper bound on sub-requests per batch
+MAX_BATCH_SIZE = 100
+
+BATCH_PATH = "/api/batch"
+
+
+router = APIRouter(prefix=BATCH_PATH, tags=["batch"])
+
+
+def _parse_embedded_request(
+    raw: bytes,
+) -> Tuple[str, str, Dict[str, str], bytes]:
+    """Split a raw HTTP request into method, path, headers and body."""
+    head, _, body = raw.partition(b"\r\n\r\n")
+    if not _:
+        head, _, body = raw.partition(b"\n\n")
+
+    lines = head.decode("latin-1").splitlines()
+    if not lines:
+        raise ValueError("Empty sub-request")
+
+    request_line = lines[0].split()
+    if len(request_line) < 2:
+        raise ValueError(f"Malformed request line: {lines[0]!r}")
+    method, path = request_line[0].upper(), request_line[1]
+
+    headers = {}
+    for line in lines[1:]:
+        if not line.strip():
+            continue
+        name, sep, value = line.partition(":")
+        if not sep:
+            raise ValueError(f"Malformed header: {line!r}")
+        headers[name.strip()] = value.strip()
+
+    return method, path, headers, body
+
+
+def _check_sub_request_target(target: str) -> None:
+    """
+    Reject sub-request targets that are not a plain path, or that point
+    back at the batch endpoint.
+
+    Only origin-form targets ("/path?query") are accepted, so an absolute
+    URL cannot smuggle a nested batch past the path check; the path is
+    compared after percent-decoding and dot/slash normalization.
+    """
+    parts = urlsplit(target)
+    if parts.scheme or parts.netloc or not parts.path.startswith("/"):
+        raise ValueError(f"Sub-request target must be a path: {target!r}")
+
+    if posixpath.normpath(unquote(parts.path)) == BATCH_PATH:
+        raise ValueError("Nested batch requests are not allowed")
+
+
+def _parse_batch_body(content_type: str, body: bytes) -> List[Message]:
+    """Parse a multipart/mixed body into its parts."""
+    envelope = b"Content-Type: " + content_type.encode("latin-1") + b"\r\n\r\n"
+    message = BytesParser(policy=HTTP).parsebytes(envelope + body)
+    if not message.is_multipart():
+        raise ValueError("Batch body must be multipart/mixed")
+    return list(message.iter_parts())
+
+
+def _encode_sub_response(
+    response: httpx.Response, content_id: Optional[str]
+) -> bytes:
+    """Serialize one sub-response as an application/http part body."""
+    try:
+        reason = HTTPStatus(response.status_code).phrase
+    except ValueError:
+        reason = ""
+
+    lines = [f"HTTP/1.1 {response.status_code} {reason}".rstrip()]
+    for name, value in response.headers.items():
+        if name.lower() != "content-length":
+            lines.append(f"{name}: {value}")
+    lines.append(f"Content-Length: {len(response.content)}")
+
+    part_headers = ["Content-Type: application/http"]
+    if content_id:
+        part_headers.append(f"Content-ID: response-{content_id}")
+
+    return (
+        "\r\n".join(part_headers).encode("latin-1")
+        + b"\r\n\r\n"
+        + "\r\n".join(lines).encode("latin-1")
+        + b"\r\n\r\n"
+        + response.content
+    )
+
+
+@router.post("")
+async def batch(request: Request):
+    """
+    Execute several API calls in one request.
+
+    Sub-requests are dispatched in order against this application, so a
+    client can fold independent queries (metadata, listings, stats) into a
+    single round-trip. Nested batches are rejected per sub-request.
+    """
+    content_type = request.headers.get("content-type", "")
+    if not content_type.lower().startswith("multipart/mixed"):
+        raise HTTPException(
+            status_code=415,
+            detail="Batch requests must use Content-Type: multipart/mixed",
+        )
+
+    try:
+        parts = _parse_batch_body(content_type, await request.body())
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    if len(parts) > MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large: {len(parts)} > {MAX_BATCH_SIZE} sub-requests",
+        )
+
+    boundary = f"batch_{uuid.uuid4().hex}"
+    chunks = []
+
+    transport = httpx.ASGITransport(app=request.app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url=str(request.base_url)
+    ) as client:
+        for part in parts:
+            content_id = part.get("Content-ID")
+            try:
+                method, path, headers, body = _parse_embedded_request(
+                    part.get_payload(decode=True) or b""
+                )
+                _check_sub_request_target(path)
+            except ValueError as e:
+                sub_response = httpx.Response(400, json={"detail": str(e)})
+            else:
+                sub_response = await client.request(
+                    method, path, headers=headers, content=body or None
+                )
+
+            chunks.append(f"--{boundary}\r\n".encode("latin-1"))
+            chunks.append(_encode_sub_response(sub_response, content_id))
+            chunks.append(b"\r\n")
+
+    chunks.append(f"--{boundary}--\r\n".encode("latin-1"))
+
+    return Response(
+        content=b"".join(chunks),
+        media_type=f"multipart/mixed; boundary={boundary}",
+    )
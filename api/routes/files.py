@@ -12,11 +12,13 @@ Provides:
 - GET /api/files/stats - Get storage statistics
 """
 
+import asyncio
 import uuid
 from typing import Any, Dict, List, Optional
 
 from fastapi import APIRouter, File, Form, HTTPException, Query, UploadFile
-from fastapi.responses import Response, StreamingResponse
+from fastapi.responses import FileResponse as FileDownload
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
 from api.deps import get_registry, get_runtime
@@ -158,35 +160,32 @@ async def upload_files(
     if not session_id:
         session_id = str(uuid.uuid4())
 
-    uploaded_files = []
-    total_size = 0
-
-    for file in files:
-        try:
-            content = await file.read()
-
-            metadata = await storage.upload(
-                content=content,
-                filename=file.filename or "unnamed",
-                session_id=session_id,
-                cape_id=cape_id,
-                content_type=file.content_type,
-            )
-
-            uploaded_files.append(FileResponse.from_metadata(metadata))
-            total_size += metadata.size_bytes
+    try:
+        # Parts are independent: read them concurrently (spooled parts
+        # read from disk in the threadpool), then store them in one batch
+        contents = await asyncio.gather(*(file.read() for file in files))
+
+        results = await storage.upload_many(
+            [
+                (content, file.filename or "unnamed")
+                for content, file in zip(contents, files)
+            ],
+            session_id=session_id,
+            cape_id=cape_id,
+            content_types=[file.content_type for file in files],
+        )
 
-        except FileTooLargeError as e:
-            raise HTTPException(status_code=413, detail=str(e))
-        except InvalidFileTypeError as e:
-            raise HTTPException(status_code=415, detail=str(e))
-        except Exception as e:
-            raise HTTPException(status_code=500, detail=f"Upload failed: {e}")
+    except FileTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except InvalidFileTypeError as e:
+        raise HTTPException(status_code=415, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Upload failed: {e}")
 
     return UploadResponse(
-        files=uploaded_files,
+        files=[FileResponse.from_metadata(metadata) for metadata in results],
         session_id=session_id,
-        total_size_bytes=total_size,
+        total_size_bytes=sum(metadata.size_bytes for metadata in results),
     )
 
 
@@ -204,7 +203,7 @@ async def download_file(
     storage = get_storage()
 
     try:
-        content, metadata = await storage.download(file_id)
+        file_path, metadata = await storage.get_path(file_id)
     except StorageFileNotFoundError:
         raise HTTPException(status_code=404, detail=f"File not found: {file_id}")
 
@@ -214,12 +213,13 @@ async def download_file(
     else:
         disposition = f'attachment; filename="{metadata.original_name}"'
 
-    return Response(
-        content=content,
+    # Streamed from disk (sendfile where the server supports it), so the
+    # body is never held in memory; Content-Length comes from stat()
+    return FileDownload(
+        file_path,
         media_type=metadata.content_type,
         headers={
             "Content-Disposition": disposition,
-            "Content-Length": str(metadata.size_bytes),
             "X-File-Id": metadata.file_id,
             "X-File-Checksum": metadata.checksum,
         },
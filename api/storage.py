@@ -27,6 +27,16 @@ from typing import Any, BinaryIO, Dict, List, Optional, Tuple, Union
 logger = logging.getLogger(__name__)
 
 
+def _checksum(data: bytes) -> str:
+    """
+    Content checksum.
+
+    SHA-256 rather than MD5: OpenSSL uses the CPU's SHA extensions where
+    available, which makes it the faster of the two on current hardware.
+    """
+    return hashlib.sha256(data).hexdigest()
+
+
 class StorageBackend(str, Enum):
     """Storage backend type."""
     LOCAL = "local"
@@ -50,7 +60,7 @@ class FileMetadata:
     stored_name: str
     content_type: str
     size_bytes: int
-    checksum: str  # MD5
+    checksum: str  # SHA-256 hex digest
     status: FileStatus
     session_id: Optional[str]
     created_at: datetime
@@ -160,6 +170,12 @@ class FileStorage:
         if self.config.base_dir is None:
             self.config.base_dir = Path.cwd() / ".cape_storage"
 
+        # Upload limits, precomputed for _validate_upload
+        self._allowed_extensions = frozenset(
+            ext.lower() for ext in self.config.allowed_extensions
+        )
+        self._max_file_bytes = self.config.max_file_size_mb * 1024 * 1024
+
         # In-memory metadata index
         self._files: Dict[str, FileMetadata] = {}
         self._session_files: Dict[str, List[str]] = {}  # session_id -> file_ids
@@ -224,9 +240,67 @@ class FileStorage:
             FileTooLargeError: If file exceeds size limit
             InvalidFileTypeError: If file type not allowed
         """
+        data, ext = self._validate_upload(content, filename)
+        storage_dir = self._upload_dir(session_id)
+        return await self._store_upload(
+            data, ext, filename, storage_dir, session_id, cape_id, content_type
+        )
+
+    async def upload_many(
+        self,
+        files: List[Tuple[Union[bytes, BinaryIO], str]],
+        session_id: Optional[str] = None,
+        cape_id: Optional[str] = None,
+        content_types: Optional[List[Optional[str]]] = None,
+    ) -> List[FileMetadata]:
+        """
+        Upload several files into one session.
+
+        Every file is validated before any is written, so a rejected file
+        leaves nothing behind. The session directory is created once and the
+        metadata sidecars are written together after all file bodies.
+
+        Args:
+            files: (content, filename) pairs
+            session_id: Session ID for grouping files
+            cape_id: Cape ID that will process these files
+            content_types: MIME type per file (auto-detected where None)
+
+        Returns:
+            FileMetadata for each file, in input order
+
+        Raises:
+            FileTooLargeError: If any file exceeds size limit
+            InvalidFileTypeError: If any file type not allowed
+        """
+        if content_types is None:
+            content_types = [None] * len(files)
+        validated = [
+            (*self._validate_upload(content, filename), filename, content_type)
+            for (content, filename), content_type in zip(files, content_types)
+        ]
+        storage_dir = self._upload_dir(session_id)
+        results = [
+            await self._store_upload(
+                data, ext, filename, storage_dir, session_id, cape_id,
+                content_type, persist=False,
+            )
+            for data, ext, filename, content_type in validated
+        ]
+
+        # Persist all sidecars in one pass once the bodies are written
+        await self._save_metadata_many(results)
+        return results
+
+    def _validate_upload(
+        self,
+        content: Union[bytes, BinaryIO],
+        filename: str,
+    ) -> Tuple[bytes, str]:
+        """Read upload content and check its extension and size."""
         # Validate extension
-        ext = Path(filename).suffix.lower()
-        if ext not in self.config.allowed_extensions:
+        ext = os.path.splitext(filename)[1].lower()
+        if ext not in self._allowed_extensions:
             raise InvalidFileTypeError(
                 f"File type '{ext}' not allowed. "
                 f"Allowed types: {', '.join(self.config.allowed_extensions)}"
@@ -239,31 +313,50 @@ class FileStorage:
             data = content
 
         # Validate size
-        size_mb = len(data) / (1024 * 1024)
-        if size_mb > self.config.max_file_size_mb:
+        if len(data) > self._max_file_bytes:
+            size_mb = len(data) / (1024 * 1024)
             raise FileTooLargeError(
                 f"File size ({size_mb:.1f}MB) exceeds limit "
                 f"({self.config.max_file_size_mb}MB)"
             )
 
+        return data, ext
+
+    def _upload_dir(self, session_id: Optional[str]) -> Path:
+        """Return (and create) the upload directory for a session."""
+        storage_dir = self.config.base_dir / "uploads"
+        if session_id:
+            storage_dir = storage_dir / session_id
+            storage_dir.mkdir(parents=True, exist_ok=True)
+        return storage_dir
+
+    async def _store_upload(
+        self,
+        data: bytes,
+        ext: str,
+        filename: str,
+        storage_dir: Path,
+        session_id: Optional[str],
+        cape_id: Optional[str],
+        content_type: Optional[str],
+        persist: bool = True,
+    ) -> FileMetadata:
+        """
+        Write validated upload data and index its metadata.
+
+        With persist=False the caller saves the metadata sidecar itself.
+        """
         # Generate file ID and stored name
         file_id = str(uuid.uuid4())
-        checksum = hashlib.md5(data).hexdigest()
+        checksum = _checksum(data)
         stored_name = f"{file_id}{ext}"
 
         # Detect content type
         if not content_type:
             content_type = mimetypes.guess_type(filename)[0] or "application/octet-stream"
 
-        # Determine storage path
-        storage_dir = self.config.base_dir / "uploads"
-        if session_id:
-            storage_dir = storage_dir / session_id
-            storage_dir.mkdir(parents=True, exist_ok=True)
-
-        file_path = storage_dir / stored_name
-
         # Write file
+        file_path = storage_dir / stored_name
         file_path.write_bytes(data)
 
         # Create metadata
@@ -290,8 +383,10 @@ class FileStorage:
             self._session_files[session_id].append(file_id)
 
         # Persist metadata
-        await self._save_metadata(metadata)
+        if persist:
+            await self._save_metadata(metadata)
 
+        size_mb = len(data) / (1024 * 1024)
         logger.info(f"Uploaded file: {filename} -> {file_id} ({size_mb:.2f}MB)")
 
         return metadata
@@ -306,6 +401,27 @@ class FileStorage:
         Returns:
             Tuple of (file content, metadata)
 
+        Raises:
+            FileNotFoundError: If file not found
+        """
+        file_path, metadata = await self.get_path(file_id)
+        content = file_path.read_bytes()
+
+        return content, metadata
+
+    async def get_path(self, file_id: str) -> Tuple[Path, FileMetadata]:
+        """
+        Locate a stored file without reading it.
+
+        Lets callers stream the file (e.g. with sendfile) instead of
+        loading it into memory.
+
+        Args:
+            file_id: File ID
+
+        Returns:
+            Tuple of (path on disk, metadata)
+
         Raises:
             FileNotFoundError: If file not found
         """
@@ -327,9 +443,7 @@ class FileStorage:
         if not file_path.exists():
             raise FileNotFoundError(f"File not found on disk: {file_id}")
 
-        content = file_path.read_bytes()
-
-        return content, metadata
+        return file_path, metadata
 
     async def get_metadata(self, file_id: str) -> Optional[FileMetadata]:
         """Get file metadata."""
@@ -381,7 +495,7 @@ class FileStorage:
         file_id = str(uuid.uuid4())
         ext = Path(filename).suffix.lower()
         stored_name = f"{file_id}{ext}"
-        checksum = hashlib.md5(content).hexdigest()
+        checksum = _checksum(content)
 
         # Detect content type
         if not content_type:
@@ -592,13 +706,18 @@ class FileStorage:
 
     async def _save_metadata(self, metadata: FileMetadata) -> None:
         """Save metadata to disk."""
+        await self._save_metadata_many([metadata])
+
+    async def _save_metadata_many(self, items: List[FileMetadata]) -> None:
+        """Save several metadata sidecars, creating the directory once."""
         import json
 
         metadata_dir = self.config.base_dir / ".metadata"
         metadata_dir.mkdir(exist_ok=True)
 
-        meta_file = metadata_dir / f"{metadata.file_id}.json"
-        meta_file.write_text(json.dumps(metadata.to_dict(), indent=2))
+        for metadata in items:
+            meta_file = metadata_dir / f"{metadata.file_id}.json"
+            meta_file.write_text(json.dumps(metadata.to_dict(), indent=2))
 
     async def _cleanup_loop(self) -> None:
         """Background cleanup loop."""
@@ -6,8 +6,9 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import weakref
 from pathlib import Path
-from typing import Any, Callable, Dict, List, Optional
+from typing import Any, Callable, Coroutine, Dict, List, Optional, Tuple
 
 from cape.core.models import Cape, CapeResult
 from cape.registry.registry import CapeRegistry
@@ -77,6 +78,9 @@ class CapeAgent:
         self.auto_match_threshold = 0.4
         self.verbose = False
 
+        # Event loop reused by the *_sync methods (created on first use)
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
     # ==================== Main Interface ====================
 
     async def run(
@@ -96,6 +100,45 @@ class CapeAgent:
         Returns:
             CapeResult from execution
         """
+        result, record = await self._match_and_execute(user_input, context, model)
+        if record is not None:
+            self.history.append(record)
+        return result
+
+    async def run_batch(
+        self,
+        user_inputs: List[str],
+        context: Optional[ExecutionContext] = None,
+        model: Optional[str] = None,
+    ) -> List[CapeResult]:
+        """
+        Process several user inputs concurrently.
+
+        History is recorded in input order, as if run() had been called
+        for each input in turn.
+
+        Args:
+            user_inputs: User requests
+            context: Optional execution context shared by all requests
+            model: Optional model override
+
+        Returns:
+            One CapeResult per input, in input order
+        """
+        outcomes = await asyncio.gather(*(
+            self._match_and_execute(user_input, context, model)
+            for user_input in user_inputs
+        ))
+        self.history.extend(record for _, record in outcomes if record is not None)
+        return [result for result, _ in outcomes]
+
+    async def _match_and_execute(
+        self,
+        user_input: str,
+        context: Optional[ExecutionContext],
+        model: Optional[str],
+    ) -> Tuple[CapeResult, Optional[Dict[str, Any]]]:
+        """Match and execute the best Cape; returns (result, history record)."""
         # Match Cape
         match = self.registry.match_best(user_input, threshold=self.auto_match_threshold)
 
@@ -104,7 +147,7 @@ class CapeAgent:
                 cape_id="none",
                 success=False,
                 error=f"No capability found for: {user_input}",
-            )
+            ), None
 
         if self.verbose:
             logger.info(f"Matched Cape: {match.id}")
@@ -117,15 +160,12 @@ class CapeAgent:
             model=model,
         )
 
-        # Record history
-        self.history.append({
+        return result, {
             "input": user_input,
             "cape_id": match.id,
             "success": result.success,
             "output": result.output if result.success else result.error,
-        })
-
-        return result
+        }
 
     async def execute(
         self,
@@ -160,7 +200,16 @@ class CapeAgent:
         model: Optional[str] = None,
     ) -> CapeResult:
         """Synchronous version of run()."""
-        return asyncio.run(self.run(user_input, context, model))
+        return self._run_sync(self.run(user_input, context, model))
+
+    def run_batch_sync(
+        self,
+        user_inputs: List[str],
+        context: Optional[ExecutionContext] = None,
+        model: Optional[str] = None,
+    ) -> List[CapeResult]:
+        """Synchronous version of run_batch()."""
+        return self._run_sync(self.run_batch(user_inputs, context, model))
 
     def execute_sync(
         self,
@@ -170,7 +219,20 @@ class CapeAgent:
         model: Optional[str] = None,
     ) -> CapeResult:
         """Synchronous version of execute()."""
-        return asyncio.run(self.execute(cape_id, inputs, context, model))
+        return self._run_sync(self.execute(cape_id, inputs, context, model))
+
+    def _run_sync(self, coro: Coroutine[Any, Any, Any]) -> Any:
+        """
+        Run a coroutine to completion on the agent's own event loop.
+
+        The loop is created on first use and reused by later calls, instead
+        of asyncio.run() setting up and tearing down a loop every time. It is
+        closed when the agent is garbage collected.
+        """
+        if self._loop is None:
+            self._loop = asyncio.new_event_loop()
+            weakref.finalize(self, self._loop.close)
+        return self._loop.run_until_complete(coro)
 
     # ==================== Tool Registration ====================
 
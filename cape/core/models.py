@@ -165,6 +165,13 @@ class CapeExecution(BaseModel):
     max_retries: int = Field(0, ge=0, le=10)
     retry_delay_seconds: float = Field(1.0, ge=0)
 
+    # Memoization
+    deterministic: bool = Field(
+        False,
+        description="Same inputs always give the same output, so results may be "
+                    "cached per version (bump the version when behavior changes)"
+    )
+
     # Rollback
     rollback_on_failure: bool = False
     rollback_handler: Optional[str] = None
@@ -19,8 +19,11 @@ Mapping:
 
 from __future__ import annotations
 
+import json
 import logging
+import os
 import re
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
@@ -41,6 +44,36 @@ from cape.core.models import (
 
 logger = logging.getLogger(__name__)
 
+# Optional skills-directory index: {"skills": ["<skill dir name>", ...]}.
+# When present, import_all() imports the listed skills without listing
+# the directory.
+SKILL_INDEX_FILE = "_index.json"
+
+# Patterns compiled once at import and shared by every SkillImporter
+_FRONTMATTER_RE = re.compile(r"^---\n(.*?)\n---\n?(.*)", re.DOTALL)
+
+# Keywords that indicate file types
+_FILE_TYPE_PATTERNS = (
+    re.compile(r"\.\w{2,5}\b"),  # .pdf, .docx, etc.
+)
+
+# Keywords that indicate actions
+_ACTION_KEYWORDS = (
+    "analyze", "extract", "process", "convert", "generate", "create",
+    "parse", "read", "write", "edit", "modify", "transform", "validate",
+    "review", "check", "optimize", "debug", "test", "build", "deploy",
+)
+
+# Keywords that indicate intents
+_INTENT_PATTERNS = tuple(
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in (
+        r"use when (.*?)(?:\.|$)",
+        r"use this (?:skill |)when (.*?)(?:\.|$)",
+        r"when (?:you |user |)(?:need|want|ask)s? to (.*?)(?:\.|$)",
+    )
+)
+
 
 class SkillImporter:
     """
@@ -60,24 +93,10 @@ class SkillImporter:
     """
 
     def __init__(self):
-        # Keywords that indicate file types
-        self.file_type_patterns = [
-            r"\.\w{2,5}\b",  # .pdf, .docx, etc.
-        ]
-
-        # Keywords that indicate actions
-        self.action_keywords = [
-            "analyze", "extract", "process", "convert", "generate", "create",
-            "parse", "read", "write", "edit", "modify", "transform", "validate",
-            "review", "check", "optimize", "debug", "test", "build", "deploy",
-        ]
-
-        # Keywords that indicate intents
-        self.intent_patterns = [
-            r"use when (.*?)(?:\.|$)",
-            r"use this (?:skill |)when (.*?)(?:\.|$)",
-            r"when (?:you |user |)(?:need|want|ask)s? to (.*?)(?:\.|$)",
-        ]
+        # Compiled patterns; copies so one importer can be customized
+        self.file_type_patterns = list(_FILE_TYPE_PATTERNS)
+        self.action_keywords = list(_ACTION_KEYWORDS)
+        self.intent_patterns = list(_INTENT_PATTERNS)
 
     def import_skill(self, skill_path: Path) -> Cape:
         """
@@ -102,40 +121,67 @@ class SkillImporter:
         # Build Cape
         return self._build_cape(skill_path, frontmatter, body)
 
-    def import_all(self, skills_dir: Path) -> List[Cape]:
+    def import_all(self, skills_dir: Path, max_workers: int = 8) -> List[Cape]:
         """
         Import all skills from a directory.
 
+        Skills are read and parsed on a small thread pool so their file
+        I/O overlaps; results keep directory order.
+
         Args:
             skills_dir: Directory containing skill folders
+            max_workers: Upper bound on concurrent imports
 
         Returns:
             List of Cape objects
         """
-        capes = []
         skills_dir = Path(skills_dir)
+        skill_paths = self._skill_dirs(skills_dir)
 
-        for skill_path in skills_dir.iterdir():
-            if not skill_path.is_dir():
-                continue
-
-            skill_md = skill_path / "SKILL.md"
-            if not skill_md.exists():
-                continue
-
-            try:
-                cape = self.import_skill(skill_path)
-                capes.append(cape)
-                logger.info(f"Imported skill: {cape.id}")
-            except Exception as e:
-                logger.error(f"Failed to import {skill_path}: {e}")
+        workers = max(1, min(max_workers, len(skill_paths)))
+        if workers == 1:
+            results = [self._try_import(path) for path in skill_paths]
+        else:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                results = list(executor.map(self._try_import, skill_paths))
+
+        return [cape for cape in results if cape is not None]
+
+    def _try_import(self, skill_path: Path) -> Optional[Cape]:
+        """Import one skill, logging (not raising) failures."""
+        try:
+            cape = self.import_skill(skill_path)
+        except Exception as e:
+            logger.error(f"Failed to import {skill_path}: {e}")
+            return None
+        logger.info(f"Imported skill: {cape.id}")
+        return cape
+
+    @staticmethod
+    def _skill_dirs(skills_dir: Path) -> List[Path]:
+        """Skill directories under skills_dir, from its index if it has one."""
+        index_file = skills_dir / SKILL_INDEX_FILE
+        try:
+            index = json.loads(index_file.read_text(encoding="utf-8"))
+        except FileNotFoundError:
+            pass
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable skill index {index_file}: {e}")
+        else:
+            return [skills_dir / name for name in index.get("skills", [])]
 
-        return capes
+        # One scandir pass; entry types come from the directory listing
+        with os.scandir(skills_dir) as entries:
+            return [
+                Path(entry.path)
+                for entry in entries
+                if entry.is_dir()
+                and os.path.exists(os.path.join(entry.path, "SKILL.md"))
+            ]
 
     def _parse_frontmatter(self, content: str) -> tuple[Dict[str, Any], str]:
         """Parse YAML frontmatter from SKILL.md."""
-        pattern = r"^---\n(.*?)\n---\n?(.*)"
-        match = re.match(pattern, content, re.DOTALL)
+        match = _FRONTMATTER_RE.match(content)
 
         if not match:
             raise ValueError("Invalid SKILL.md format: missing frontmatter")
@@ -235,7 +281,7 @@ class SkillImporter:
         desc_lower = description.lower()
 
         for pattern in self.intent_patterns:
-            matches = re.findall(pattern, desc_lower, re.IGNORECASE)
+            matches = pattern.findall(desc_lower)
             intents.extend(matches)
 
         return intents
@@ -245,7 +291,7 @@ class SkillImporter:
         file_types = []
 
         for pattern in self.file_type_patterns:
-            matches = re.findall(pattern, description.lower())
+            matches = pattern.findall(description.lower())
             file_types.extend(matches)
 
         return list(set(file_types))
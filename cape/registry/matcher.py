@@ -4,14 +4,35 @@ Cape Matcher - Intent matching for capability discovery.
 
 from __future__ import annotations
 
+import hashlib
+import heapq
+import importlib.util
 import logging
+import os
 import re
-from typing import Any, Dict, List, Optional
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
 
 from cape.core.models import Cape
 
 logger = logging.getLogger(__name__)
 
+EMBEDDING_MODEL = "all-MiniLM-L6-v2"
+
+# Per-Cape embeddings are cached here, keyed by Cape id + hash of model/text
+DEFAULT_CACHE_DIR = (
+    Path(os.environ.get("CAPE_CACHE_DIR", Path.home() / ".cache" / "cape"))
+    / "embeddings"
+)
+EMBEDDING_CACHE_FILE = "cape_embeddings_v1.npz"
+
+# Reciprocal Rank Fusion constant (score = sum of 1 / (RRF_K + rank))
+RRF_K = 60
+# BM25 column weights for (cape_id, name, description, intents)
+FTS_WEIGHTS = (0.0, 10.0, 5.0, 5.0)
+
 
 class CapeMatcher:
     """
@@ -26,51 +47,239 @@ class CapeMatcher:
     Usage:
         matcher = CapeMatcher(use_embeddings=True)
         matcher.index(capes)
-        results = matcher.match("process this PDF", capes)
+        matcher.add(new_cape)
+        results = matcher.match("process this PDF", capes + [new_cape])
     """
 
-    def __init__(self, use_embeddings: bool = True):
+    def __init__(
+        self,
+        use_embeddings: bool = True,
+        cache_dir: Optional[Path] = None,
+    ):
         """
         Initialize matcher.
 
         Args:
             use_embeddings: Whether to use semantic embeddings
+            cache_dir: Directory for cached embedding matrices
+                (defaults to ~/.cache/cape/embeddings, or $CAPE_CACHE_DIR)
         """
         self.use_embeddings = use_embeddings
+        self.cache_dir = Path(cache_dir) if cache_dir else DEFAULT_CACHE_DIR
         self._model = None
-        self._embeddings: Dict[str, Any] = {}
+        # L2-normalized float32 embeddings, one row per indexed Cape; a
+        # view of the first rows of _buffer, which grows by doubling
+        self._matrix: Any = None
+        self._buffer: Any = None
+        self._rows: Dict[str, int] = {}
+        self._fts: Optional[sqlite3.Connection] = None
+        self._fts_ids: Tuple[str, ...] = ()
+        self._fts_lock = threading.Lock()
+        # (Cape ids, Aho-Corasick automaton or None, phrase -> owning Cape ids)
+        self._phrase_index: Optional[Tuple[Any, ...]] = None
+        self._phrase_stale = False
+        # Capes added since the last embedding pass, by id
+        self._pending: Dict[str, Cape] = {}
+
+    def index(self, capes: Iterable[Cape]):
+        """
+        Build index for Capes, replacing any previous embedding index.
+
+        Embeddings are loaded from the on-disk cache, so only new or changed
+        Capes pay the encoding cost. When nothing needs encoding the
+        embedding model itself is not loaded until the first semantic match
+        needs to encode a query.
 
-    def index(self, capes: List[Cape]):
+        Args:
+            capes: Capes to index (any iterable; consumed once)
+        """
+        self._matrix = None
+        self._buffer = None
+        self._rows = {}
+        self._pending = {cape.id: cape for cape in capes}
+        self._flush_pending()
+
+    def add(self, cape: Cape):
         """
-        Build index for Capes.
+        Add or replace one Cape in the index.
+
+        The full-text and phrase indexes are updated in place. The Cape's
+        embedding is queued and encoded, together with any other queued
+        Capes, on the next semantic match.
 
         Args:
-            capes: Capes to index
+            cape: Cape to index
         """
-        if not self.use_embeddings:
+        if self.use_embeddings:
+            self._pending[cape.id] = cape
+
+        with self._fts_lock:
+            if self._fts is not None:
+                self._fts.execute("DELETE FROM capes_fts WHERE cape_id = ?", (cape.id,))
+                self._fts.execute(
+                    "INSERT INTO capes_fts VALUES (?, ?, ?, ?)", self._fts_row(cape)
+                )
+                if cape.id not in self._fts_ids:
+                    self._fts_ids += (cape.id,)
+
+        index = self._phrase_index
+        if index is not None:
+            ids, _, owners = index
+            if cape.id in ids:
+                # Replaced Capes may drop phrases; rebuild on next match
+                self._phrase_index = None
+            else:
+                for phrase in self._phrases(cape):
+                    owners.setdefault(phrase, []).append(cape.id)
+                # Automaton is recompiled from the owners on next match
+                self._phrase_index = (ids + (cape.id,), None, owners)
+                self._phrase_stale = True
+
+    def _flush_pending(self) -> None:
+        """Encode Capes queued by add() into the embedding matrix."""
+        pending, self._pending = self._pending, {}
+        if not pending or not self.use_embeddings:
             return
 
         try:
-            from sentence_transformers import SentenceTransformer
             import numpy as np
 
-            if self._model is None:
-                logger.info("Loading embedding model...")
-                self._model = SentenceTransformer("all-MiniLM-L6-v2")
+            if (
+                self._model is None
+                and importlib.util.find_spec("sentence_transformers") is None
+            ):
+                raise ImportError("sentence-transformers")
 
-            # Build embeddings
-            for cape in capes:
-                # Combine description and intents for embedding
-                text = f"{cape.description} " + " ".join(cape.metadata.intents)
-                embedding = self._model.encode(text)
-                self._embeddings[cape.id] = embedding
-
-            logger.info(f"Indexed {len(capes)} Capes for semantic matching")
+            entries = sorted(
+                (cape_id, self._embedding_text(cape))
+                for cape_id, cape in pending.items()
+            )
+            matrix = np.asarray(self._load_or_encode(entries), dtype=np.float32)
+            norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+            matrix = matrix / np.where(norms == 0, 1, norms)
+
+            new_rows = []
+            for (cape_id, _), vector in zip(entries, matrix):
+                if cape_id in self._rows:
+                    self._matrix[self._rows[cape_id]] = vector
+                else:
+                    self._rows[cape_id] = len(self._rows)
+                    new_rows.append(vector)
+            if new_rows:
+                self._append_rows(np.stack(new_rows))
+
+            logger.info(f"Indexed {len(pending)} Capes for semantic matching")
 
         except ImportError:
             logger.warning("sentence-transformers not available, using keyword matching only")
             self.use_embeddings = False
 
+    def _append_rows(self, rows: Any) -> None:
+        """
+        Append normalized rows to the embedding matrix.
+
+        The backing buffer doubles when full, so a run of add() calls
+        copies the existing rows O(log N) times rather than once per batch.
+        """
+        import numpy as np
+
+        count = 0 if self._matrix is None else len(self._matrix)
+        needed = count + len(rows)
+        if self._buffer is None or needed > len(self._buffer):
+            grown = 0 if self._buffer is None else 2 * len(self._buffer)
+            capacity = max(needed, grown)
+            buffer = np.empty((capacity, rows.shape[1]), dtype=np.float32)
+            if count:
+                buffer[:count] = self._matrix
+            self._buffer = buffer
+
+        self._buffer[count:needed] = rows
+        self._matrix = self._buffer[:needed]
+
+    def _get_model(self):
+        """Load the embedding model on first use."""
+        if self._model is None:
+            from sentence_transformers import SentenceTransformer
+
+            logger.info("Loading embedding model...")
+            self._model = SentenceTransformer(EMBEDDING_MODEL)
+        return self._model
+
+    @staticmethod
+    def _embedding_text(cape: Cape) -> str:
+        """Text embedded for a Cape: description plus intents."""
+        return f"{cape.description} " + " ".join(cape.metadata.intents)
+
+    @staticmethod
+    def _cache_key(cape_id: str, text: str) -> str:
+        """Content-addressed key: changes whenever the model or text changes."""
+        digest = hashlib.sha256(f"{EMBEDDING_MODEL}\0{text}".encode("utf-8"))
+        return f"{cape_id}:{digest.hexdigest()[:16]}"
+
+    def _read_cache(self) -> Dict[str, Any]:
+        """Load the key -> embedding store (empty if missing or unreadable)."""
+        import numpy as np
+
+        cache_file = self.cache_dir / EMBEDDING_CACHE_FILE
+        if not cache_file.exists():
+            return {}
+        try:
+            with np.load(cache_file, allow_pickle=False) as data:
+                return dict(zip(data["keys"].tolist(), data["vectors"]))
+        except (OSError, ValueError, KeyError) as e:
+            logger.warning(f"Ignoring unreadable embedding cache {cache_file}: {e}")
+            return {}
+
+    def _write_cache(self, store: Dict[str, Any]) -> None:
+        """Atomically replace the on-disk store."""
+        import numpy as np
+
+        cache_file = self.cache_dir / EMBEDDING_CACHE_FILE
+        try:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            tmp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+            with open(tmp_file, "wb") as f:
+                np.savez(
+                    f,
+                    keys=np.array(list(store), dtype=str),
+                    vectors=np.stack(list(store.values())).astype(np.float32),
+                )
+            os.replace(tmp_file, cache_file)
+        except OSError as e:
+            logger.warning(f"Failed to write embedding cache {cache_file}: {e}")
+
+    def _load_or_encode(self, entries: List[Tuple[str, str]]) -> Any:
+        """
+        Return the embedding matrix for (cape_id, text) entries.
+
+        Rows follow the order of ``entries``. Only entries missing from the
+        cache are encoded (in one batch); the store is then rewritten with
+        the new vectors and without stale vectors of the indexed Capes.
+        """
+        import numpy as np
+
+        keys = [self._cache_key(cape_id, text) for cape_id, text in entries]
+        store = self._read_cache()
+
+        missing = [i for i, key in enumerate(keys) if key not in store]
+        if missing:
+            vectors = self._get_model().encode([entries[i][1] for i in missing])
+            for i, vector in zip(missing, vectors):
+                store[keys[i]] = np.asarray(vector, dtype=np.float32)
+
+            # Drop outdated vectors for the Capes just indexed
+            indexed_ids = {cape_id for cape_id, _ in entries}
+            current = set(keys)
+            store = {
+                key: vector
+                for key, vector in store.items()
+                if key in current or key.rsplit(":", 1)[0] not in indexed_ids
+            }
+            self._write_cache(store)
+            logger.debug(f"Encoded {len(missing)}/{len(keys)} Cape embeddings")
+
+        return np.stack([store[key] for key in keys])
+
     def match(
         self,
         query: str,
@@ -92,6 +301,8 @@ class CapeMatcher:
         """
         results = []
         query_lower = query.lower()
+        semantic = self._semantic_scores(query, capes) if self.use_embeddings else {}
+        contained = self._contained_phrases(query_lower, capes)
 
         for cape in capes:
             # 1. Exact ID match
@@ -104,9 +315,11 @@ class CapeMatcher:
                 continue
 
             # Calculate scores
-            intent_score = self._match_intents(query_lower, cape)
-            keyword_score = self._match_keywords(query_lower, cape)
-            semantic_score = self._match_semantic(query, cape) if self.use_embeddings else 0.0
+            phrases = contained.get(cape.id, set())
+            intent_score = self._match_intents(query_lower, cape, phrases)
+            keyword_score = self._match_keywords(query_lower, cape, phrases)
+            # Cosine similarity normalized to 0-1
+            semantic_score = max(0.0, (semantic.get(cape.id, -1.0) + 1) / 2)
 
             # Weighted combination
             total_score = (
@@ -128,12 +341,235 @@ class CapeMatcher:
                     },
                 })
 
-        # Sort by score
-        results.sort(key=lambda x: x["score"], reverse=True)
+        # Best top_k by score (same order as a stable sort, without sorting all)
+        return heapq.nlargest(top_k, results, key=lambda x: x["score"])
+
+    def match_hybrid(
+        self,
+        query: str,
+        capes: List[Cape],
+        top_k: int = 5,
+    ) -> List[Dict[str, Any]]:
+        """
+        Rank Capes by fusing several rankings with Reciprocal Rank Fusion.
+
+        Combines a BM25 full-text ranking (SQLite FTS5 over name,
+        description and intents), the intent/keyword heuristics used by
+        match(), and, when embeddings are enabled, dense cosine similarity.
+        Capes whose ID appears in the query are returned first.
+
+        Args:
+            query: User's query
+            capes: Capes to match against
+            top_k: Maximum results
+
+        Returns:
+            List of {cape, score, match_type, details} dicts
+        """
+        query_lower = query.lower()
+        by_id = {cape.id: cape for cape in capes}
+
+        exact = [
+            {"cape": cape, "score": 1.0, "match_type": "exact"}
+            for cape in capes
+            if cape.id in query_lower
+        ]
+        if len(exact) >= top_k:
+            return exact[:top_k]
+
+        contained = self._contained_phrases(query_lower, capes)
+        heuristic = {}
+        for cape in capes:
+            phrases = contained.get(cape.id, set())
+            heuristic[cape.id] = self._match_intents(
+                query_lower, cape, phrases
+            ) + self._match_keywords(query_lower, cape, phrases)
+        rankings = {
+            "bm25": self._fts_ranking(query_lower, capes),
+            "heuristic": sorted(
+                (cid for cid, score in heuristic.items() if score > 0),
+                key=lambda cid: heuristic[cid],
+                reverse=True,
+            ),
+        }
+        if self.use_embeddings:
+            semantic = self._semantic_scores(query, capes)
+            rankings["semantic"] = sorted(semantic, key=semantic.get, reverse=True)
+
+        fused: Dict[str, float] = {}
+        details: Dict[str, Dict[str, int]] = {}
+        for name, ranking in rankings.items():
+            for rank, cape_id in enumerate(ranking, 1):
+                fused[cape_id] = fused.get(cape_id, 0.0) + 1.0 / (RRF_K + rank)
+                details.setdefault(cape_id, {})[f"{name}_rank"] = rank
+
+        exact_ids = {r["cape"].id for r in exact}
+        ranked = sorted(
+            (cid for cid in fused if cid not in exact_ids),
+            key=fused.get,
+            reverse=True,
+        )
+
+        results = exact + [
+            {
+                "cape": by_id[cape_id],
+                "score": fused[cape_id],
+                "match_type": "hybrid",
+                "details": details[cape_id],
+            }
+            for cape_id in ranked
+        ]
         return results[:top_k]
 
-    def _match_intents(self, query: str, cape: Cape) -> float:
-        """Match against Cape's intent patterns."""
+    def _fts_ranking(self, query: str, capes: List[Cape]) -> List[str]:
+        """Cape IDs matching any query term, best BM25 score first."""
+        terms = list(dict.fromkeys(re.findall(r"\w+", query)))
+        if not terms:
+            return []
+        expression = " OR ".join(f'"{term}"' for term in terms)
+
+        with self._fts_lock:
+            conn = self._get_fts(capes)
+            rows = conn.execute(
+                "SELECT cape_id FROM capes_fts WHERE capes_fts MATCH ? "
+                f"ORDER BY bm25(capes_fts, {', '.join(map(str, FTS_WEIGHTS))})",
+                (expression,),
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def _get_fts(self, capes: List[Cape]) -> sqlite3.Connection:
+        """Return the in-memory FTS5 index, rebuilding it if the Cape set changed."""
+        ids = tuple(cape.id for cape in capes)
+        if self._fts is not None and ids == self._fts_ids:
+            return self._fts
+
+        if self._fts is None:
+            self._fts = sqlite3.connect(":memory:", check_same_thread=False)
+            self._fts.execute(
+                "CREATE VIRTUAL TABLE capes_fts USING fts5("
+                "cape_id UNINDEXED, name, description, intents, "
+                "tokenize='unicode61')"
+            )
+        else:
+            self._fts.execute("DELETE FROM capes_fts")
+
+        self._fts.executemany(
+            "INSERT INTO capes_fts VALUES (?, ?, ?, ?)",
+            [self._fts_row(cape) for cape in capes],
+        )
+        self._fts_ids = ids
+        return self._fts
+
+    @staticmethod
+    def _fts_row(cape: Cape) -> Tuple[str, str, str, str]:
+        """Row of the FTS5 table for a Cape."""
+        return (cape.id, cape.name, cape.description, " ".join(cape.metadata.intents))
+
+    def _semantic_scores(self, query: str, capes: List[Cape]) -> Dict[str, float]:
+        """
+        Cosine similarity of the query to the given indexed Capes.
+
+        The query is encoded once and scored against every row of the
+        normalized embedding matrix with a single matrix-vector product.
+        """
+        if self._pending:
+            self._flush_pending()
+        indexed = [cape.id for cape in capes if cape.id in self._rows]
+        if not indexed:
+            return {}
+
+        try:
+            import numpy as np
+
+            query_embedding = np.asarray(
+                self._get_model().encode(query), dtype=np.float32
+            )
+            norm = np.linalg.norm(query_embedding)
+            similarities = self._matrix @ (query_embedding / (norm or 1.0))
+            return {
+                cape_id: float(similarities[self._rows[cape_id]]) for cape_id in indexed
+            }
+
+        except Exception as e:
+            logger.warning(f"Semantic matching failed: {e}")
+            return {}
+
+    def _contained_phrases(self, query: str, capes: List[Cape]) -> Dict[str, Set[str]]:
+        """
+        Find every Cape's intent phrases and file-type tags inside the query.
+
+        All phrases of all Capes are compiled into one Aho-Corasick automaton
+        (pyahocorasick), so a single pass over the query finds them all.
+        Without pyahocorasick each distinct phrase is checked once with ``in``.
+
+        Returns:
+            Cape id -> phrases of that Cape contained in the query
+        """
+        ids = tuple(cape.id for cape in capes)
+        index = self._phrase_index
+        if index is None or index[0] != ids:
+            index = self._build_phrase_index(ids, capes)
+            self._phrase_index = index
+            self._phrase_stale = False
+        elif self._phrase_stale:
+            index = (ids, self._compile_phrases(index[2]), index[2])
+            self._phrase_index = index
+            self._phrase_stale = False
+        _, automaton, owners = index
+
+        if automaton is None:
+            found = {phrase for phrase in owners if phrase in query}
+        else:
+            found = {phrase for _, phrase in automaton.iter(query)}
+
+        contained: Dict[str, Set[str]] = {}
+        for phrase in found:
+            for cape_id in owners[phrase]:
+                contained.setdefault(cape_id, set()).add(phrase)
+        return contained
+
+    @classmethod
+    def _build_phrase_index(
+        cls, ids: Tuple[str, ...], capes: List[Cape]
+    ) -> Tuple[Any, ...]:
+        """Collect phrase owners and compile them into an automaton if possible."""
+        owners: Dict[str, List[str]] = {}
+        for cape in capes:
+            for phrase in cls._phrases(cape):
+                owners.setdefault(phrase, []).append(cape.id)
+        return ids, cls._compile_phrases(owners), owners
+
+    @staticmethod
+    def _phrases(cape: Cape) -> Set[str]:
+        """Lowercased intents and file-type tags of a Cape."""
+        phrases = {intent.lower() for intent in cape.metadata.intents}
+        phrases.update(t for t in cape.metadata.tags if t.startswith("."))
+        phrases.discard("")
+        return phrases
+
+    @staticmethod
+    def _compile_phrases(owners: Dict[str, List[str]]) -> Any:
+        """Aho-Corasick automaton over the phrases, or None without pyahocorasick."""
+        if not owners:
+            return None
+        try:
+            import ahocorasick
+        except ImportError:
+            return None
+
+        automaton = ahocorasick.Automaton()
+        for phrase in owners:
+            automaton.add_word(phrase, phrase)
+        automaton.make_automaton()
+        return automaton
+
+    def _match_intents(self, query: str, cape: Cape, contained: Set[str]) -> float:
+        """
+        Match against Cape's intent patterns.
+
+        ``contained`` holds this Cape's phrases found in the query
+        (see _contained_phrases).
+        """
         if not cape.metadata.intents:
             return 0.0
 
@@ -143,7 +579,7 @@ class CapeMatcher:
             score = 0.0
 
             # 1. Exact phrase match (highest priority)
-            if intent_lower in query or query in intent_lower:
+            if intent_lower in contained or query in intent_lower:
                 score = 1.0
             # 2. Chinese character overlap matching
             elif self._has_chinese(intent_lower):
@@ -185,7 +621,7 @@ class CapeMatcher:
         matches = sum(1 for char in intent_chars if char in query)
         return matches / len(intent_chars)
 
-    def _match_keywords(self, query: str, cape: Cape) -> float:
+    def _match_keywords(self, query: str, cape: Cape, contained: Set[str]) -> float:
         """Match against tags and description keywords."""
         score = 0.0
 
@@ -203,34 +639,11 @@ class CapeMatcher:
         # File type matching
         file_types = [t for t in cape.metadata.tags if t.startswith(".")]
         for ft in file_types:
-            if ft in query:
+            if ft in contained:
                 score += 0.4
 
         return min(1.0, score)
 
-    def _match_semantic(self, query: str, cape: Cape) -> float:
-        """Semantic similarity matching."""
-        if not self.use_embeddings or cape.id not in self._embeddings:
-            return 0.0
-
-        try:
-            import numpy as np
-
-            query_embedding = self._model.encode(query)
-            cape_embedding = self._embeddings[cape.id]
-
-            # Cosine similarity
-            similarity = np.dot(query_embedding, cape_embedding) / (
-                np.linalg.norm(query_embedding) * np.linalg.norm(cape_embedding)
-            )
-
-            # Normalize to 0-1
-            return float(max(0.0, (similarity + 1) / 2))
-
-        except Exception as e:
-            logger.warning(f"Semantic matching failed: {e}")
-            return 0.0
-
     def explain_match(self, result: Dict[str, Any]) -> str:
         """Generate explanation for a match result."""
         cape = result["cape"]
@@ -67,6 +67,7 @@ class CapeRegistry:
         # Registry storage
         self._capes: Dict[str, Cape] = {}
         self._packs: Dict[str, Dict] = {}  # Pack metadata storage
+        self._pack_capes: Dict[str, List[Cape]] = {}  # filter_by_pack cache
 
         # Matcher for intent-based lookup
         self.matcher = CapeMatcher(use_embeddings=use_embeddings)
@@ -92,9 +93,6 @@ class CapeRegistry:
         if self.skills_dir and self.skills_dir.exists():
             self._import_skills_dir(self.skills_dir)
 
-        # Build matcher index
-        self.matcher.index(list(self._capes.values()))
-
     def _load_capes_dir(self, capes_dir: Path):
         """Load Capes from directory."""
         for cape_path in capes_dir.iterdir():
@@ -190,6 +188,8 @@ class CapeRegistry:
             cape: Cape to register
         """
         self._capes[cape.id] = cape
+        self._pack_capes.clear()
+        self.matcher.add(cape)
         logger.debug(f"Registered Cape: {cape.id}")
 
     def unregister(self, cape_id: str) -> Optional[Cape]:
@@ -202,6 +202,7 @@ class CapeRegistry:
         Returns:
             Removed Cape or None
         """
+        self._pack_capes.clear()
         return self._capes.pop(cape_id, None)
 
     def get(self, cape_id: str) -> Optional[Cape]:
@@ -245,6 +246,23 @@ class CapeRegistry:
         """
         return self.matcher.match(query, list(self._capes.values()), top_k, threshold)
 
+    def match_hybrid(
+        self,
+        query: str,
+        top_k: int = 5,
+    ) -> List[Dict[str, Any]]:
+        """
+        Rank Capes with full-text, heuristic and semantic rank fusion.
+
+        Args:
+            query: User's query/intent
+            top_k: Maximum results to return
+
+        Returns:
+            List of match results with cape and fused score
+        """
+        return self.matcher.match_hybrid(query, list(self._capes.values()), top_k)
+
     def match_best(
         self,
         query: str,
@@ -278,9 +296,13 @@ class CapeRegistry:
         return [c for c in self._capes.values() if c.execution.type.value == exec_type]
 
     def filter_by_pack(self, pack_name: str) -> List[Cape]:
-        """Get Capes from a specific Pack."""
-        tag = f"pack:{pack_name}"
-        return [c for c in self._capes.values() if tag in c.metadata.tags]
+        """Get Capes from a specific Pack (cached until the registry changes)."""
+        capes = self._pack_capes.get(pack_name)
+        if capes is None:
+            tag = f"pack:{pack_name}"
+            capes = [c for c in self._capes.values() if tag in c.metadata.tags]
+            self._pack_capes[pack_name] = capes
+        return list(capes)
 
     # ==================== Pack Operations ====================
 
@@ -314,7 +336,10 @@ class CapeRegistry:
     def reload(self):
         """Reload all Capes from disk."""
         self._capes.clear()
+        self._pack_capes.clear()
         self._load_all()
+        # Full rebuild, so Capes gone from disk leave the index too
+        self.matcher.index(self._capes.values())
 
     def export(self, cape_id: str, output_path: Path):
         """Export Cape to YAML file."""
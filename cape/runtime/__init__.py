@@ -1,6 +1,6 @@
 """Cape Runtime - Execution layer for capabilities."""
 
-from cape.runtime.runtime import CapeRuntime
+from cape.runtime.runtime import CapeRuntime, ResultCache
 from cape.runtime.context import ExecutionContext
 from cape.runtime.executors import (
     BaseExecutor,
@@ -12,6 +12,7 @@ from cape.runtime.executors import (
 
 __all__ = [
     "CapeRuntime",
+    "ResultCache",
     "ExecutionContext",
     "BaseExecutor",
     "CodeExecutor",
@@ -5,12 +5,15 @@ Cape Executors - Different execution strategies for capabilities.
 from __future__ import annotations
 
 import asyncio
+import hashlib
 import logging
 import subprocess
 import sys
 import time
 from abc import ABC, abstractmethod
-from typing import Any, Callable, Dict, Optional, TYPE_CHECKING
+from collections import OrderedDict
+from types import CodeType
+from typing import Any, Callable, Dict, Optional, Tuple, TYPE_CHECKING
 
 from cape.runtime.context import ExecutionContext, ExecutionResult
 
@@ -19,6 +22,26 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Compiled Cape code, least recently used first:
+# (Cape id, version, digest of the source) -> code object
+_CODE_CACHE: "OrderedDict[Tuple[str, str, bytes], CodeType]" = OrderedDict()
+_CODE_CACHE_MAXSIZE = 256
+
+
+def compile_cape_code(cape: "Cape", code: str) -> CodeType:
+    """Compile a Cape's code once per Cape id, version and source."""
+    digest = hashlib.blake2b(code.encode(), digest_size=16).digest()
+    key = (cape.id, cape.version, digest)
+    compiled = _CODE_CACHE.get(key)
+    if compiled is None:
+        compiled = compile(code, f"<cape:{cape.id}>", "exec")
+        _CODE_CACHE[key] = compiled
+        while len(_CODE_CACHE) > _CODE_CACHE_MAXSIZE:
+            _CODE_CACHE.popitem(last=False)
+    else:
+        _CODE_CACHE.move_to_end(key)
+    return compiled
+
 
 class BaseExecutor(ABC):
     """Base class for Cape executors."""
@@ -81,7 +104,11 @@ class CodeExecutor(BaseExecutor):
 
             # Execute code
             local_vars = {"inputs": inputs, "context": context}
-            exec(code, {"__builtins__": __builtins__}, local_vars)
+            exec(
+                compile_cape_code(cape, code),
+                {"__builtins__": __builtins__},
+                local_vars,
+            )
 
             output = local_vars.get("result", local_vars.get("output"))
 
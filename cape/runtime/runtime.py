@@ -5,8 +5,11 @@ Cape Runtime - Main execution engine.
 from __future__ import annotations
 
 import asyncio
+import hashlib
+import json
 import logging
-from typing import Any, Callable, Dict, List, Optional, TYPE_CHECKING
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, Optional, Tuple, TYPE_CHECKING
 
 from cape.core.models import Cape, CapeResult, ExecutionType
 from cape.runtime.context import ExecutionContext
@@ -26,6 +29,47 @@ if TYPE_CHECKING:
 logger = logging.getLogger(__name__)
 
 
+class ResultCache(OrderedDict):
+    """
+    LRU cache of CapeResults for deterministic Capes.
+
+    Keyed by (cape id, cape version, digest of the canonical JSON inputs);
+    the least recently used entry is evicted once maxsize is reached.
+    """
+
+    def __init__(self, maxsize: int = 1024):
+        super().__init__()
+        self.maxsize = maxsize
+
+    @staticmethod
+    def make_key(
+        cape: Cape, inputs: Dict[str, Any]
+    ) -> Optional[Tuple[str, str, bytes]]:
+        """Build the cache key, or None if inputs are not JSON-serializable."""
+        try:
+            canonical = json.dumps(
+                inputs, sort_keys=True, separators=(",", ":"), allow_nan=False
+            )
+        except (TypeError, ValueError):
+            return None
+        digest = hashlib.blake2b(canonical.encode(), digest_size=16).digest()
+        return cape.id, cape.version, digest
+
+    def lookup(self, key: Tuple[str, str, bytes]) -> Optional[CapeResult]:
+        """Return a copy of the cached result for key, if any."""
+        result = self.get(key)
+        if result is None:
+            return None
+        self.move_to_end(key)
+        return result.model_copy(deep=True)
+
+    def store(self, key: Tuple[str, str, bytes], result: CapeResult) -> None:
+        self[key] = result.model_copy(deep=True)
+        self.move_to_end(key)
+        while len(self) > self.maxsize:
+            self.popitem(last=False)
+
+
 class CapeRuntime:
     """
     Cape Runtime - Execution engine for capabilities.
@@ -49,6 +93,7 @@ class CapeRuntime:
         registry: Optional["CapeRegistry"] = None,
         default_model: str = "openai",
         adapter_factory: Optional[Callable[[str], "BaseAdapter"]] = None,
+        result_cache_size: int = 1024,
     ):
         """
         Initialize runtime.
@@ -57,10 +102,13 @@ class CapeRuntime:
             registry: Cape registry for resolving capabilities
             default_model: Default model adapter to use
             adapter_factory: Factory for creating model adapters
+            result_cache_size: Max cached results of deterministic Capes
+                (0 disables caching)
         """
         self.registry = registry
         self.default_model = default_model
         self.adapter_factory = adapter_factory
+        self.result_cache = ResultCache(result_cache_size)
 
         # Executors
         self._tool_registry: Dict[str, Callable] = {}
@@ -195,6 +243,18 @@ class CapeRuntime:
                 error=safety_error,
             )
 
+        # Serve repeat calls of deterministic Capes from the cache
+        cache_key = None
+        if cape.execution.deterministic and self.result_cache.maxsize > 0:
+            cache_key = ResultCache.make_key(cape, inputs)
+        if cache_key is not None:
+            cached = self.result_cache.lookup(cache_key)
+            if cached is not None:
+                cached.trace_id = context.trace_id
+                self._execution_count += 1
+                context.add_to_history("execution_cached", {"cape_id": cape.id})
+                return cached
+
         # Execute
         context.add_to_history("execution_start", {"cape_id": cape.id, "inputs": inputs})
 
@@ -224,6 +284,9 @@ class CapeRuntime:
                 "execution_time_ms": result.execution_time_ms,
             })
 
+            if cache_key is not None and cape_result.success:
+                self.result_cache.store(cache_key, cape_result)
+
             return cape_result
 
         except Exception as e:
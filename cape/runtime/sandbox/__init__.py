@@ -21,12 +21,14 @@ from .code_executor import EnhancedCodeExecutor, create_code_executor
 try:
     from .docker_sandbox import (
         DockerSandbox,
+        DockerSandboxPool,
         check_docker_available,
         build_base_image,
     )
     _DOCKER_AVAILABLE = True
 except ImportError:
     DockerSandbox = None
+    DockerSandboxPool = None
     check_docker_available = None
     build_base_image = None
     _DOCKER_AVAILABLE = False
@@ -43,6 +45,7 @@ __all__ = [
     "ProcessSandbox",
     "InProcessSandbox",
     "DockerSandbox",
+    "DockerSandboxPool",
     # Docker utilities
     "check_docker_available",
     "build_base_image",
@@ -13,31 +13,45 @@ Recommended for production environments.
 from __future__ import annotations
 
 import asyncio
+import dataclasses
+import hashlib
 import io
 import json
 import logging
 import os
+import re
 import shutil
+import sys
 import tarfile
 import tempfile
 import time
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 from .manager import (
     BaseSandbox,
     SandboxConfig,
     ExecutionRequest,
     ExecutionResponse,
+    dump_json,
+    load_json,
+    stage_files,
 )
 
-logger = logging.getLogger(__name__)
+if sys.version_info >= (3, 11):
+    from asyncio import timeout as time_limit
+else:
+    from async_timeout import timeout as time_limit
 
+logger = logging.getLogger(__name__)
 
 # Default base image name
 DEFAULT_IMAGE_NAME = "cape-sandbox"
 DEFAULT_IMAGE_TAG = "python3.11"
 
+# Image label holding the hash of the Dockerfile it was built from
+BUILD_HASH_LABEL = "cape.build_hash"
+
 # Dockerfile for building the base image
 DOCKERFILE_CONTENT = '''
 FROM python:3.11-slim
@@ -61,7 +75,8 @@ RUN pip install --no-cache-dir \\
     PyPDF2>=3.0.0 \\
     pillow>=10.0.0 \\
     requests>=2.28.0 \\
-    defusedxml>=0.7.0
+    defusedxml>=0.7.0 \\
+    orjson>=3.9.0
 
 # Create workspace directory
 WORKDIR /workspace
@@ -70,6 +85,41 @@ WORKDIR /workspace
 CMD ["tail", "-f", "/dev/null"]
 '''
 
+
+
+def image_build_hash() -> str:
+    """Content hash of the base image definition (Dockerfile)."""
+    return hashlib.blake2b(DOCKERFILE_CONTENT.encode("utf-8")).hexdigest()[:16]
+
+
+# Images this process has already found (or built) up to date
+_current_images: Set[str] = set()
+
+
+def _image_build_label(client, image_name: str) -> Optional[str]:
+    """The image's build-hash label, or None if it is missing or unreadable."""
+    try:
+        image = client.images.get(image_name)
+    except Exception:
+        return None
+    return image.labels.get(BUILD_HASH_LABEL)
+
+
+def _image_is_current(client, image_name: str) -> bool:
+    """
+    Whether the image exists and was built from the current Dockerfile.
+
+    A positive answer is remembered for the life of the process, so only
+    the first sandbox per image pays the inspect round-trip.
+    """
+    if image_name in _current_images:
+        return True
+    if _image_build_label(client, image_name) != image_build_hash():
+        return False
+    _current_images.add(image_name)
+    return True
+
+
 # Python wrapper script for execution
 WRAPPER_SCRIPT = '''
 import json
@@ -77,11 +127,26 @@ import sys
 import traceback
 from pathlib import Path
 
+# orjson when the image has it; json for anything it rejects (NaN etc.)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _loads(data):
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
+
 # Load arguments
-args = {}
+args = {{}}
 args_file = Path("_args.json")
 if args_file.exists():
-    args = json.loads(args_file.read_text())
+    args = _loads(args_file.read_bytes())
 
 # Execute user code
 result = None
@@ -93,17 +158,80 @@ try:
         Path("_result.json").write_text(json.dumps(result, default=str))
 
 except Exception as e:
-    error_info = {
+    error_info = {{
         "error": str(e),
         "type": type(e).__name__,
         "traceback": traceback.format_exc(),
-    }
+    }}
     Path("_error.json").write_text(json.dumps(error_info))
-    print(f"Error: {e}", file=sys.stderr)
+    print(f"Error: {{e}}", file=sys.stderr)
     traceback.print_exc(file=sys.stderr)
     sys.exit(1)
 '''
 
+# Driver that runs several prepared requests in one container exec.
+# Each request lives in /workspace/_batch/<index>/ with its own wrapper
+# script, args and env; per-request exit code and output go to
+# /workspace/_results.jsonl, one JSON object per line.
+BATCH_DRIVER_SCRIPT = '''
+import contextlib
+import io
+import json
+import os
+import runpy
+import sys
+import traceback
+from pathlib import Path
+
+# orjson when the image has it; json for anything it rejects (NaN etc.)
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _loads(data):
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            pass
+    return json.loads(data)
+
+with open("/workspace/_results.jsonl", "w") as results:
+    for index in range({count}):
+        request_dir = Path("/workspace/_batch") / str(index)
+        os.chdir(request_dir)
+        env = _loads((request_dir / "_env.json").read_bytes())
+        saved_env = dict(os.environ)
+        os.environ.update(env)
+
+        stdout, stderr = io.StringIO(), io.StringIO()
+        exit_code = 0
+        try:
+            with contextlib.redirect_stdout(stdout), contextlib.redirect_stderr(stderr):
+                runpy.run_path(str(request_dir / "_exec.py"), run_name="__main__")
+        except SystemExit as e:
+            if isinstance(e.code, int):
+                exit_code = e.code
+            else:
+                exit_code = 0 if e.code is None else 1
+        except BaseException:
+            stderr.write(traceback.format_exc())
+            exit_code = 1
+        finally:
+            os.environ.clear()
+            os.environ.update(saved_env)
+
+        results.write(json.dumps({{
+            "exit_code": exit_code,
+            "stdout": stdout.getvalue(),
+            "stderr": stderr.getvalue(),
+        }}) + "\\n")
+        # Keep finished results if a later request kills the process
+        results.flush()
+'''
+
 
 class DockerSandbox(BaseSandbox):
     """
@@ -149,9 +277,14 @@ class DockerSandbox(BaseSandbox):
         # Installed packages tracking
         self._installed_packages: set = set()
 
+        # (container CPU, system CPU) from the previous stats sample
+        self._prev_cpu: Optional[Tuple[int, int]] = None
+
     @property
     def client(self):
-        """Get or create Docker client (lazy initialization)."""
+        """Get the shared Docker client, or create one (lazy initialization)."""
+        if self._client is None and self.config.docker_client is not None:
+            self._client = self.config.docker_client
         if self._client is None:
             try:
                 import docker
@@ -198,11 +331,10 @@ class DockerSandbox(BaseSandbox):
             raise RuntimeError(f"Failed to setup Docker sandbox: {e}")
 
     async def _ensure_image(self) -> None:
-        """Ensure base image exists, build if needed."""
-        try:
-            self.client.images.get(self.image_name)
+        """Ensure base image exists and is current, build if needed."""
+        if _image_is_current(self.client, self.image_name):
             logger.debug(f"Using existing image: {self.image_name}")
-        except Exception:
+        else:
             logger.info(f"Building base image: {self.image_name}")
             await self._build_image()
 
@@ -221,8 +353,10 @@ class DockerSandbox(BaseSandbox):
                     path=build_dir,
                     tag=self.image_name,
                     rm=True,
+                    labels={BUILD_HASH_LABEL: image_build_hash()},
                 )
             )
+        _current_images.add(self.image_name)
 
         logger.info(f"Built image: {self.image_name}")
 
@@ -324,8 +458,109 @@ class DockerSandbox(BaseSandbox):
             # Clean up workspace for next execution
             await self._cleanup_workspace()
 
-    async def _prepare_workspace(self, request: ExecutionRequest) -> None:
+    async def execute_batch(
+        self, requests: List[ExecutionRequest]
+    ) -> List[ExecutionResponse]:
+        """
+        Execute several requests with a single container exec.
+
+        Each request gets its own directory, args, env and output files,
+        but all of them run one after another in the same Python process,
+        so imported modules are shared between them. The configured
+        timeout applies to the whole batch.
+
+        Args:
+            requests: Execution requests, run in order
+
+        Returns:
+            One ExecutionResponse per request, in the same order
+        """
+        if not self._is_setup or not self._container:
+            raise RuntimeError("Sandbox not initialized. Call setup() first.")
+        if not requests:
+            return []
+
+        start_time = time.time()
+        batch_dir = self.work_dir / "_batch"
+
+        try:
+            for index, request in enumerate(requests):
+                request_dir = batch_dir / str(index)
+                request_dir.mkdir(parents=True)
+                await self._prepare_workspace(request, request_dir)
+                (request_dir / "_env.json").write_bytes(
+                    dump_json(dict(request.env or {}))
+                )
+
+            driver_path = self.work_dir / "_batch_exec.py"
+            driver_path.write_text(
+                BATCH_DRIVER_SCRIPT.format(count=len(requests)), encoding="utf-8"
+            )
+
+            exit_code, stdout, stderr = await self._exec_in_container(
+                ExecutionRequest(), script="/workspace/_batch_exec.py"
+            )
+            results_path = self.work_dir / "_results.jsonl"
+            results = []
+            if results_path.exists():
+                with open(results_path, "rb") as f:
+                    results = [load_json(line) for line in f if line.strip()]
+
+            # The driver can stop early (crash, os._exit, OOM kill); fail the
+            # requests it never reported instead of dropping them
+            if len(results) < len(requests):
+                stopped = (
+                    f"Batch driver stopped before this request finished "
+                    f"(exit code {exit_code})"
+                )
+                if stderr or stdout:
+                    stopped += f": {stderr or stdout}"
+                results.extend(
+                    {"exit_code": exit_code or 1, "stdout": "", "stderr": stopped}
+                    for _ in range(len(requests) - len(results))
+                )
+
+            elapsed_ms = (time.time() - start_time) * 1000
+            responses = []
+            for index, (request, result) in enumerate(zip(requests, results)):
+                request_dir = batch_dir / str(index)
+                output, error = await self._collect_results(request_dir)
+                files_created = await self._collect_output_files(request, request_dir)
+                success = result["exit_code"] == 0 and error is None
+
+                responses.append(ExecutionResponse(
+                    success=success,
+                    output=output,
+                    stdout=result["stdout"],
+                    stderr=result["stderr"],
+                    exit_code=result["exit_code"],
+                    execution_time_ms=elapsed_ms,
+                    files_created=files_created,
+                    error=error or (result["stderr"] if not success else None),
+                ))
+
+            return responses
+
+        except asyncio.TimeoutError:
+            error = f"Execution timeout ({self.config.timeout_seconds}s)"
+        except Exception as e:
+            logger.error(f"Docker batch execution error: {e}")
+            error = str(e)
+        finally:
+            await self._cleanup_workspace()
+
+        elapsed_ms = (time.time() - start_time) * 1000
+        return [
+            ExecutionResponse(success=False, error=error, execution_time_ms=elapsed_ms)
+            for _ in requests
+        ]
+
+    async def _prepare_workspace(
+        self, request: ExecutionRequest, work_dir: Optional[Path] = None
+    ) -> None:
         """Prepare workspace directory with script and files."""
+        work_dir = work_dir or self.work_dir
+
         # Write execution script
         if request.script_path and request.script_path.exists():
             code = request.script_path.read_text(encoding="utf-8")
@@ -342,26 +577,28 @@ class DockerSandbox(BaseSandbox):
 
         # Create wrapper script
         script_content = WRAPPER_SCRIPT.format(code=indented_code)
-        script_path = self.work_dir / "_exec.py"
+        script_path = work_dir / "_exec.py"
         script_path.write_text(script_content, encoding="utf-8")
 
         # Write arguments
-        args_path = self.work_dir / "_args.json"
-        args_path.write_text(json.dumps(request.args or {}), encoding="utf-8")
+        args_path = work_dir / "_args.json"
+        args_path.write_bytes(dump_json(request.args or {}))
 
-        # Write input files
+        # Write input files (the workspace is bind-mounted, so these land in
+        # the container without any per-file copy); create each directory once
         if request.files:
-            for filename, content in request.files.items():
-                file_path = self.work_dir / filename
-                file_path.parent.mkdir(parents=True, exist_ok=True)
-                file_path.write_bytes(content)
+            stage_files(work_dir, request.files)
 
     async def _exec_in_container(
-        self, request: ExecutionRequest
+        self, request: ExecutionRequest, script: str = "/workspace/_exec.py"
     ) -> Tuple[int, str, str]:
         """
         Execute command in container.
 
+        Args:
+            request: Execution request (supplies environment variables)
+            script: Path of the script to run inside the container
+
         Returns:
             Tuple of (exit_code, stdout, stderr)
         """
@@ -372,25 +609,21 @@ class DockerSandbox(BaseSandbox):
         # Execute with timeout
         loop = asyncio.get_event_loop()
 
-        async def run_exec():
-            return await loop.run_in_executor(
-                None,
-                lambda: self._container.exec_run(
-                    cmd=["python", "/workspace/_exec.py"],
-                    workdir="/workspace",
-                    environment=env_vars,
-                    demux=True,
-                )
-            )
-
         try:
-            exec_result = await asyncio.wait_for(
-                run_exec(),
-                timeout=self.config.timeout_seconds
-            )
+            async with time_limit(self.config.timeout_seconds):
+                exec_result = await loop.run_in_executor(
+                    None,
+                    lambda: self._container.exec_run(
+                        # Own process group, so a timeout kills its children too
+                        cmd=["setsid", "-w", "python", script],
+                        workdir="/workspace",
+                        environment=env_vars,
+                        demux=True,
+                    )
+                )
         except asyncio.TimeoutError:
-            # Try to kill the execution
-            await self._kill_running_processes()
+            # Kill just this script; the container stays up for reuse
+            await self._kill_running_processes(script)
             raise
 
         # Parse output
@@ -403,43 +636,60 @@ class DockerSandbox(BaseSandbox):
             stderr_bytes.decode("utf-8", errors="replace"),
         )
 
-    async def _kill_running_processes(self) -> None:
-        """Kill running processes in container after timeout."""
+    async def _kill_running_processes(self, script: Optional[str] = None) -> None:
+        """
+        Kill running processes in container after timeout.
+
+        Args:
+            script: Only kill the process groups of processes whose command
+                line runs this script (all python processes if None)
+        """
+        env = None
+        if script:
+            # SIGKILL the whole group so subprocesses the script started die
+            # too; the pattern goes through env to keep it off sh's cmdline
+            cmd = [
+                "sh", "-c",
+                'for pid in $(pgrep -f "$SCRIPT"); do pkill -9 -g "$pid"; done',
+            ]
+            env = {"SCRIPT": re.escape(script)}
+        else:
+            cmd = ["pkill", "-9", "python"]
         try:
             loop = asyncio.get_event_loop()
             await loop.run_in_executor(
                 None,
-                lambda: self._container.exec_run(
-                    cmd=["pkill", "-9", "python"],
-                    user="root",
-                )
+                lambda: self._container.exec_run(cmd=cmd, environment=env, user="root")
             )
         except Exception as e:
             logger.warning(f"Failed to kill processes: {e}")
 
-    async def _collect_results(self) -> Tuple[Any, Optional[str]]:
+    async def _collect_results(
+        self, work_dir: Optional[Path] = None
+    ) -> Tuple[Any, Optional[str]]:
         """
         Collect execution results from workspace.
 
         Returns:
             Tuple of (output, error)
         """
+        work_dir = work_dir or self.work_dir
         output = None
         error = None
 
         # Check for result file
-        result_file = self.work_dir / "_result.json"
+        result_file = work_dir / "_result.json"
         if result_file.exists():
             try:
-                output = json.loads(result_file.read_text(encoding="utf-8"))
+                output = load_json(result_file.read_bytes())
             except json.JSONDecodeError as e:
                 logger.warning(f"Failed to parse result: {e}")
 
         # Check for error file
-        error_file = self.work_dir / "_error.json"
+        error_file = work_dir / "_error.json"
         if error_file.exists():
             try:
-                error_info = json.loads(error_file.read_text(encoding="utf-8"))
+                error_info = load_json(error_file.read_bytes())
                 error = error_info.get("error", "Unknown error")
             except json.JSONDecodeError:
                 error = "Execution failed with unknown error"
@@ -447,21 +697,26 @@ class DockerSandbox(BaseSandbox):
         return output, error
 
     async def _collect_output_files(
-        self, request: ExecutionRequest
+        self, request: ExecutionRequest, work_dir: Optional[Path] = None
     ) -> Dict[str, bytes]:
         """Collect output files from workspace."""
+        work_dir = work_dir or self.work_dir
         files = {}
 
         # Skip internal files and input files
-        skip_files = {"_exec.py", "_args.json", "_result.json", "_error.json"}
+        skip_files = {
+            "_exec.py", "_args.json", "_env.json", "_result.json", "_error.json"
+        }
         input_files = set(request.files.keys()) if request.files else set()
 
-        for path in self.work_dir.rglob("*"):
-            if path.is_file():
-                rel_path = str(path.relative_to(self.work_dir))
+        # One scandir pass per directory; file types come from the dirents
+        for dirpath, _, filenames in os.walk(work_dir):
+            for name in filenames:
+                path = Path(dirpath, name)
+                rel_path = str(path.relative_to(work_dir))
 
                 # Skip internal and input files
-                if path.name in skip_files or rel_path in input_files:
+                if name in skip_files or rel_path in input_files:
                     continue
 
                 try:
@@ -486,6 +741,17 @@ class DockerSandbox(BaseSandbox):
             except Exception as e:
                 logger.warning(f"Failed to cleanup {item}: {e}")
 
+    async def reset_workdir(self) -> None:
+        """
+        Clear the container's /workspace without restarting the container.
+
+        Lets callers reuse one warm container (interpreter, page cache,
+        installed packages) across unrelated runs.
+        """
+        if not self._is_setup:
+            raise RuntimeError("Sandbox not initialized. Call setup() first.")
+        await self._cleanup_workspace()
+
     async def install_packages(self, packages: List[str]) -> bool:
         """
         Install Python packages in the container.
@@ -563,8 +829,21 @@ class DockerSandbox(BaseSandbox):
         """Get the container ID if running."""
         return self._container.short_id if self._container else None
 
-    async def get_container_stats(self) -> Optional[Dict[str, Any]]:
-        """Get container resource usage statistics."""
+    async def get_container_stats(
+        self, one_shot: bool = True
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Get container resource usage statistics.
+
+        Args:
+            one_shot: Take a single sample (docker SDK >= 6.0) instead of
+                letting Docker wait for a second one (~1s). CPU usage is then
+                measured against the previous call's sample, so the first
+                call reports 0.0.
+
+        Returns:
+            CPU and memory usage, or None if unavailable
+        """
         if not self._container:
             return None
 
@@ -572,14 +851,25 @@ class DockerSandbox(BaseSandbox):
             loop = asyncio.get_event_loop()
             stats = await loop.run_in_executor(
                 None,
-                lambda: self._container.stats(stream=False)
+                lambda: self._container.stats(stream=False, one_shot=one_shot)
             )
 
             # Parse CPU and memory usage
-            cpu_delta = stats["cpu_stats"]["cpu_usage"]["total_usage"] - \
-                       stats["precpu_stats"]["cpu_usage"]["total_usage"]
-            system_delta = stats["cpu_stats"]["system_cpu_usage"] - \
-                          stats["precpu_stats"]["system_cpu_usage"]
+            cpu = (
+                stats["cpu_stats"]["cpu_usage"]["total_usage"],
+                stats["cpu_stats"].get("system_cpu_usage", 0),
+            )
+            if one_shot:
+                prev_cpu = self._prev_cpu or cpu
+            else:
+                prev_cpu = (
+                    stats["precpu_stats"]["cpu_usage"]["total_usage"],
+                    stats["precpu_stats"].get("system_cpu_usage", 0),
+                )
+            self._prev_cpu = cpu
+
+            cpu_delta = cpu[0] - prev_cpu[0]
+            system_delta = cpu[1] - prev_cpu[1]
 
             cpu_percent = 0.0
             if system_delta > 0:
@@ -601,6 +891,145 @@ class DockerSandbox(BaseSandbox):
             return None
 
 
+class DockerSandboxPool:
+    """
+    Pool of warm DockerSandboxes shared by concurrent callers.
+
+    Containers are started once and handed out through a queue; a released
+    sandbox gets a clean /workspace and goes back to the queue, and is
+    replaced by a fresh container after max_uses executions.
+
+    Usage:
+        async with DockerSandboxPool(config, size=4) as pool:
+            sandbox = await pool.acquire()
+            try:
+                response = await sandbox.execute(request)
+            finally:
+                await pool.release(sandbox)
+    """
+
+    def __init__(
+        self,
+        config: SandboxConfig,
+        size: Optional[int] = None,
+        max_uses: int = 100,
+    ):
+        """
+        Initialize the pool (containers start in start()).
+
+        Args:
+            config: Configuration for every sandbox in the pool
+            size: Number of containers (defaults to the CPU count)
+            max_uses: Leases a container serves before it is replaced
+                (0 keeps containers for the pool's lifetime)
+        """
+        self.config = config
+        self.size = size or os.cpu_count() or 1
+        self.max_uses = max_uses
+        self._queue: asyncio.Queue = asyncio.Queue()
+        self._uses: Dict[DockerSandbox, int] = {}
+
+    async def __aenter__(self) -> "DockerSandboxPool":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    async def start(self) -> None:
+        """Start all containers, sharing one Docker client between them."""
+        if self._uses:
+            return
+
+        # The first sandbox builds the image if needed; the rest reuse it
+        first = await self._new_sandbox(self.config)
+        self._queue.put_nowait(first)
+        if self.config.docker_client is None:
+            self.config = dataclasses.replace(self.config, docker_client=first.client)
+
+        results = await asyncio.gather(
+            *(self._new_sandbox(self.config) for _ in range(self.size - 1)),
+            return_exceptions=True,
+        )
+        for result in results:
+            if isinstance(result, BaseException):
+                # Don't leak the containers that did start
+                await self.close()
+                raise result
+            self._queue.put_nowait(result)
+        logger.info(f"Docker sandbox pool ready: {self.size} containers")
+
+    async def _new_sandbox(self, config: SandboxConfig) -> DockerSandbox:
+        """Start a sandbox and track it as a pool member."""
+        sandbox = DockerSandbox(config)
+        await sandbox.setup()
+        self._uses[sandbox] = 0
+        return sandbox
+
+    async def acquire(self) -> DockerSandbox:
+        """
+        Wait for an idle sandbox and take it.
+
+        Raises:
+            RuntimeError: If every container was lost and none could be
+                replaced
+        """
+        sandbox = await self._queue.get()
+        if sandbox is None:
+            # Leave the marker for the next waiter
+            self._queue.put_nowait(None)
+            raise RuntimeError("Docker sandbox pool has no containers left")
+        return sandbox
+
+    async def release(self, sandbox: DockerSandbox) -> None:
+        """
+        Return a sandbox to the pool.
+
+        Its workspace is cleared; once it has served max_uses leases it is
+        torn down and a fresh one takes its place. A sandbox that fails to
+        reset is replaced too; if no replacement starts, the pool shrinks.
+        """
+        self._uses[sandbox] += 1
+        try:
+            if self.max_uses and self._uses[sandbox] >= self.max_uses:
+                await self._retire(sandbox)
+                sandbox = await self._new_sandbox(self.config)
+            else:
+                await sandbox.reset_workdir()
+        except Exception as e:
+            logger.warning(f"Recycling pooled sandbox failed, replacing it: {e}")
+            await self._retire(sandbox)
+            try:
+                sandbox = await self._new_sandbox(self.config)
+            except Exception as e:
+                logger.error(
+                    f"Replacing pooled sandbox failed, pool shrinks to "
+                    f"{len(self._uses)}: {e}"
+                )
+                if not self._uses:
+                    # Fail acquire() instead of leaving callers waiting forever
+                    self._queue.put_nowait(None)
+                return
+        self._queue.put_nowait(sandbox)
+
+    async def _retire(self, sandbox: DockerSandbox) -> None:
+        """Stop tracking a sandbox and tear it down (once)."""
+        if self._uses.pop(sandbox, None) is None:
+            return
+        try:
+            await sandbox.cleanup()
+        except Exception as e:
+            logger.warning(f"Pooled sandbox cleanup failed: {e}")
+
+    async def close(self) -> None:
+        """Stop every container, including ones still leased out."""
+        sandboxes = list(self._uses)
+        self._uses.clear()
+        while not self._queue.empty():
+            self._queue.get_nowait()
+        await asyncio.gather(*(sandbox.cleanup() for sandbox in sandboxes))
+
+
 async def check_docker_available() -> Tuple[bool, str]:
     """
     Check if Docker is available and running.
@@ -620,30 +1049,31 @@ async def check_docker_available() -> Tuple[bool, str]:
         return False, f"Docker not available: {e}"
 
 
-async def build_base_image(force: bool = False) -> bool:
+async def build_base_image(force: bool = False, client: Any = None) -> bool:
     """
     Build the base Docker image for sandboxes.
 
+    An existing image is reused only if its build-hash label matches the
+    current Dockerfile.
+
     Args:
-        force: Force rebuild even if image exists
+        force: Force rebuild even if an up-to-date image exists
+        client: Docker SDK client to use (a new one if None)
 
     Returns:
         True if successful
     """
     try:
-        import docker
-        client = docker.from_env()
+        if client is None:
+            import docker
+            client = docker.from_env()
 
         image_name = f"{DEFAULT_IMAGE_NAME}:{DEFAULT_IMAGE_TAG}"
 
-        # Check if image exists
-        if not force:
-            try:
-                client.images.get(image_name)
-                logger.info(f"Image already exists: {image_name}")
-                return True
-            except docker.errors.ImageNotFound:
-                pass
+        # Check if an up-to-date image exists
+        if not force and _image_is_current(client, image_name):
+            logger.info(f"Image already up to date: {image_name}")
+            return True
 
         # Build image
         logger.info(f"Building image: {image_name}")
@@ -656,7 +1086,9 @@ async def build_base_image(force: bool = False) -> bool:
                 path=build_dir,
                 tag=image_name,
                 rm=True,
+                labels={BUILD_HASH_LABEL: image_build_hash()},
             )
+        _current_images.add(image_name)
 
         logger.info(f"Successfully built: {image_name}")
         return True
@@ -664,3 +1096,31 @@ async def build_base_image(force: bool = False) -> bool:
     except Exception as e:
         logger.error(f"Failed to build image: {e}")
         return False
+
+
+def get_image_build_hash(client: Any = None) -> Optional[str]:
+    """
+    Read the build-hash label of the local base image.
+
+    Talks to the Docker API synchronously; async callers should run it in
+    an executor.
+
+    Args:
+        client: Docker SDK client to use (a temporary one if None)
+
+    Returns:
+        The label value, or None if Docker or the image is unavailable
+    """
+    image_name = f"{DEFAULT_IMAGE_NAME}:{DEFAULT_IMAGE_TAG}"
+    if client is not None:
+        return _image_build_label(client, image_name)
+
+    try:
+        import docker
+        client = docker.from_env()
+    except Exception:
+        return None
+    try:
+        return _image_build_label(client, image_name)
+    finally:
+        client.close()
@@ -16,8 +16,10 @@ import shutil
 import sys
 import tempfile
 import time
+from functools import lru_cache
 from io import StringIO
 from pathlib import Path
+from types import CodeType
 from typing import Any, Dict, List, Optional, Set
 
 from .manager import (
@@ -25,11 +27,18 @@ from .manager import (
     ExecutionRequest,
     ExecutionResponse,
     SandboxConfig,
+    stage_files,
 )
 
 logger = logging.getLogger(__name__)
 
 
+@lru_cache(maxsize=256)
+def _compile(code: str) -> CodeType:
+    """Compile sandbox code once per distinct source string."""
+    return compile(code, "<sandbox>", "exec")
+
+
 class InProcessSandbox(BaseSandbox):
     """
     In-process sandbox for fast code execution.
@@ -122,8 +131,8 @@ class InProcessSandbox(BaseSandbox):
             # Get code
             code = self._get_code(request, exec_dir)
 
-            # Execute
-            exec(code, namespace)
+            # Execute (args are passed by reference, never copied)
+            exec(_compile(code), namespace)
 
             # Get result
             result = namespace.get("result") or namespace.get("output")
@@ -170,13 +179,7 @@ class InProcessSandbox(BaseSandbox):
 
         # Write input files
         if request.files:
-            for filename, content in request.files.items():
-                file_path = exec_dir / filename
-                file_path.parent.mkdir(parents=True, exist_ok=True)
-                if isinstance(content, bytes):
-                    file_path.write_bytes(content)
-                else:
-                    file_path.write_text(content, encoding="utf-8")
+            stage_files(exec_dir, request.files)
 
         return exec_dir
 
@@ -190,9 +193,9 @@ class InProcessSandbox(BaseSandbox):
                 scripts_dir = exec_dir / "scripts"
                 scripts_dir.mkdir(exist_ok=True)
 
+                # copyfile uses the kernel fast path (sendfile on Linux)
                 for sibling in request.script_path.parent.glob("*.py"):
-                    dest = scripts_dir / sibling.name
-                    dest.write_text(sibling.read_text(encoding="utf-8"), encoding="utf-8")
+                    shutil.copyfile(sibling, scripts_dir / sibling.name)
 
                 code = f"import sys; sys.path.insert(0, 'scripts')\n{code}"
 
@@ -6,16 +6,26 @@ Provides:
 - ExecutionRequest/Response: Request and response models
 - BaseSandbox: Abstract base class for sandbox implementations
 - SandboxManager: Factory for creating and managing sandboxes
+- stage_files: Shared helper for writing request input files
+- dump_json/load_json: Host-side JSON for sandbox IPC (orjson if installed)
 """
 
 from __future__ import annotations
 
+import asyncio
+import json
 import logging
 from abc import ABC, abstractmethod
 from dataclasses import dataclass, field
 from enum import Enum
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Union
+
+# orjson (optional) encodes/decodes the host side of sandbox JSON
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
@@ -42,6 +52,12 @@ class SandboxConfig:
         mount_points: Host paths to mount in sandbox
         python_version: Python version to use
         pre_installed_packages: Packages to pre-install
+        docker_client: Shared Docker SDK client (Docker sandboxes open their
+            own connection if None; a shared client is not closed by them)
+        worker_max_uses: Executions a warm ProcessSandbox worker serves
+            before it is recycled. 0 (the default) starts a fresh
+            interpreter per execute; warm workers share interpreter state
+            (builtins, imported modules) between runs, so reuse is opt-in
     """
     type: SandboxType = SandboxType.PROCESS
     timeout_seconds: int = 30
@@ -62,6 +78,12 @@ class SandboxConfig:
     allow_file_write: bool = True
     allowed_paths: List[str] = field(default_factory=list)
 
+    # Docker
+    docker_client: Any = None
+
+    # Process
+    worker_max_uses: int = 0
+
 
 @dataclass
 class ExecutionRequest:
@@ -111,6 +133,48 @@ class ExecutionResponse:
     error: Optional[str] = None
 
 
+def stage_files(dest: Path, files: Dict[str, Union[bytes, str]]) -> None:
+    """
+    Write request input files under dest.
+
+    Each distinct parent directory is created once, and every file is
+    written with a single write of its buffer (str content as UTF-8).
+
+    Args:
+        dest: Directory the sandboxed code runs in
+        files: Relative filename -> content
+    """
+    paths = {filename: dest / filename for filename in files}
+    for directory in {path.parent for path in paths.values()} - {dest}:
+        directory.mkdir(parents=True, exist_ok=True)
+
+    for filename, content in files.items():
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+        paths[filename].write_bytes(content)
+
+
+def dump_json(obj: Any) -> bytes:
+    """Serialize to UTF-8 JSON bytes (orjson if installed)."""
+    if orjson is not None:
+        return orjson.dumps(
+            obj, option=orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+        )
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+
+def load_json(data: bytes) -> Any:
+    """Parse JSON bytes (orjson if installed); raises json.JSONDecodeError."""
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # Sandboxed scripts write with the stdlib, which emits NaN and
+            # Infinity; orjson rejects those, json.loads accepts them
+            pass
+    return json.loads(data)
+
+
 class BaseSandbox(ABC):
     """
     Abstract base class for sandbox implementations.
@@ -212,6 +276,8 @@ class SandboxManager:
         self.default_config = default_config or SandboxConfig()
         self._sandboxes: Dict[str, BaseSandbox] = {}
         self._sandbox_configs: Dict[str, SandboxConfig] = {}
+        # Setups in flight, by ID; only callers of the same ID wait on them
+        self._pending: Dict[str, asyncio.Future] = {}
 
     async def get_sandbox(
         self,
@@ -228,16 +294,42 @@ class SandboxManager:
         Returns:
             Initialized sandbox instance
         """
-        if sandbox_id in self._sandboxes:
-            return self._sandboxes[sandbox_id]
-
-        config = config or self.default_config
-        sandbox = self._create_sandbox(config)
-
-        await sandbox.setup()
-
-        self._sandboxes[sandbox_id] = sandbox
-        self._sandbox_configs[sandbox_id] = config
+        while True:
+            sandbox = self._sandboxes.get(sandbox_id)
+            if sandbox is not None:
+                return sandbox
+
+            pending = self._pending.get(sandbox_id)
+            if pending is None:
+                break
+            try:
+                return await asyncio.shield(pending)
+            except asyncio.CancelledError:
+                # Retry only if the creating caller was cancelled, not us
+                if not pending.cancelled():
+                    raise
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[sandbox_id] = future
+        try:
+            config = config or self.default_config
+            sandbox = self._create_sandbox(config)
+
+            await sandbox.setup()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            # Mark it retrieved so a setup nobody else waited on doesn't warn
+            future.exception()
+            raise
+        else:
+            self._sandboxes[sandbox_id] = sandbox
+            self._sandbox_configs[sandbox_id] = config
+            future.set_result(sandbox)
+        finally:
+            del self._pending[sandbox_id]
 
         logger.info(f"Created sandbox: {sandbox_id} (type={config.type.value})")
 
@@ -11,25 +11,268 @@ Features:
 from __future__ import annotations
 
 import asyncio
+import itertools
 import json
 import logging
 import os
 import shutil
+import signal
+import socket
+import struct
+import subprocess
 import sys
 import tempfile
 import time
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Set
+from typing import Any, Dict, List, Optional, Set, Tuple
 
 from .manager import (
     BaseSandbox,
     ExecutionRequest,
     ExecutionResponse,
     SandboxConfig,
+    dump_json,
+    load_json,
+    stage_files,
 )
 
+if sys.version_info >= (3, 11):
+    from asyncio import timeout as time_limit
+else:
+    from async_timeout import timeout as time_limit
+
 logger = logging.getLogger(__name__)
 
+# RAM-backed filesystem used for work dirs when it has room to spare
+SHM_DIR = "/dev/shm"
+SHM_MIN_FREE_BYTES = 256 * 1024 * 1024
+
+
+def _default_work_root() -> Optional[str]:
+    """
+    Parent directory for auto-created work dirs.
+
+    Input and output files are exchanged with the sandboxed process through
+    the work dir, so putting it on tmpfs keeps that hand-off in shared
+    memory. Falls back to tempfile's default when /dev/shm is missing,
+    read-only or nearly full.
+    """
+    try:
+        stats = os.statvfs(SHM_DIR)
+    except (AttributeError, OSError):
+        return None
+    if not os.access(SHM_DIR, os.W_OK | os.X_OK):
+        return None
+    if stats.f_bavail * stats.f_frsize < SHM_MIN_FREE_BYTES:
+        return None
+    return SHM_DIR
+
+
+# Long-lived interpreter that runs prepared _runner.py scripts on request.
+# Requests and replies are length-prefixed JSON on a Unix socket whose fd is
+# passed as argv[1]; fds 0-2 point at /dev/null between runs and at
+# per-execution _stdout.txt/_stderr.txt during one.
+WORKER_SCRIPT = r'''
+import importlib
+import json
+import os
+import runpy
+import socket
+import struct
+import sys
+import traceback
+
+_sock = socket.socket(fileno=int(sys.argv[1]))
+_devnull = os.open(os.devnull, os.O_RDWR)
+for _fd in (0, 1, 2):
+    os.dup2(_devnull, _fd)
+
+_base_path = list(sys.path)
+_base_modules = set(sys.modules)
+
+
+def _read_exact(n):
+    buf = b""
+    while len(buf) < n:
+        chunk = _sock.recv(n - len(buf))
+        if not chunk:
+            return None
+        buf += chunk
+    return buf
+
+
+def _thread_count():
+    # OS-level count also sees threads started via _thread or C extensions
+    try:
+        return len(os.listdir("/proc/self/task"))
+    except OSError:
+        import threading
+        return threading.active_count()
+
+
+def _run(script):
+    try:
+        runpy.run_path(script, run_name="__main__")
+    except SystemExit as e:
+        if e.code is None or isinstance(e.code, int):
+            return e.code or 0
+        print(e.code, file=sys.stderr)
+        return 1
+    except BaseException:
+        traceback.print_exc()
+        return 1
+    return 0
+
+
+while True:
+    header = _read_exact(4)
+    if header is None:
+        break
+    request = json.loads(_read_exact(struct.unpack(">I", header)[0]))
+    exec_dir = request["exec_dir"]
+
+    for _fd, _name in ((1, "_stdout.txt"), (2, "_stderr.txt")):
+        _out = os.open(
+            os.path.join(exec_dir, _name), os.O_WRONLY | os.O_CREAT | os.O_TRUNC
+        )
+        os.dup2(_out, _fd)
+        os.close(_out)
+
+    os.environ.clear()
+    os.environ.update(request["env"])
+    os.chdir(exec_dir)
+    sys.argv = [request["script"]]
+    importlib.invalidate_caches()
+
+    try:
+        exit_code = _run(request["script"])
+    finally:
+        sys.stdout, sys.stderr = sys.__stdout__, sys.__stderr__
+        sys.stdout.flush()
+        sys.stderr.flush()
+        os.dup2(_devnull, 1)
+        os.dup2(_devnull, 2)
+
+        # Forget the run's path tweaks and any modules loaded from the
+        # sandbox itself; library imports stay warm
+        sys.path[:] = _base_path
+        for _mod in set(sys.modules) - _base_modules:
+            _file = getattr(sys.modules[_mod], "__file__", None) or ""
+            if _file.startswith(request["work_dir"]):
+                del sys.modules[_mod]
+
+    reply = json.dumps({"exit_code": exit_code, "threads": _thread_count()}).encode()
+    _sock.sendall(struct.pack(">I", len(reply)) + reply)
+'''
+
+
+# Start sandboxed interpreters in their own process group, so killing the
+# group on timeout also reaps any subprocesses the script started
+if sys.platform == "win32":
+    _NEW_PROCESS_GROUP: Dict[str, Any] = {
+        "creationflags": subprocess.CREATE_NEW_PROCESS_GROUP,
+    }
+else:
+    _NEW_PROCESS_GROUP = {"start_new_session": True}
+
+
+def _kill_process_group(process: Any) -> None:
+    """SIGKILL a process started with _NEW_PROCESS_GROUP and its descendants."""
+    try:
+        if sys.platform == "win32":
+            process.kill()
+        else:
+            os.killpg(process.pid, signal.SIGKILL)
+    except (ProcessLookupError, PermissionError):
+        # Group already gone (PermissionError: only a zombie leader left, macOS)
+        pass
+
+
+# Workers need fd passing for their control socket; elsewhere (Windows)
+# every execute starts a fresh interpreter instead
+WORKERS_SUPPORTED = hasattr(socket, "AF_UNIX")
+
+
+class _Worker:
+    """A warm Python interpreter running WORKER_SCRIPT."""
+
+    def __init__(self, python: str, env: Dict[str, str], cwd: Path):
+        self.sock, child_sock = socket.socketpair()
+        try:
+            self.process = subprocess.Popen(
+                [python, "-u", "-c", WORKER_SCRIPT, str(child_sock.fileno())],
+                stdin=subprocess.DEVNULL,
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                env=env,
+                cwd=str(cwd),
+                pass_fds=(child_sock.fileno(),),
+                **_NEW_PROCESS_GROUP,
+            )
+        finally:
+            child_sock.close()
+        # Non-blocking so any running event loop can drive the exchange
+        self.sock.setblocking(False)
+        self.uses = 0
+        # Cleared once a run leaves threads behind; such a worker is retired
+        self.reusable = True
+
+    @property
+    def alive(self) -> bool:
+        return self.process.poll() is None
+
+    async def run(self, request: Dict[str, Any]) -> Optional[int]:
+        """
+        Run one prepared script.
+
+        Returns:
+            The script's exit code, or None if the worker died
+        """
+        self.uses += 1
+        loop = asyncio.get_running_loop()
+        payload = dump_json(request)
+        try:
+            await loop.sock_sendall(
+                self.sock, struct.pack(">I", len(payload)) + payload
+            )
+            header = await self._recv_exact(loop, 4)
+            if header is None:
+                return None
+            reply = await self._recv_exact(loop, struct.unpack(">I", header)[0])
+            if reply is None:
+                return None
+            reply = load_json(reply)
+            self.reusable = reply.get("threads", 1) <= 1
+            return reply["exit_code"]
+        except (OSError, ValueError):
+            return None
+
+    async def _recv_exact(
+        self, loop: asyncio.AbstractEventLoop, n: int
+    ) -> Optional[bytes]:
+        buf = bytearray(n)
+        view = memoryview(buf)
+        received = 0
+        while received < n:
+            count = await loop.sock_recv_into(self.sock, view[received:])
+            if not count:
+                return None
+            received += count
+        return bytes(buf)
+
+    def kill(self) -> None:
+        _kill_process_group(self.process)
+        self.process.wait()
+        self.sock.close()
+
+    def close(self) -> None:
+        """Ask the worker to exit (EOF on its socket), then reap it."""
+        self.sock.close()
+        try:
+            self.process.wait(timeout=1)
+        except subprocess.TimeoutExpired:
+            self.kill()
+
 
 class ProcessSandbox(BaseSandbox):
     """
@@ -43,6 +286,18 @@ class ProcessSandbox(BaseSandbox):
 
     Best for development and testing environments.
     For production, consider DockerSandbox.
+
+    By default every execute starts a fresh interpreter. With
+    config.worker_max_uses > 0, executions instead run on warm worker
+    interpreters reused for up to that many runs, so the startup cost is
+    paid once per worker. Between runs a worker resets only the working
+    directory, os.environ, sys.argv, sys.path, the run's own __main__
+    globals, and modules imported from the sandbox directory. Everything
+    else in the interpreter carries over to the next run: changes to
+    builtins or to library/stdlib module attributes, and imported
+    library modules. A worker whose run leaves extra threads alive, or
+    that times out or dies, is discarded rather than reused. Only enable
+    reuse for trusted code that does not rely on a pristine interpreter.
     """
 
     # Wrapper script template
@@ -56,7 +311,7 @@ from pathlib import Path
 os.chdir("{work_dir}")
 
 # Load arguments
-args = {args_json}
+args = json.loads({args_json})
 
 # Make args available as global
 globals()['args'] = args
@@ -106,6 +361,9 @@ sys.exit(0 if _error is None else 1)
         self.work_dir: Optional[Path] = None
         self._installed_packages: Set[str] = set()
         self._python_path: str = sys.executable
+        self._exec_ids = itertools.count()
+        self._idle_workers: List[_Worker] = []
+        self._workers: Set[_Worker] = set()
 
     async def setup(self) -> None:
         """Create working directory and initialize environment."""
@@ -117,7 +375,9 @@ sys.exit(0 if _error is None else 1)
             self.work_dir = Path(self.config.work_dir)
             self.work_dir.mkdir(parents=True, exist_ok=True)
         else:
-            self.work_dir = Path(tempfile.mkdtemp(prefix="cape_sandbox_"))
+            self.work_dir = Path(
+                tempfile.mkdtemp(prefix="cape_sandbox_", dir=_default_work_root())
+            )
 
         logger.debug(f"ProcessSandbox work_dir: {self.work_dir}")
 
@@ -125,6 +385,11 @@ sys.exit(0 if _error is None else 1)
         if self.config.pre_installed_packages:
             await self.install_packages(self.config.pre_installed_packages)
 
+        # Boot the first worker now, so its interpreter startup overlaps
+        # whatever the caller does before the first execute
+        if WORKERS_SUPPORTED and self.config.worker_max_uses > 0:
+            self._spawn_idle_worker()
+
         self._is_setup = True
 
     async def execute(self, request: ExecutionRequest) -> ExecutionResponse:
@@ -150,40 +415,26 @@ sys.exit(0 if _error is None else 1)
             # Build environment
             env = self._build_environment(request)
 
-            # Execute subprocess
-            process = await asyncio.create_subprocess_exec(
-                self._python_path,
-                str(script_path),
-                cwd=str(exec_dir),
-                env=env,
-                stdout=asyncio.subprocess.PIPE,
-                stderr=asyncio.subprocess.PIPE,
-            )
+            # Execute
+            if WORKERS_SUPPORTED and self.config.worker_max_uses > 0:
+                completed = await self._run_in_worker(exec_dir, script_path, env)
+            else:
+                completed = await self._run_subprocess(exec_dir, script_path, env)
 
-            try:
-                stdout, stderr = await asyncio.wait_for(
-                    process.communicate(),
-                    timeout=self.config.timeout_seconds,
-                )
-            except asyncio.TimeoutError:
-                process.kill()
-                await process.wait()
+            if completed is None:
                 return ExecutionResponse(
                     success=False,
                     error=f"Execution timeout ({self.config.timeout_seconds}s)",
                     execution_time_ms=(time.time() - start_time) * 1000,
                 )
-
-            # Parse results
-            stdout_str = stdout.decode("utf-8", errors="replace")
-            stderr_str = stderr.decode("utf-8", errors="replace")
+            returncode, stdout_str, stderr_str = completed
 
             # Read result file
             output = None
             result_file = exec_dir / "_result.json"
             if result_file.exists():
                 try:
-                    result_data = json.loads(result_file.read_text(encoding="utf-8"))
+                    result_data = load_json(result_file.read_bytes())
                     output = result_data.get("result")
                     if result_data.get("error"):
                         stderr_str = result_data["error"] + "\n" + stderr_str
@@ -196,14 +447,14 @@ sys.exit(0 if _error is None else 1)
             execution_time = (time.time() - start_time) * 1000
 
             return ExecutionResponse(
-                success=process.returncode == 0,
+                success=returncode == 0,
                 output=output,
                 stdout=stdout_str,
                 stderr=stderr_str,
-                exit_code=process.returncode or 0,
+                exit_code=returncode or 0,
                 execution_time_ms=execution_time,
                 files_created=files_created,
-                error=stderr_str if process.returncode != 0 and not output else None,
+                error=stderr_str if returncode != 0 and not output else None,
             )
 
         except Exception as e:
@@ -214,6 +465,135 @@ sys.exit(0 if _error is None else 1)
                 execution_time_ms=(time.time() - start_time) * 1000,
             )
 
+    async def _run_subprocess(
+        self,
+        exec_dir: Path,
+        script_path: Path,
+        env: Dict[str, str],
+    ) -> Optional[Tuple[int, str, str]]:
+        """
+        Run the prepared script in a fresh interpreter.
+
+        Like a worker run, stdout/stderr go straight to _stdout.txt and
+        _stderr.txt in exec_dir, so the parent reads each stream once at
+        the end instead of draining pipes chunk by chunk.
+
+        Returns:
+            (exit code, stdout, stderr), or None on timeout
+        """
+        with open(exec_dir / "_stdout.txt", "wb") as stdout, \
+                open(exec_dir / "_stderr.txt", "wb") as stderr:
+            process = await asyncio.create_subprocess_exec(
+                self._python_path,
+                str(script_path),
+                cwd=str(exec_dir),
+                env=env,
+                stdout=stdout,
+                stderr=stderr,
+                **_NEW_PROCESS_GROUP,
+            )
+
+        try:
+            async with time_limit(self.config.timeout_seconds):
+                await process.wait()
+        except asyncio.TimeoutError:
+            _kill_process_group(process)
+            await process.wait()
+            return None
+
+        return process.returncode, *self._read_output(exec_dir)
+
+    async def _run_in_worker(
+        self,
+        exec_dir: Path,
+        script_path: Path,
+        env: Dict[str, str],
+    ) -> Optional[Tuple[int, str, str]]:
+        """
+        Run the prepared script on a warm worker.
+
+        The socket exchange runs on whichever event loop is current, so
+        workers are not tied to the loop that started them.
+
+        Returns:
+            (exit code, stdout, stderr), or None on timeout
+        """
+        worker = self._acquire_worker(env)
+        try:
+            async with time_limit(self.config.timeout_seconds):
+                returncode = await worker.run({
+                    "exec_dir": str(exec_dir),
+                    "script": str(script_path),
+                    "work_dir": str(self.work_dir),
+                    "env": env,
+                })
+        except asyncio.TimeoutError:
+            worker.kill()
+            return None
+        except BaseException:
+            # Cancelled mid-exchange: a reply may still be in flight
+            worker.kill()
+            raise
+        finally:
+            self._release_worker(worker)
+
+        if returncode is None:
+            # Worker died mid-run (e.g. os._exit); report its exit status
+            worker.kill()
+            returncode = worker.process.returncode
+
+        return returncode, *self._read_output(exec_dir)
+
+    @staticmethod
+    def _read_output(exec_dir: Path) -> Tuple[str, str]:
+        """Read the (stdout, stderr) a run left in exec_dir."""
+        streams = []
+        for name in ("_stdout.txt", "_stderr.txt"):
+            try:
+                data = (exec_dir / name).read_bytes()
+            except FileNotFoundError:
+                data = b""
+            streams.append(data.decode("utf-8", errors="replace"))
+        return streams[0], streams[1]
+
+    def _acquire_worker(self, env: Dict[str, str]) -> _Worker:
+        """Take an idle live worker, or start a new one."""
+        while self._idle_workers:
+            worker = self._idle_workers.pop()
+            if worker.alive:
+                return worker
+            self._workers.discard(worker)
+
+        worker = _Worker(self._python_path, env, self.work_dir)
+        self._workers.add(worker)
+        return worker
+
+    def _spawn_idle_worker(self) -> None:
+        """Start a worker in the background and park it as idle."""
+        env = self._build_environment(ExecutionRequest())
+        worker = _Worker(self._python_path, env, self.work_dir)
+        self._workers.add(worker)
+        self._idle_workers.append(worker)
+
+    def _release_worker(self, worker: _Worker) -> None:
+        """
+        Return a worker to the pool, or retire it if dead, used up, or
+        left with background threads by its last run.
+        """
+        if not worker.alive:
+            self._workers.discard(worker)
+            worker.close()
+            return
+
+        if worker.reusable and worker.uses < self.config.worker_max_uses:
+            self._idle_workers.append(worker)
+            return
+
+        # Retire it and boot the replacement before anyone needs it
+        self._workers.discard(worker)
+        worker.close()
+        self._spawn_idle_worker()
+
     def _prepare_execution(self, request: ExecutionRequest) -> Path:
         """
         Prepare execution directory with code and files.
@@ -221,8 +601,8 @@ sys.exit(0 if _error is None else 1)
         Returns:
             Path to execution directory
         """
-        # Create execution subdirectory
-        exec_id = f"exec_{int(time.time() * 1000)}"
+        # Create execution subdirectory (counter keeps concurrent runs apart)
+        exec_id = f"exec_{int(time.time() * 1000)}_{next(self._exec_ids)}"
         exec_dir = self.work_dir / exec_id
         exec_dir.mkdir(parents=True, exist_ok=True)
 
@@ -231,20 +611,15 @@ sys.exit(0 if _error is None else 1)
 
         # Write input files
         if request.files:
-            for filename, content in request.files.items():
-                file_path = exec_dir / filename
-                file_path.parent.mkdir(parents=True, exist_ok=True)
-                if isinstance(content, bytes):
-                    file_path.write_bytes(content)
-                else:
-                    file_path.write_text(content, encoding="utf-8")
+            stage_files(exec_dir, request.files)
 
         # Create wrapper script
         indented_code = "\n".join("    " + line for line in code.split("\n"))
 
         wrapper = self.WRAPPER_TEMPLATE.format(
             work_dir=str(exec_dir).replace("\\", "\\\\"),
-            args_json=json.dumps(request.args or {}, ensure_ascii=False),
+            # A Python str literal holding the JSON, decoded by the script
+            args_json=repr(dump_json(request.args or {}).decode("utf-8")),
             indented_code=indented_code,
         )
 
@@ -268,9 +643,9 @@ sys.exit(0 if _error is None else 1)
                 scripts_dir = exec_dir / "scripts"
                 scripts_dir.mkdir(exist_ok=True)
 
+                # copyfile uses the kernel fast path (sendfile on Linux)
                 for sibling in request.script_path.parent.glob("*.py"):
-                    dest = scripts_dir / sibling.name
-                    dest.write_text(sibling.read_text(encoding="utf-8"), encoding="utf-8")
+                    shutil.copyfile(sibling, scripts_dir / sibling.name)
 
                 # Add scripts dir to path in code
                 script_content = f"import sys; sys.path.insert(0, 'scripts')\n{script_content}"
@@ -374,10 +749,8 @@ sys.exit(0 if _error is None else 1)
                 stderr=asyncio.subprocess.PIPE,
             )
 
-            stdout, stderr = await asyncio.wait_for(
-                process.communicate(),
-                timeout=120,  # 2 minutes for package installation
-            )
+            async with time_limit(120):  # 2 minutes for package installation
+                stdout, stderr = await process.communicate()
 
             if process.returncode == 0:
                 self._installed_packages.update(new_packages)
@@ -395,7 +768,12 @@ sys.exit(0 if _error is None else 1)
             return False
 
     async def cleanup(self) -> None:
-        """Remove working directory and cleanup resources."""
+        """Stop workers, remove working directory and cleanup resources."""
+        for worker in self._workers:
+            worker.close()
+        self._workers.clear()
+        self._idle_workers.clear()
+
         if self.work_dir and self.work_dir.exists():
             try:
                 shutil.rmtree(self.work_dir)
@@ -6,14 +6,18 @@ Provides lightweight, reusable tools that can be used by any cape.
 
 from cape.tools.search import (
     search,
+    search_batch,
     search_web,
     search_news,
+    clear_search_cache,
     SearchProvider,
 )
 
 __all__ = [
     "search",
+    "search_batch",
     "search_web",
     "search_news",
+    "clear_search_cache",
     "SearchProvider",
 ]
@@ -9,13 +9,34 @@ Features:
 - Structured results for LLM consumption
 """
 
+import copy
 import os
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from enum import Enum
-from typing import Dict, Any, List, Optional
+from functools import cache, lru_cache
+from typing import Callable, Dict, Any, List, Optional, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Summary layout shared by every successful search_web call
+SUMMARY_RESULTS = 3
+SNIPPET_CHARS = 200
+SUMMARY_PREFIX = "找到 "
+SUMMARY_SUFFIX = " 条结果:\n"
+
+# Provider responses are cached per (provider, query, options). Failures get
+# a much shorter TTL so an outage is retried soon without hammering the
+# provider on every call in the meantime.
+SEARCH_CACHE_TTL_OK = 300.0
+SEARCH_CACHE_TTL_ERR = 10.0
+SEARCH_CACHE_MAX_ENTRIES = 1024
+
+_search_cache: Dict[Tuple, Tuple[float, Any]] = {}
+_search_cache_lock = threading.Lock()
+
 
 class SearchProvider(Enum):
     """Available search providers."""
@@ -24,20 +45,93 @@ class SearchProvider(Enum):
     AUTO = "auto"  # Try Tavily first, fallback to DDG
 
 
+@cache
+def _load_tavily():
+    """Resolve the Tavily client class once (raises ImportError if missing)."""
+    from tavily import TavilyClient
+    return TavilyClient
+
+
+@cache
+def _load_ddgs():
+    """Resolve the DDGS class once, preferring ddgs over duckduckgo_search."""
+    try:
+        from ddgs import DDGS
+    except ImportError:
+        from duckduckgo_search import DDGS
+    return DDGS
+
+
+def clear_search_cache() -> None:
+    """Drop all cached provider responses."""
+    with _search_cache_lock:
+        _search_cache.clear()
+
+
+def _cache_store(key: Tuple, value: Any, ttl: float) -> None:
+    """Store a cache entry, evicting expired and then oldest entries."""
+    now = time.monotonic()
+    with _search_cache_lock:
+        if len(_search_cache) >= SEARCH_CACHE_MAX_ENTRIES:
+            for stale in [k for k, (exp, _) in _search_cache.items() if exp <= now]:
+                del _search_cache[stale]
+            while len(_search_cache) >= SEARCH_CACHE_MAX_ENTRIES:
+                del _search_cache[next(iter(_search_cache))]
+        _search_cache[key] = (now + ttl, value)
+
+
+def _cached_call(key: Tuple, fn: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Call a provider through the result cache.
+
+    ``key`` must start with the provider name so a cached Tavily failure
+    does not block the DuckDuckGo fallback. Provider failures (RuntimeError)
+    are cached for SEARCH_CACHE_TTL_ERR and re-raised on hit; configuration
+    errors (missing key or package) are not cached.
+    """
+    with _search_cache_lock:
+        entry = _search_cache.get(key)
+        if entry is not None and entry[0] <= time.monotonic():
+            del _search_cache[key]
+            entry = None
+
+    if entry is not None:
+        value = entry[1]
+        if isinstance(value, RuntimeError):
+            raise RuntimeError(str(value))
+        return copy.deepcopy(value)
+
+    try:
+        value = fn()
+    except RuntimeError as e:
+        _cache_store(key, e, SEARCH_CACHE_TTL_ERR)
+        raise
+
+    ttl = SEARCH_CACHE_TTL_OK if value.get("success") else SEARCH_CACHE_TTL_ERR
+    # The cache keeps its own copy: callers may mutate the results they get
+    _cache_store(key, copy.deepcopy(value), ttl)
+    return value
+
+
+@lru_cache(maxsize=1024)
 def _detect_language(query: str) -> str:
     """Detect query language for better search results."""
-    # Check for Chinese characters
+    # Pure-ASCII queries (the common case) cannot contain CJK characters
+    if query.isascii():
+        return "en"
+    # Single pass: Chinese wins outright; otherwise Japanese beats Korean
+    seen_ja = seen_ko = False
     for char in query:
         if '\u4e00' <= char <= '\u9fff':
             return "zh"
-    # Check for Japanese
-    for char in query:
-        if '\u3040' <= char <= '\u309f' or '\u30a0' <= char <= '\u30ff':
-            return "ja"
-    # Check for Korean
-    for char in query:
-        if '\uac00' <= char <= '\ud7af':
-            return "ko"
+        if '\u3040' <= char <= '\u30ff':
+            seen_ja = True
+        elif '\uac00' <= char <= '\ud7af':
+            seen_ko = True
+    if seen_ja:
+        return "ja"
+    if seen_ko:
+        return "ko"
     return "en"
 
 
@@ -60,7 +154,7 @@ def _tavily_search(
         raise ValueError("TAVILY_API_KEY not set")
 
     try:
-        from tavily import TavilyClient
+        TavilyClient = _load_tavily()
 
         client = TavilyClient(api_key=api_key)
         response = client.search(
@@ -70,14 +164,17 @@ def _tavily_search(
             include_answer=include_answer,
         )
 
-        results = []
-        for r in response.get("results", []):
-            results.append({
+        # Tavily may omit fields on individual results (e.g. no score), so
+        # default them instead of failing the whole response over to DDG
+        results = [
+            {
                 "title": r.get("title", ""),
                 "url": r.get("url", ""),
                 "snippet": r.get("content", ""),
                 "score": r.get("score", 0),
-            })
+            }
+            for r in response.get("results", [])
+        ]
 
         return {
             "success": True,
@@ -105,10 +202,7 @@ def _ddg_search(
     Free, no API key required. Good fallback option.
     """
     try:
-        try:
-            from ddgs import DDGS
-        except ImportError:
-            from duckduckgo_search import DDGS
+        DDGS = _load_ddgs()
 
         # Auto-detect region based on query language
         if region is None:
@@ -121,15 +215,15 @@ def _ddg_search(
             }
             region = region_map.get(lang, "wt-wt")
 
-        results = []
         ddgs = DDGS()
-
-        for r in ddgs.text(query, region=region, max_results=max_results):
-            results.append({
+        results = [
+            {
                 "title": r.get("title", ""),
-                "url": r.get("href", r.get("link", "")),
-                "snippet": r.get("body", r.get("snippet", "")),
-            })
+                "url": r.get("href") or r.get("link", ""),
+                "snippet": r.get("body") or r.get("snippet", ""),
+            }
+            for r in ddgs.text(query, region=region, max_results=max_results)
+        ]
 
         return {
             "success": True,
@@ -152,27 +246,24 @@ def _ddg_news(
 ) -> Dict[str, Any]:
     """Search news using DuckDuckGo."""
     try:
-        try:
-            from ddgs import DDGS
-        except ImportError:
-            from duckduckgo_search import DDGS
+        DDGS = _load_ddgs()
 
         if region is None:
             lang = _detect_language(query)
             region_map = {"zh": "cn-zh", "ja": "jp-jp", "ko": "kr-kr", "en": "wt-wt"}
             region = region_map.get(lang, "wt-wt")
 
-        results = []
         ddgs = DDGS()
-
-        for r in ddgs.news(query, region=region, max_results=max_results):
-            results.append({
+        results = [
+            {
                 "title": r.get("title", ""),
-                "url": r.get("url", r.get("link", "")),
-                "snippet": r.get("body", r.get("excerpt", "")),
+                "url": r.get("url") or r.get("link", ""),
+                "snippet": r.get("body") or r.get("excerpt", ""),
                 "date": r.get("date", ""),
                 "source": r.get("source", ""),
-            })
+            }
+            for r in ddgs.news(query, region=region, max_results=max_results)
+        ]
 
         return {
             "success": True,
@@ -211,11 +302,14 @@ def search(
     # Try Tavily first if AUTO or explicitly requested
     if provider in (SearchProvider.AUTO, SearchProvider.TAVILY):
         try:
-            return _tavily_search(
-                query=query,
-                max_results=max_results,
-                search_depth=search_depth,
-                include_answer=include_answer,
+            return _cached_call(
+                ("tavily", query, max_results, search_depth, include_answer),
+                lambda: _tavily_search(
+                    query=query,
+                    max_results=max_results,
+                    search_depth=search_depth,
+                    include_answer=include_answer,
+                ),
             )
         except ValueError as e:
             # API key not set
@@ -243,7 +337,10 @@ def search(
     # Try DuckDuckGo as fallback
     if provider in (SearchProvider.AUTO, SearchProvider.DUCKDUCKGO):
         try:
-            return _ddg_search(query=query, max_results=max_results)
+            return _cached_call(
+                ("duckduckgo", query, max_results),
+                lambda: _ddg_search(query=query, max_results=max_results),
+            )
         except ImportError:
             errors.append("DuckDuckGo: duckduckgo-search not installed")
         except Exception as e:
@@ -259,6 +356,51 @@ def search(
     }
 
 
+def search_batch(
+    queries: List[str],
+    max_results: int = 5,
+    max_workers: int = 8,
+    provider: SearchProvider = SearchProvider.AUTO,
+) -> List[Dict[str, Any]]:
+    """
+    Run several independent searches concurrently.
+
+    Searches are network-bound, so a small thread pool overlaps their
+    latency. Duplicate queries are searched once; each position still gets
+    its own copy of the result.
+
+    Args:
+        queries: Search query strings
+        max_results: Maximum number of results per query
+        max_workers: Upper bound on concurrent searches
+        provider: Search provider to use (default: AUTO)
+
+    Returns:
+        One result dictionary per query, in input order
+    """
+    unique_queries = list(dict.fromkeys(queries))
+    if not unique_queries:
+        return []
+
+    workers = max(1, min(max_workers, len(unique_queries)))
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = dict(zip(
+            unique_queries,
+            executor.map(
+                lambda q: search(q, max_results=max_results, provider=provider),
+                unique_queries,
+            ),
+        ))
+
+    # Copy the repeats so no two positions share (mutable) result objects
+    seen = set()
+    batch = []
+    for q in queries:
+        batch.append(copy.deepcopy(results[q]) if q in seen else results[q])
+        seen.add(q)
+    return batch
+
+
 def search_web(
     query: str,
     max_results: int = 5,
@@ -291,20 +433,23 @@ def search_web(
     if result.get("success") and result.get("results"):
         results = result["results"]
 
+        parts: List[str] = []
+
         # If Tavily provided an answer, use it
         if result.get("answer"):
-            summary = f"AI 摘要: {result['answer']}\n\n"
-        else:
-            summary = ""
+            parts.extend(("AI 摘要: ", result["answer"], "\n\n"))
 
         # Add result summaries
-        summary_parts = []
-        for i, r in enumerate(results[:3], 1):
-            snippet = r.get("snippet", "")[:200]
-            summary_parts.append(f"{i}. {r['title']}: {snippet}...")
-
-        summary += f"找到 {len(results)} 条结果:\n" + "\n".join(summary_parts)
-        result["summary"] = summary
+        parts.extend((SUMMARY_PREFIX, str(len(results)), SUMMARY_SUFFIX))
+        parts.append("\n".join(
+            "".join((
+                str(i), ". ", r["title"], ": ",
+                r.get("snippet", "")[:SNIPPET_CHARS], "...",
+            ))
+            for i, r in enumerate(results[:SUMMARY_RESULTS], 1)
+        ))
+
+        result["summary"] = "".join(parts)
     else:
         result["summary"] = f"搜索 '{query}' 失败: {result.get('error', '未知错误')}"
 
@@ -328,7 +473,10 @@ def search_news(
         Dictionary with news results
     """
     try:
-        result = _ddg_news(query=query, max_results=max_results)
+        result = _cached_call(
+            ("duckduckgo-news", query, max_results),
+            lambda: _ddg_news(query=query, max_results=max_results),
+        )
 
         # Generate summary
         if result.get("success") and result.get("results"):
@@ -356,4 +504,11 @@ def search_news(
 
 
 # For backwards compatibility
-__all__ = ["search", "search_web", "search_news", "SearchProvider"]
+__all__ = [
+    "search",
+    "search_batch",
+    "search_web",
+    "search_news",
+    "clear_search_cache",
+    "SearchProvider",
+]
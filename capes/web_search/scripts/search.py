@@ -4,11 +4,26 @@ Web Search Script - Performs real web searches using DuckDuckGo.
 
 import json
 import sys
+from functools import cache, lru_cache
 from typing import Dict, Any
 
 
+@cache
+def _load_ddgs():
+    """Resolve the DDGS class once, preferring ddgs over duckduckgo_search."""
+    try:
+        from ddgs import DDGS
+    except ImportError:
+        from duckduckgo_search import DDGS
+    return DDGS
+
+
+@lru_cache(maxsize=1024)
 def _detect_region(query: str) -> str:
     """Detect search region based on query language."""
+    # Pure-ASCII queries (the common case) cannot contain CJK characters
+    if query.isascii():
+        return "wt-wt"
     # Check if query contains Chinese characters
     for char in query:
         if '\u4e00' <= char <= '\u9fff':
@@ -30,10 +45,7 @@ def search_web(query: str, max_results: int = 5, region: str = None) -> Dict[str
     """
     try:
         # Try new ddgs package first
-        try:
-            from ddgs import DDGS
-        except ImportError:
-            from duckduckgo_search import DDGS
+        DDGS = _load_ddgs()
 
         results = []
 
@@ -45,8 +57,8 @@ def search_web(query: str, max_results: int = 5, region: str = None) -> Dict[str
         for r in ddgs.text(query, region=search_region, max_results=max_results):
             results.append({
                 "title": r.get("title", ""),
-                "url": r.get("href", r.get("link", "")),
-                "snippet": r.get("body", r.get("snippet", "")),
+                "url": r.get("href") or r.get("link", ""),
+                "snippet": r.get("body") or r.get("snippet", ""),
             })
 
         # Generate summary
@@ -91,10 +103,7 @@ def search_news(query: str, max_results: int = 5, region: str = None) -> Dict[st
     Search for recent news articles.
     """
     try:
-        try:
-            from ddgs import DDGS
-        except ImportError:
-            from duckduckgo_search import DDGS
+        DDGS = _load_ddgs()
 
         results = []
 
@@ -105,8 +114,8 @@ def search_news(query: str, max_results: int = 5, region: str = None) -> Dict[st
         for r in ddgs.news(query, region=search_region, max_results=max_results):
             results.append({
                 "title": r.get("title", ""),
-                "url": r.get("url", r.get("link", "")),
-                "snippet": r.get("body", r.get("excerpt", "")),
+                "url": r.get("url") or r.get("link", ""),
+                "snippet": r.get("body") or r.get("excerpt", ""),
                 "date": r.get("date", ""),
                 "source": r.get("source", ""),
             })
@@ -12,10 +12,17 @@ Usage:
 """
 
 import asyncio
-import io
+import copy
+import hashlib
 import json
 import sys
+import tempfile
+import uuid
+from email.parser import BytesParser
+from email.policy import HTTP
+from functools import lru_cache
 from pathlib import Path
+from typing import Any, BinaryIO, List, Optional, Tuple
 
 # Check dependencies
 from pptx import Presentation
@@ -35,9 +42,90 @@ except ImportError:
 
 API_BASE = "http://127.0.0.1:8765"
 
+# Decks larger than this spill from memory to a temporary file on disk
+SPOOL_MAX_SIZE = 8 * 1024 * 1024
+HASH_CHUNK_SIZE = 64 * 1024
+
+
+def sha256_stream(fileobj: BinaryIO) -> str:
+    """Hash a file object in fixed-size chunks without loading it whole."""
+    digest = hashlib.sha256()
+    for chunk in iter(lambda: fileobj.read(HASH_CHUNK_SIZE), b""):
+        digest.update(chunk)
+    fileobj.seek(0)
+    return digest.hexdigest()
+
+
+def build_batch_request(paths: List[str]) -> Tuple[bytes, str]:
+    """Pack GET requests into a multipart/mixed body for POST /api/batch."""
+    boundary = f"batch_{uuid.uuid4().hex}"
+    parts = [
+        f"--{boundary}\r\n"
+        "Content-Type: application/http\r\n"
+        f"Content-ID: {i}\r\n\r\n"
+        f"GET {path} HTTP/1.1\r\n\r\n"
+        for i, path in enumerate(paths, 1)
+    ]
+    parts.append(f"--{boundary}--\r\n")
+    return "".join(parts).encode(), f"multipart/mixed; boundary={boundary}"
+
+
+def parse_batch_response(response: "httpx.Response") -> List[Any]:
+    """Decode the JSON bodies of a multipart/mixed batch response, in order."""
+    envelope = f"Content-Type: {response.headers['content-type']}\r\n\r\n"
+    message = BytesParser(policy=HTTP).parsebytes(envelope.encode() + response.content)
+    results = []
+    for part in message.iter_parts():
+        raw = part.get_payload(decode=True)
+        head, _, body = raw.partition(b"\r\n\r\n")
+        status = int(head.split(b" ", 2)[1])
+        if status >= 400:
+            raise RuntimeError(f"Batch sub-request failed ({status}): {body!r}")
+        results.append(json.loads(body))
+    return results
+
+
+@lru_cache(maxsize=None)
+def _textbox_template(width: int, height: int, size_pt: int,
+                      bold: bool = False, font_name: Optional[str] = None):
+    """
+    Build a styled single-paragraph textbox element once per style.
+
+    Table rows are stamped out by deep-copying this element instead of going
+    through python-pptx's full textbox construction for every cell.
+    """
+    scratch = Presentation()
+    slide = scratch.slides.add_slide(scratch.slide_layouts[6])
+    box = slide.shapes.add_textbox(0, 0, width, height)
+    p = box.text_frame.paragraphs[0]
+    p.text = " "
+    p.font.size = Pt(size_pt)
+    if bold:
+        p.font.bold = True
+    if font_name:
+        p.font.name = font_name
+    return box._element
+
+
+def _add_text_cell(slide, template, left: int, top: int, text: str) -> None:
+    """Clone a textbox template onto a slide at (left, top) with new text."""
+    sp = copy.deepcopy(template)
+    shape_id = slide.shapes._next_shape_id
+    sp.nvSpPr.cNvPr.id = shape_id
+    sp.nvSpPr.cNvPr.name = f"TextBox {shape_id - 1}"
+    off = sp.spPr.xfrm.off
+    off.x, off.y = left, top
+    sp.xpath(".//a:t")[0].text = text
+    slide.shapes._spTree.insert_element_before(sp, "p:extLst")
 
-def create_demo_ppt() -> bytes:
-    """Create a demo presentation about Cape System."""
+
+def create_demo_ppt() -> BinaryIO:
+    """
+    Create a demo presentation about Cape System.
+
+    Returns a spooled temporary file positioned at offset 0, so callers can
+    stream it without an extra full-buffer copy.
+    """
     prs = Presentation()
     prs.slide_width = Inches(13.333)
     prs.slide_height = Inches(7.5)
@@ -118,23 +206,13 @@ def create_demo_ppt() -> bytes:
         ("⚡ 高性能", "异步执行，并行处理"),
     ]
 
+    title_cell = _textbox_template(Inches(5), Inches(0.6), 24, bold=True)
+    desc_cell = _textbox_template(Inches(6), Inches(0.6), 20)
+
     y_pos = 1.8
     for emoji_title, desc in features:
-        # Feature title
-        box = slide.shapes.add_textbox(Inches(1), Inches(y_pos), Inches(5), Inches(0.6))
-        tf = box.text_frame
-        p = tf.paragraphs[0]
-        p.text = emoji_title
-        p.font.size = Pt(24)
-        p.font.bold = True
-
-        # Feature description
-        box = slide.shapes.add_textbox(Inches(6), Inches(y_pos), Inches(6), Inches(0.6))
-        tf = box.text_frame
-        p = tf.paragraphs[0]
-        p.text = desc
-        p.font.size = Pt(20)
-
+        _add_text_cell(slide, title_cell, Inches(1), Inches(y_pos), emoji_title)
+        _add_text_cell(slide, desc_cell, Inches(6), Inches(y_pos), desc)
         y_pos += 1.0
 
     # Slide 4: Implementation Progress
@@ -154,37 +232,17 @@ def create_demo_ppt() -> bytes:
         ("Week 4", "文件 API", "✅ 完成", "上传/下载/处理端点"),
     ]
 
+    week_cell = _textbox_template(Inches(1.5), Inches(0.6), 20, bold=True)
+    task_cell = _textbox_template(Inches(2.5), Inches(0.6), 20)
+    status_cell = _textbox_template(Inches(1.5), Inches(0.6), 20)
+    detail_cell = _textbox_template(Inches(5.5), Inches(0.6), 16)
+
     y_pos = 1.8
     for week, task, status, detail in weeks:
-        # Week
-        box = slide.shapes.add_textbox(Inches(0.8), Inches(y_pos), Inches(1.5), Inches(0.6))
-        tf = box.text_frame
-        p = tf.paragraphs[0]
-        p.text = week
-        p.font.size = Pt(20)
-        p.font.bold = True
-
-        # Task
-        box = slide.shapes.add_textbox(Inches(2.5), Inches(y_pos), Inches(2.5), Inches(0.6))
-        tf = box.text_frame
-        p = tf.paragraphs[0]
-        p.text = task
-        p.font.size = Pt(20)
-
-        # Status
-        box = slide.shapes.add_textbox(Inches(5.2), Inches(y_pos), Inches(1.5), Inches(0.6))
-        tf = box.text_frame
-        p = tf.paragraphs[0]
-        p.text = status
-        p.font.size = Pt(20)
-
-        # Detail
-        box = slide.shapes.add_textbox(Inches(7), Inches(y_pos), Inches(5.5), Inches(0.6))
-        tf = box.text_frame
-        p = tf.paragraphs[0]
-        p.text = detail
-        p.font.size = Pt(16)
-
+        _add_text_cell(slide, week_cell, Inches(0.8), Inches(y_pos), week)
+        _add_text_cell(slide, task_cell, Inches(2.5), Inches(y_pos), task)
+        _add_text_cell(slide, status_cell, Inches(5.2), Inches(y_pos), status)
+        _add_text_cell(slide, detail_cell, Inches(7), Inches(y_pos), detail)
         y_pos += 1.2
 
     # Slide 5: API Endpoints
@@ -205,37 +263,22 @@ def create_demo_ppt() -> bytes:
         ("GET", "/api/files/stats", "存储统计"),
     ]
 
+    method_cell = _textbox_template(Inches(1.2), Inches(0.5), 18, bold=True)
+    path_cell = _textbox_template(Inches(5), Inches(0.5), 18, font_name="Courier New")
+    desc_cell = _textbox_template(Inches(4), Inches(0.5), 18)
+
     y_pos = 1.8
     for method, path, desc in endpoints:
-        # Method
-        box = slide.shapes.add_textbox(Inches(1), Inches(y_pos), Inches(1.2), Inches(0.5))
-        tf = box.text_frame
-        p = tf.paragraphs[0]
-        p.text = method
-        p.font.size = Pt(18)
-        p.font.bold = True
-
-        # Path
-        box = slide.shapes.add_textbox(Inches(2.5), Inches(y_pos), Inches(5), Inches(0.5))
-        tf = box.text_frame
-        p = tf.paragraphs[0]
-        p.text = path
-        p.font.size = Pt(18)
-        p.font.name = "Courier New"
-
-        # Description
-        box = slide.shapes.add_textbox(Inches(8), Inches(y_pos), Inches(4), Inches(0.5))
-        tf = box.text_frame
-        p = tf.paragraphs[0]
-        p.text = desc
-        p.font.size = Pt(18)
-
+        _add_text_cell(slide, method_cell, Inches(1), Inches(y_pos), method)
+        _add_text_cell(slide, path_cell, Inches(2.5), Inches(y_pos), path)
+        _add_text_cell(slide, desc_cell, Inches(8), Inches(y_pos), desc)
         y_pos += 0.9
 
-    # Save to bytes
-    buffer = io.BytesIO()
+    # Save to a spooled file (in memory until SPOOL_MAX_SIZE)
+    buffer = tempfile.SpooledTemporaryFile(max_size=SPOOL_MAX_SIZE)
     prs.save(buffer)
-    return buffer.getvalue()
+    buffer.seek(0)
+    return buffer
 
 
 async def test_api_flow():
@@ -244,7 +287,14 @@ async def test_api_flow():
     print("Cape API 完整流程测试")
     print("=" * 60)
 
-    async with httpx.AsyncClient(base_url=API_BASE, timeout=30) as client:
+    limits = httpx.Limits(
+        max_keepalive_connections=20,
+        max_connections=50,
+        keepalive_expiry=30.0,
+    )
+    async with httpx.AsyncClient(
+        base_url=API_BASE, timeout=30, limits=limits
+    ) as client:
         # Step 1: Check API health
         print("\n1️⃣  检查 API 状态...")
         response = await client.get("/")
@@ -253,24 +303,41 @@ async def test_api_flow():
 
         # Step 2: Create PPT
         print("\n2️⃣  生成演示 PPT...")
-        ppt_content = create_demo_ppt()
-        print(f"   ✓ PPT 已生成: {len(ppt_content)} bytes, 5 张幻灯片")
+        ppt_file = create_demo_ppt()
+        ppt_size = ppt_file.seek(0, 2)
+        ppt_file.seek(0)
+        ppt_sha256 = sha256_stream(ppt_file)
+        print(f"   ✓ PPT 已生成: {ppt_size} bytes, 5 张幻灯片")
 
         # Step 3: Upload PPT
         print("\n3️⃣  上传 PPT 到 API...")
-        files = {"files": ("cape_demo.pptx", ppt_content, "application/vnd.openxmlformats-officedocument.presentationml.presentation")}
+        pptx_type = (
+            "application/vnd.openxmlformats-officedocument"
+            ".presentationml.presentation"
+        )
+        files = {"files": ("cape_demo.pptx", ppt_file, pptx_type)}
         data = {"session_id": "demo-session"}
 
         response = await client.post("/api/files/upload", files=files, data=data)
+        ppt_file.close()
         upload_data = response.json()
         file_id = upload_data["files"][0]["file_id"]
         print(f"   ✓ 上传成功: file_id={file_id}")
         print(f"   ✓ Session: {upload_data['session_id']}")
 
+        # Read-only queries are independent, so fold them into one batch
+        batch_body, batch_type = build_batch_request([
+            f"/api/files/{file_id}/metadata",
+            "/api/files/session/demo-session",
+            "/api/files/stats",
+        ])
+        response = await client.post(
+            "/api/batch", content=batch_body, headers={"Content-Type": batch_type}
+        )
+        meta, session_data, stats = parse_batch_response(response)
+
         # Step 4: Get metadata
         print("\n4️⃣  获取文件元数据...")
-        response = await client.get(f"/api/files/{file_id}/metadata")
-        meta = response.json()
         print(f"   ✓ 文件名: {meta['original_name']}")
         print(f"   ✓ 大小: {meta['size_bytes']} bytes")
         print(f"   ✓ 状态: {meta['status']}")
@@ -278,37 +345,38 @@ async def test_api_flow():
 
         # Step 5: List session files
         print("\n5️⃣  列出会话文件...")
-        response = await client.get("/api/files/session/demo-session")
-        session_data = response.json()
         print(f"   ✓ 会话文件数: {session_data['total_files']}")
         for f in session_data["files"]:
             print(f"      - {f['original_name']} ({f['status']})")
 
-        # Step 6: Download file
+        # Step 6: Download file straight to its local destination
         print("\n6️⃣  下载 PPT 文件...")
-        response = await client.get(f"/api/files/{file_id}")
-        downloaded_content = response.content
-        print(f"   ✓ 下载成功: {len(downloaded_content)} bytes")
+        output_path = Path("/Users/g/Desktop/探索/skillslike/output/cape_demo.pptx")
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        digest = hashlib.sha256()
+        downloaded_size = 0
+        with output_path.open("wb") as out:
+            async with client.stream("GET", f"/api/files/{file_id}") as response:
+                async for chunk in response.aiter_bytes(HASH_CHUNK_SIZE):
+                    digest.update(chunk)
+                    out.write(chunk)
+                    downloaded_size += len(chunk)
+        print(f"   ✓ 下载成功: {downloaded_size} bytes")
 
         # Verify content matches
-        if downloaded_content == ppt_content:
+        if digest.hexdigest() == ppt_sha256:
             print("   ✓ 内容验证通过: 上传下载一致")
         else:
             print("   ✗ 内容验证失败")
 
         # Step 7: Get storage stats
         print("\n7️⃣  存储统计...")
-        response = await client.get("/api/files/stats")
-        stats = response.json()
         print(f"   ✓ 总文件数: {stats['total_files']}")
         print(f"   ✓ 总大小: {stats['total_size_mb']} MB")
         print(f"   ✓ 会话数: {stats['total_sessions']}")
 
-        # Step 8: Save PPT locally
+        # Step 8: PPT was written locally during download
         print("\n8️⃣  保存 PPT 到本地...")
-        output_path = Path("/Users/g/Desktop/探索/skillslike/output/cape_demo.pptx")
-        output_path.parent.mkdir(parents=True, exist_ok=True)
-        output_path.write_bytes(downloaded_content)
         print(f"   ✓ 已保存: {output_path}")
 
         # Step 9: Cleanup
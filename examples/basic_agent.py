@@ -8,6 +8,7 @@ This example shows how to:
 3. Execute skills with user input
 """
 
+import functools
 import os
 from pathlib import Path
 
@@ -17,23 +18,28 @@ if not os.getenv("OPENAI_API_KEY"):
     print("export OPENAI_API_KEY='your-key-here'")
     exit(1)
 
+# Skills directory (relative to this file)
+SKILLS_DIR = Path(__file__).parent.parent / "skills"
 
-def main():
-    """Run basic agent example."""
-    from langchain_skills import create_skills_agent
 
-    # Get skills directory (relative to this file)
-    skills_dir = Path(__file__).parent.parent / "skills"
+@functools.cache
+def _get_agent():
+    """Create the skills agent once per process."""
+    from langchain_skills import create_skills_agent
 
-    print(f"Loading skills from: {skills_dir}")
+    print(f"Loading skills from: {SKILLS_DIR}")
     print("-" * 50)
 
-    # Create the agent
-    agent = create_skills_agent(
-        skills_dir=skills_dir,
+    return create_skills_agent(
+        skills_dir=SKILLS_DIR,
         verbose=True,  # Show agent reasoning
     )
 
+
+def main():
+    """Run basic agent example."""
+    agent = _get_agent()
+
     # Example queries
     queries = [
         "Review this Python code: def add(a,b): return a+b",
@@ -41,6 +47,8 @@ def main():
         "How do I extract text from a PDF file?",
     ]
 
+    # One query at a time: the verbose agent streams its reasoning to
+    # stdout and is not meant to be shared across threads
     for query in queries:
         print(f"\n{'='*50}")
         print(f"Query: {query}")
@@ -50,15 +58,32 @@ def main():
         print(f"\nResponse:\n{result['output']}")
 
 
+def demo_search():
+    """Demo fanning independent web searches out concurrently."""
+    from cape.tools import search_batch
+
+    queries = [
+        "Python error handling best practices",
+        "extract text from PDF in Python",
+        "Python code review checklist",
+    ]
+
+    for query, result in zip(queries, search_batch(queries, max_results=3)):
+        print(f"\nQuery: {query}")
+        if not result["success"]:
+            print(f"  ✗ {result.get('error')}")
+            continue
+        for r in result["results"]:
+            print(f"  → {r['title']} ({r['url']})")
+
+
 def demo_orchestrator():
     """Demo using the orchestrator directly."""
     from langchain_skills import SkillOrchestrator
 
-    skills_dir = Path(__file__).parent.parent / "skills"
-
     # Create orchestrator
     orchestrator = SkillOrchestrator(
-        skills_dir=skills_dir,
+        skills_dir=SKILLS_DIR,
         use_embeddings=True,
     )
 
@@ -83,10 +108,8 @@ def demo_matcher():
     """Demo the intent matcher."""
     from langchain_skills import SkillLoader, IntentMatcher
 
-    skills_dir = Path(__file__).parent.parent / "skills"
-
     # Load skills
-    loader = SkillLoader(skills_dir)
+    loader = SkillLoader(SKILLS_DIR)
     skills = loader.load_all()
 
     print(f"Loaded {len(skills)} skills")
@@ -118,8 +141,10 @@ if __name__ == "__main__":
             demo_orchestrator()
         elif sys.argv[1] == "matcher":
             demo_matcher()
+        elif sys.argv[1] == "search":
+            demo_search()
         else:
             print(f"Unknown command: {sys.argv[1]}")
-            print("Usage: python basic_agent.py [orchestrator|matcher]")
+            print("Usage: python basic_agent.py [orchestrator|matcher|search]")
     else:
         main()
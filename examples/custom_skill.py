@@ -8,6 +8,7 @@ This example shows how to:
 3. Use it with the agent
 """
 
+import json
 from pathlib import Path
 import tempfile
 
@@ -85,6 +86,10 @@ When formatting JSON, use 2-space indentation:
     skill_file = skill_dir / "SKILL.md"
     skill_file.write_text(skill_content)
 
+    # Index the directory so loaders can skip walking it
+    index_file = skill_dir.parent / "_index.json"
+    index_file.write_text(json.dumps({"skills": [skill_dir.name]}))
+
     print(f"Created custom skill at: {skill_dir}")
     return skill_dir.parent
 
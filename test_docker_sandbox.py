@@ -18,11 +18,11 @@ Usage:
 import asyncio
 import sys
 import time
-from pathlib import Path
+from contextlib import asynccontextmanager
 
-# Add project to path
-sys.path.insert(0, str(Path(__file__).parent))
+from tests._util import add_project_root, run, run_concurrently
 
+add_project_root()
 
 async def check_docker():
     """Check if Docker is available."""
@@ -43,7 +43,7 @@ async def check_docker():
         return False
 
 
-async def build_image():
+async def build_image(docker_client=None):
     """Build the base Docker image."""
     print("\n=== Building Base Image ===")
 
@@ -51,7 +51,7 @@ async def build_image():
 
     print("  Building image (this may take a few minutes)...")
     start = time.time()
-    success = await build_base_image(force=False)
+    success = await build_base_image(force=False, client=docker_client)
     elapsed = time.time() - start
 
     if success:
@@ -62,134 +62,138 @@ async def build_image():
     return success
 
 
-async def test_basic_execution():
-    """Test basic code execution in Docker."""
-    print("\n=== Testing Basic Execution ===")
+@asynccontextmanager
+async def shared_sandbox(docker_client=None):
+    """
+    Start one DockerSandbox for the tests that don't need their own.
 
-    from cape.runtime.sandbox import (
-        DockerSandbox,
-        SandboxConfig,
-        SandboxType,
-        ExecutionRequest,
-    )
+    Network is enabled for the package tests. Each test resets /workspace
+    instead of paying for a new container.
+    """
+    from cape.runtime.sandbox import DockerSandbox, SandboxConfig, SandboxType
 
     config = SandboxConfig(
         type=SandboxType.DOCKER,
         timeout_seconds=30,
         max_memory_mb=256,
         max_cpu_percent=50,
+        network_enabled=True,  # Need network for pip
+        docker_client=docker_client,
     )
     sandbox = DockerSandbox(config)
     await sandbox.setup()
 
     try:
-        # Test 1: Simple calculation
-        print("  Test 1: Simple calculation...", end=" ")
-        response = await sandbox.execute(ExecutionRequest(
-            code="result = 2 + 2"
-        ))
-        assert response.success, f"Failed: {response.error}"
-        assert response.output == 4, f"Expected 4, got {response.output}"
-        print("✓")
+        yield sandbox
+    finally:
+        await sandbox.cleanup()
 
-        # Test 2: With arguments
-        print("  Test 2: With arguments...", end=" ")
-        response = await sandbox.execute(ExecutionRequest(
-            code="result = args['x'] * args['y']",
-            args={"x": 7, "y": 8},
-        ))
-        assert response.success, f"Failed: {response.error}"
-        assert response.output == 56, f"Expected 56, got {response.output}"
-        print("✓")
 
-        # Test 3: Using imports
-        print("  Test 3: Using imports...", end=" ")
-        response = await sandbox.execute(ExecutionRequest(
-            code="""
+async def test_basic_execution(sandbox):
+    """Test basic code execution in Docker."""
+    print("\n=== Testing Basic Execution ===")
+
+    from cape.runtime.sandbox import ExecutionRequest
+
+    await sandbox.reset_workdir()
+
+    # All five requests run in one container exec
+    calculation, with_args, imports, stdout_capture, failure = (
+        await sandbox.execute_batch([
+            ExecutionRequest(code="result = 2 + 2"),
+            ExecutionRequest(
+                code="result = args['x'] * args['y']",
+                args={"x": 7, "y": 8},
+            ),
+            ExecutionRequest(code="""
 import json
 data = {"name": "test", "value": 42}
 result = json.dumps(data)
-"""
-        ))
-        assert response.success, f"Failed: {response.error}"
-        assert "test" in response.output
-        print("✓")
-
-        # Test 4: Stdout capture
-        print("  Test 4: Stdout capture...", end=" ")
-        response = await sandbox.execute(ExecutionRequest(
-            code="""
+"""),
+            ExecutionRequest(code="""
 print("Hello from Docker!")
 result = "done"
-"""
-        ))
-        assert response.success, f"Failed: {response.error}"
-        assert "Hello from Docker!" in response.stdout
-        print("✓")
+"""),
+            ExecutionRequest(code="result = 1 / 0"),
+        ])
+    )
 
-        # Test 5: Error handling
-        print("  Test 5: Error handling...", end=" ")
-        response = await sandbox.execute(ExecutionRequest(
-            code="result = 1 / 0"
-        ))
-        assert not response.success, "Should have failed"
-        assert "ZeroDivisionError" in response.stderr or "division" in str(response.error).lower()
-        print("✓")
+    # Test 1: Simple calculation
+    print("  Test 1: Simple calculation...", end=" ")
+    assert calculation.success, f"Failed: {calculation.error}"
+    assert calculation.output == 4, f"Expected 4, got {calculation.output}"
+    print("✓")
+
+    # Test 2: With arguments
+    print("  Test 2: With arguments...", end=" ")
+    assert with_args.success, f"Failed: {with_args.error}"
+    assert with_args.output == 56, f"Expected 56, got {with_args.output}"
+    print("✓")
+
+    # Test 3: Using imports
+    print("  Test 3: Using imports...", end=" ")
+    assert imports.success, f"Failed: {imports.error}"
+    assert "test" in imports.output
+    print("✓")
+
+    # Test 4: Stdout capture
+    print("  Test 4: Stdout capture...", end=" ")
+    assert stdout_capture.success, f"Failed: {stdout_capture.error}"
+    assert "Hello from Docker!" in stdout_capture.stdout
+    print("✓")
+
+    # Test 5: Error handling
+    print("  Test 5: Error handling...", end=" ")
+    assert not failure.success, "Should have failed"
+    assert (
+        "ZeroDivisionError" in failure.stderr
+        or "division" in str(failure.error).lower()
+    )
+    print("✓")
 
-        print("  Basic Execution: All tests passed!")
-
-    finally:
-        await sandbox.cleanup()
+    print("  Basic Execution: All tests passed!")
 
 
-async def test_file_io():
+async def test_file_io(sandbox):
     """Test file input/output in Docker."""
     print("\n=== Testing File I/O ===")
 
-    from cape.runtime.sandbox import (
-        DockerSandbox,
-        SandboxConfig,
-        SandboxType,
-        ExecutionRequest,
-    )
+    from cape.runtime.sandbox import ExecutionRequest
 
-    config = SandboxConfig(type=SandboxType.DOCKER)
-    sandbox = DockerSandbox(config)
-    await sandbox.setup()
+    await sandbox.reset_workdir()
 
-    try:
-        # Test 1: File input
-        print("  Test 1: File input...", end=" ")
-        response = await sandbox.execute(ExecutionRequest(
-            code="""
+    # Test 1: File input
+    print("  Test 1: File input...", end=" ")
+    response = await sandbox.execute(ExecutionRequest(
+        code="""
 from pathlib import Path
 content = Path("input.txt").read_text()
 result = len(content)
 """,
-            files={"input.txt": b"Hello World!"},
-        ))
-        assert response.success, f"Failed: {response.error}"
-        assert response.output == 12, f"Expected 12, got {response.output}"
-        print("✓")
-
-        # Test 2: File output
-        print("  Test 2: File output...", end=" ")
-        response = await sandbox.execute(ExecutionRequest(
-            code="""
+        files={"input.txt": b"Hello World!"},
+    ))
+    assert response.success, f"Failed: {response.error}"
+    assert response.output == 12, f"Expected 12, got {response.output}"
+    print("✓")
+
+    # Test 2: File output
+    print("  Test 2: File output...", end=" ")
+    response = await sandbox.execute(ExecutionRequest(
+        code="""
 from pathlib import Path
 Path("output.txt").write_text("Generated content")
 result = "done"
 """
-        ))
-        assert response.success, f"Failed: {response.error}"
-        assert "output.txt" in response.files_created
-        assert response.files_created["output.txt"] == b"Generated content"
-        print("✓")
-
-        # Test 3: Multiple files
-        print("  Test 3: Multiple files...", end=" ")
-        response = await sandbox.execute(ExecutionRequest(
-            code="""
+    ))
+    assert response.success, f"Failed: {response.error}"
+    assert "output.txt" in response.files_created
+    assert response.files_created["output.txt"] == b"Generated content"
+    print("✓")
+
+    # Test 3: Multiple files
+    print("  Test 3: Multiple files...", end=" ")
+    response = await sandbox.execute(ExecutionRequest(
+        code="""
 from pathlib import Path
 import json
 
@@ -204,20 +208,20 @@ combined = {"merged": [json.loads(data1), json.loads(data2)]}
 Path("result.json").write_text(json.dumps(combined))
 result = len(combined["merged"])
 """,
-            files={
-                "data1.json": b'{"a": 1}',
-                "data2.json": b'{"b": 2}',
-            },
-        ))
-        assert response.success, f"Failed: {response.error}"
-        assert response.output == 2
-        assert "result.json" in response.files_created
-        print("✓")
-
-        # Test 4: Subdirectory output
-        print("  Test 4: Subdirectory output...", end=" ")
-        response = await sandbox.execute(ExecutionRequest(
-            code="""
+        files={
+            "data1.json": b'{"a": 1}',
+            "data2.json": b'{"b": 2}',
+        },
+    ))
+    assert response.success, f"Failed: {response.error}"
+    assert response.output == 2
+    assert "result.json" in response.files_created
+    print("✓")
+
+    # Test 4: Subdirectory output
+    print("  Test 4: Subdirectory output...", end=" ")
+    response = await sandbox.execute(ExecutionRequest(
+        code="""
 from pathlib import Path
 out_dir = Path("output")
 out_dir.mkdir(exist_ok=True)
@@ -225,18 +229,25 @@ out_dir.mkdir(exist_ok=True)
 (out_dir / "file2.txt").write_text("content2")
 result = "done"
 """
-        ))
-        assert response.success, f"Failed: {response.error}"
-        assert "output/file1.txt" in response.files_created or "output\\file1.txt" in response.files_created
-        print("✓")
+    ))
+    assert response.success, f"Failed: {response.error}"
+    files = response.files_created
+    assert "output/file1.txt" in files or "output\\file1.txt" in files
+    print("✓")
 
-        print("  File I/O: All tests passed!")
+    print("  File I/O: All tests passed!")
 
-    finally:
-        await sandbox.cleanup()
 
+async def run_shared_sandbox_tests(docker_client=None):
+    """Run the tests that share one warm sandbox, in order."""
+    async with shared_sandbox(docker_client) as sandbox:
+        await test_basic_execution(sandbox)
+        await test_file_io(sandbox)
+        await test_package_installation(sandbox)
+        await test_resource_stats(sandbox)
 
-async def test_timeout():
+
+async def test_timeout(docker_client=None):
     """Test timeout handling."""
     print("\n=== Testing Timeout ===")
 
@@ -250,6 +261,7 @@ async def test_timeout():
     config = SandboxConfig(
         type=SandboxType.DOCKER,
         timeout_seconds=3,  # Short timeout
+        docker_client=docker_client,
     )
     sandbox = DockerSandbox(config)
     await sandbox.setup()
@@ -288,105 +300,80 @@ result = "Should not reach"
         await sandbox.cleanup()
 
 
-async def test_package_installation():
+async def test_package_installation(sandbox):
     """Test package installation in Docker."""
     print("\n=== Testing Package Installation ===")
 
-    from cape.runtime.sandbox import (
-        DockerSandbox,
-        SandboxConfig,
-        SandboxType,
-        ExecutionRequest,
-    )
+    from cape.runtime.sandbox import ExecutionRequest
 
-    config = SandboxConfig(
-        type=SandboxType.DOCKER,
-        network_enabled=True,  # Need network for pip
-    )
-    sandbox = DockerSandbox(config)
-    await sandbox.setup()
+    await sandbox.reset_workdir()
 
-    try:
-        # Test using pre-installed package (openpyxl)
-        print("  Test 1: Using pre-installed package...", end=" ")
-        response = await sandbox.execute(ExecutionRequest(
-            code="""
+    # Test using pre-installed package (openpyxl)
+    print("  Test 1: Using pre-installed package...", end=" ")
+    response = await sandbox.execute(ExecutionRequest(
+        code="""
 from openpyxl import Workbook
 wb = Workbook()
 ws = wb.active
 ws['A1'] = 'Hello'
 result = ws['A1'].value
 """
-        ))
-        assert response.success, f"Failed: {response.error}"
-        assert response.output == "Hello"
-        print("✓")
-
-        # Test pandas (also pre-installed)
-        print("  Test 2: Using pandas...", end=" ")
-        response = await sandbox.execute(ExecutionRequest(
-            code="""
+    ))
+    assert response.success, f"Failed: {response.error}"
+    assert response.output == "Hello"
+    print("✓")
+
+    # Test pandas (also pre-installed)
+    print("  Test 2: Using pandas...", end=" ")
+    response = await sandbox.execute(ExecutionRequest(
+        code="""
 import pandas as pd
 df = pd.DataFrame({'a': [1, 2, 3], 'b': [4, 5, 6]})
 result = df['a'].sum()
 """
-        ))
-        assert response.success, f"Failed: {response.error}"
-        assert response.output == 6
-        print("✓")
-
-        print("  Package Installation: All tests passed!")
+    ))
+    assert response.success, f"Failed: {response.error}"
+    assert response.output == 6
+    print("✓")
 
-    finally:
-        await sandbox.cleanup()
+    print("  Package Installation: All tests passed!")
 
 
-async def test_resource_stats():
+async def test_resource_stats(sandbox):
     """Test resource statistics."""
     print("\n=== Testing Resource Stats ===")
 
-    from cape.runtime.sandbox import (
-        DockerSandbox,
-        SandboxConfig,
-        SandboxType,
-        ExecutionRequest,
-    )
+    from cape.runtime.sandbox import ExecutionRequest
 
-    config = SandboxConfig(
-        type=SandboxType.DOCKER,
-        max_memory_mb=256,
-    )
-    sandbox = DockerSandbox(config)
-    await sandbox.setup()
+    await sandbox.reset_workdir()
 
-    try:
-        # Run some computation
-        await sandbox.execute(ExecutionRequest(
-            code="""
+    # Run some computation
+    await sandbox.execute(ExecutionRequest(
+        code="""
 import numpy as np
 arr = np.random.rand(1000, 1000)
 result = arr.sum()
 """
-        ))
-
-        # Get stats
-        print("  Test: Get container stats...", end=" ")
-        stats = await sandbox.get_container_stats()
-
-        if stats:
-            print(f"✓")
-            print(f"    CPU: {stats['cpu_percent']}%")
-            print(f"    Memory: {stats['memory_usage_mb']:.1f}MB / {stats['memory_limit_mb']:.1f}MB ({stats['memory_percent']:.1f}%)")
-        else:
-            print("✗ (stats not available)")
+    ))
+
+    # Get stats
+    print("  Test: Get container stats...", end=" ")
+    stats = await sandbox.get_container_stats()
+
+    if stats:
+        print(f"✓")
+        print(f"    CPU: {stats['cpu_percent']}%")
+        print(
+            f"    Memory: {stats['memory_usage_mb']:.1f}MB"
+            f" / {stats['memory_limit_mb']:.1f}MB ({stats['memory_percent']:.1f}%)"
+        )
+    else:
+        print("✗ (stats not available)")
 
-        print("  Resource Stats: Test completed!")
+    print("  Resource Stats: Test completed!")
 
-    finally:
-        await sandbox.cleanup()
 
-
-async def test_sandbox_manager():
+async def test_sandbox_manager(docker_client=None):
     """Test SandboxManager with Docker."""
     print("\n=== Testing SandboxManager with Docker ===")
 
@@ -397,7 +384,7 @@ async def test_sandbox_manager():
         ExecutionRequest,
     )
 
-    config = SandboxConfig(type=SandboxType.DOCKER)
+    config = SandboxConfig(type=SandboxType.DOCKER, docker_client=docker_client)
     manager = SandboxManager(config)
 
     try:
@@ -445,39 +432,48 @@ async def main():
         print("\n❌ Docker is not available. Please install and start Docker.")
         sys.exit(1)
 
-    # Step 2: Build image
-    if not await build_image():
-        print("\n❌ Failed to build Docker image.")
-        sys.exit(1)
-
-    if build_only:
-        print("\n✓ Image built successfully. Use without --build-image to run tests.")
-        return
+    # One Docker API connection pool for the image check and every sandbox
+    import docker
+    docker_client = docker.from_env()
 
     try:
-        # Run tests
-        await test_basic_execution()
-        await test_file_io()
-        await test_timeout()
-        await test_package_installation()
-        await test_resource_stats()
-        await test_sandbox_manager()
-
-        print("\n" + "=" * 60)
-        print("ALL DOCKER SANDBOX TESTS PASSED!")
-        print("=" * 60)
-
-    except AssertionError as e:
-        print(f"\n❌ TEST FAILED: {e}")
-        import traceback
-        traceback.print_exc()
-        sys.exit(1)
-    except Exception as e:
-        print(f"\n❌ ERROR: {e}")
-        import traceback
-        traceback.print_exc()
-        sys.exit(1)
+        # Step 2: Build image (skipped when the label matches the Dockerfile hash)
+        from cape.runtime.sandbox.docker_sandbox import (
+            get_image_build_hash,
+            image_build_hash,
+        )
+
+        build_hash = image_build_hash()
+        loop = asyncio.get_running_loop()
+        current = await loop.run_in_executor(
+            None, get_image_build_hash, docker_client
+        )
+        if current == build_hash:
+            print(f"\n  ✓ Image up-to-date (hash={build_hash})")
+        elif not await build_image(docker_client):
+            print("\n❌ Failed to build Docker image.")
+            sys.exit(1)
+
+        if build_only:
+            print(
+                "\n✓ Image built successfully. "
+                "Use without --build-image to run tests."
+            )
+            return
+
+        # Run tests; each group owns its containers, so they overlap
+        await run_concurrently(
+            run_shared_sandbox_tests(docker_client),
+            test_timeout(docker_client),
+            test_sandbox_manager(docker_client),
+        )
+    finally:
+        docker_client.close()
+
+    print("\n" + "=" * 60)
+    print("ALL DOCKER SANDBOX TESTS PASSED!")
+    print("=" * 60)
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main)
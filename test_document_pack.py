@@ -6,13 +6,11 @@ Validates that the document-pack (xlsx, docx, pptx, pdf) can be loaded
 and all capes have required fields.
 """
 
-import sys
-from pathlib import Path
+from tests._util import add_project_root, run
 
-# Add project to path
-sys.path.insert(0, str(Path(__file__).parent))
+BASE_DIR = add_project_root()
 
-from cape.registry.registry import CapeRegistry
+from cape.registry.registry import CapeRegistry  # noqa: E402
 
 
 def test_document_pack():
@@ -22,11 +20,10 @@ def test_document_pack():
     print("=" * 60)
 
     # Create registry
-    base_dir = Path(__file__).parent
     registry = CapeRegistry(
-        capes_dir=base_dir / "capes",
-        packs_dir=base_dir / "packs",
-        skills_dir=base_dir / "skills",
+        capes_dir=BASE_DIR / "capes",
+        packs_dir=BASE_DIR / "packs",
+        skills_dir=BASE_DIR / "skills",
         auto_load=True,
         use_embeddings=False,
     )
@@ -119,21 +116,5 @@ def test_document_pack():
     print("=" * 60)
 
 
-def main():
-    """Run document pack tests."""
-    try:
-        test_document_pack()
-    except AssertionError as e:
-        print(f"\n❌ TEST FAILED: {e}")
-        import traceback
-        traceback.print_exc()
-        sys.exit(1)
-    except Exception as e:
-        print(f"\n❌ ERROR: {e}")
-        import traceback
-        traceback.print_exc()
-        sys.exit(1)
-
-
 if __name__ == "__main__":
-    main()
+    run(test_document_pack)
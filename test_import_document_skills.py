@@ -11,24 +11,23 @@ Tests:
 import sys
 from pathlib import Path
 
-# Add project to path
-sys.path.insert(0, str(Path(__file__).parent))
+from tests._util import add_project_root, buffered_stdout, run
 
-from cape.importers import import_skill_enhanced, EnhancedSkillImporter
+add_project_root()
+
+from cape.importers import EnhancedSkillImporter  # noqa: E402
 
 # Path to Claude Skills repository
 SKILLS_REPO = Path("/Users/g/Desktop/探索/Claude skills/skills")
 DOCUMENT_SKILLS_PATH = SKILLS_REPO / "document-skills"
 
 
-def test_import_xlsx():
-    """Test importing xlsx skill."""
+def test_import_xlsx(capes):
+    """Test the imported xlsx skill."""
     print("\n=== Testing xlsx Skill Import ===")
 
-    skill_path = DOCUMENT_SKILLS_PATH / "xlsx"
-    print(f"  Path: {skill_path}")
-
-    cape = import_skill_enhanced(skill_path)
+    cape = capes.get("xlsx")
+    assert cape is not None, "xlsx skill was not imported"
 
     print(f"  ID: {cape.id}")
     print(f"  Name: {cape.name}")
@@ -51,14 +50,12 @@ def test_import_xlsx():
     return cape
 
 
-def test_import_docx():
-    """Test importing docx skill."""
+def test_import_docx(capes):
+    """Test the imported docx skill."""
     print("\n=== Testing docx Skill Import ===")
 
-    skill_path = DOCUMENT_SKILLS_PATH / "docx"
-    print(f"  Path: {skill_path}")
-
-    cape = import_skill_enhanced(skill_path)
+    cape = capes.get("docx")
+    assert cape is not None, "docx skill was not imported"
 
     print(f"  ID: {cape.id}")
     print(f"  Name: {cape.name}")
@@ -74,14 +71,12 @@ def test_import_docx():
     return cape
 
 
-def test_import_pptx():
-    """Test importing pptx skill."""
+def test_import_pptx(capes):
+    """Test the imported pptx skill."""
     print("\n=== Testing pptx Skill Import ===")
 
-    skill_path = DOCUMENT_SKILLS_PATH / "pptx"
-    print(f"  Path: {skill_path}")
-
-    cape = import_skill_enhanced(skill_path)
+    cape = capes.get("pptx")
+    assert cape is not None, "pptx skill was not imported"
 
     print(f"  ID: {cape.id}")
     print(f"  Name: {cape.name}")
@@ -97,14 +92,12 @@ def test_import_pptx():
     return cape
 
 
-def test_import_pdf():
-    """Test importing pdf skill."""
+def test_import_pdf(capes):
+    """Test the imported pdf skill."""
     print("\n=== Testing pdf Skill Import ===")
 
-    skill_path = DOCUMENT_SKILLS_PATH / "pdf"
-    print(f"  Path: {skill_path}")
-
-    cape = import_skill_enhanced(skill_path)
+    cape = capes.get("pdf")
+    assert cape is not None, "pdf skill was not imported"
 
     print(f"  ID: {cape.id}")
     print(f"  Name: {cape.name}")
@@ -121,7 +114,12 @@ def test_import_pdf():
 
 
 def test_import_all():
-    """Test importing all document skills at once."""
+    """
+    Import all document skills at once.
+
+    The per-skill tests below check the Capes returned here, so the skill
+    directories are parsed only once.
+    """
     print("\n=== Testing Batch Import ===")
 
     importer = EnhancedSkillImporter()
@@ -133,7 +131,7 @@ def test_import_all():
 
     assert len(capes) == 4, f"Expected 4 skills, got {len(capes)}"
     print("  ✓ Batch import successful!")
-    return capes
+    return {cape.id: cape for cape in capes}
 
 
 def print_cape_summary(cape):
@@ -170,15 +168,14 @@ def main():
         print(f"\n❌ ERROR: Path not found: {DOCUMENT_SKILLS_PATH}")
         sys.exit(1)
 
-    try:
-        # Test individual imports
-        xlsx_cape = test_import_xlsx()
-        docx_cape = test_import_docx()
-        pptx_cape = test_import_pptx()
-        pdf_cape = test_import_pdf()
-
-        # Test batch import
-        all_capes = test_import_all()
+    # Steps print a line each; write the report out at once
+    with buffered_stdout():
+        # Batch import once, then check each skill
+        capes = test_import_all()
+        xlsx_cape = test_import_xlsx(capes)
+        docx_cape = test_import_docx(capes)
+        pptx_cape = test_import_pptx(capes)
+        pdf_cape = test_import_pdf(capes)
 
         # Print detailed summary
         print("\n" + "=" * 60)
@@ -191,17 +188,6 @@ def main():
         print("ALL DOCUMENT SKILLS IMPORTED SUCCESSFULLY!")
         print("=" * 60)
 
-    except AssertionError as e:
-        print(f"\n❌ TEST FAILED: {e}")
-        import traceback
-        traceback.print_exc()
-        sys.exit(1)
-    except Exception as e:
-        print(f"\n❌ ERROR: {e}")
-        import traceback
-        traceback.print_exc()
-        sys.exit(1)
-
 
 if __name__ == "__main__":
-    main()
+    run(main)
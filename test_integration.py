@@ -8,30 +8,42 @@ Tests the complete workflow:
 """
 
 import asyncio
-import sys
-import tempfile
-import shutil
+from contextlib import asynccontextmanager
 from pathlib import Path
 
-# Add project to path
-sys.path.insert(0, str(Path(__file__).parent))
+from tests._util import add_project_root, run, run_concurrently, scratch_dir
 
-from cape.importers import import_skill_enhanced
-from cape.runtime.sandbox import (
+add_project_root()
+
+from cape.importers import import_skill_enhanced  # noqa: E402
+from cape.runtime.sandbox import (  # noqa: E402
     EnhancedCodeExecutor,
     SandboxType,
     ExecutionRequest,
 )
 
 
-def create_test_skill(base_dir: Path) -> Path:
-    """Create a test skill with scripts for integration testing."""
-    skill_dir = base_dir / "test-calculator"
-    skill_dir.mkdir(parents=True)
+@asynccontextmanager
+async def shared_sandbox():
+    """
+    Start one ProcessSandbox for all execution tests.
+
+    Every execute() already runs in its own subdirectory of the sandbox's
+    work_dir, so tests can share it without resetting anything.
+    """
+    from cape.runtime.sandbox import ProcessSandbox, SandboxConfig
+
+    config = SandboxConfig(type=SandboxType.PROCESS, timeout_seconds=30)
+    sandbox = ProcessSandbox(config)
+    await sandbox.setup()
+
+    try:
+        yield sandbox
+    finally:
+        await sandbox.cleanup()
 
-    # Create SKILL.md
-    skill_md = skill_dir / "SKILL.md"
-    skill_md.write_text("""---
+
+SKILL_MD = """---
 name: test-calculator
 description: A test calculator skill for integration testing
 version: 1.0.0
@@ -52,33 +64,32 @@ Provide numbers and an operation to calculate the result.
 
 - Supports add, subtract, multiply, divide operations
 - Returns result in JSON format
-""")
-
-    # Create scripts directory
-    scripts_dir = skill_dir / "scripts"
-    scripts_dir.mkdir()
+"""
 
-    # Create main.py
-    main_script = scripts_dir / "main.py"
-    main_script.write_text("""#!/usr/bin/env python3
+MAIN_SCRIPT = """#!/usr/bin/env python3
 \"\"\"Test calculator main script.\"\"\"
 
 import json
+import operator
 from pathlib import Path
 
+# Built once at import, not per call
+OPERATIONS = {
+    "add": operator.add,
+    "subtract": operator.sub,
+    "multiply": operator.mul,
+    "divide": lambda x, y: x / y if y != 0 else float('inf'),
+}
+
+
 def calculate(a: float, b: float, operation: str) -> float:
     \"\"\"Perform calculation.\"\"\"
-    operations = {
-        "add": lambda x, y: x + y,
-        "subtract": lambda x, y: x - y,
-        "multiply": lambda x, y: x * y,
-        "divide": lambda x, y: x / y if y != 0 else float('inf'),
-    }
-
-    if operation not in operations:
-        raise ValueError(f"Unknown operation: {operation}")
+    try:
+        op = OPERATIONS[operation]
+    except KeyError:
+        raise ValueError(f"Unknown operation: {operation}") from None
 
-    return operations[operation](a, b)
+    return op(a, b)
 
 
 def main():
@@ -105,11 +116,9 @@ def main():
 
 # Execute and set result
 result = main()
-""")
+"""
 
-    # Create helper module
-    helper_script = scripts_dir / "helpers.py"
-    helper_script.write_text("""#!/usr/bin/env python3
+HELPERS_SCRIPT = """#!/usr/bin/env python3
 \"\"\"Helper utilities for test calculator.\"\"\"
 
 def format_number(n: float, decimals: int = 2) -> str:
@@ -122,223 +131,184 @@ def validate_input(value, expected_type):
     if not isinstance(value, expected_type):
         raise TypeError(f"Expected {expected_type}, got {type(value)}")
     return value
-""")
-
-    return skill_dir
-
-
-async def test_skill_import():
-    """Test EnhancedSkillImporter."""
-    print("\n=== Testing EnhancedSkillImporter ===")
-
-    with tempfile.TemporaryDirectory() as tmpdir:
-        skill_dir = create_test_skill(Path(tmpdir))
-
-        # Import skill
-        print("  Test 1: Import skill with scripts...", end=" ")
-        cape = import_skill_enhanced(skill_dir)
-
-        assert cape is not None, "Import returned None"
-        assert cape.id == "test-calculator", f"Wrong ID: {cape.id}"
-        assert cape.description, "Missing description"
-        print("✓")
+"""
 
-        # Check execution config
-        print("  Test 2: Check execution configuration...", end=" ")
-        assert cape.execution is not None, "No execution config"
-        assert cape.execution.entrypoint == "scripts/main.py", f"Wrong entrypoint: {cape.execution.entrypoint}"
-        print("✓")
 
-        # Check code adapter
-        print("  Test 3: Check code adapter...", end=" ")
-        assert "code" in cape.model_adapters, "No code adapter"
-        code_adapter = cape.model_adapters["code"]
-        assert "scripts/main.py" in code_adapter["scripts"], "main.py not in scripts"
-        assert "scripts/helpers.py" in code_adapter["scripts"], "helpers.py not in scripts"
-        assert code_adapter["runtime"] == "python", "Wrong runtime"
-        print("✓")
+async def create_test_skill(base_dir: Path) -> Path:
+    """Create a test skill with scripts for integration testing."""
+    skill_dir = base_dir / "test-calculator"
+    scripts_dir = skill_dir / "scripts"
+    scripts_dir.mkdir(parents=True)
+
+    files = [
+        (skill_dir / "SKILL.md", SKILL_MD),
+        (scripts_dir / "main.py", MAIN_SCRIPT),
+        (scripts_dir / "helpers.py", HELPERS_SCRIPT),
+    ]
+    # Write off the event loop, in parallel
+    await asyncio.gather(*(
+        asyncio.to_thread(path.write_text, content) for path, content in files
+    ))
 
-        # Check model adapters
-        print("  Test 4: Check model adapters...", end=" ")
-        assert "claude" in cape.model_adapters, "No claude adapter"
-        assert "openai" in cape.model_adapters, "No openai adapter"
-        assert "generic" in cape.model_adapters, "No generic adapter"
-        print("✓")
+    return skill_dir
 
-        print("  EnhancedSkillImporter: All tests passed!")
-        return cape, skill_dir
 
+async def test_skill_import(cape):
+    """Test the Cape produced by EnhancedSkillImporter."""
+    print("\n=== Testing EnhancedSkillImporter ===")
 
-async def test_code_executor():
+    # Imported skill
+    print("  Test 1: Import skill with scripts...", end=" ")
+
+    assert cape is not None, "Import returned None"
+    assert cape.id == "test-calculator", f"Wrong ID: {cape.id}"
+    assert cape.description, "Missing description"
+    print("✓")
+
+    # Check execution config
+    print("  Test 2: Check execution configuration...", end=" ")
+    assert cape.execution is not None, "No execution config"
+    entrypoint = cape.execution.entrypoint
+    assert entrypoint == "scripts/main.py", f"Wrong entrypoint: {entrypoint}"
+    print("✓")
+
+    # Check code adapter
+    print("  Test 3: Check code adapter...", end=" ")
+    assert "code" in cape.model_adapters, "No code adapter"
+    code_adapter = cape.model_adapters["code"]
+    assert "scripts/main.py" in code_adapter["scripts"], "main.py not in scripts"
+    assert "scripts/helpers.py" in code_adapter["scripts"], "helpers.py not in scripts"
+    assert code_adapter["runtime"] == "python", "Wrong runtime"
+    print("✓")
+
+    # Check model adapters
+    print("  Test 4: Check model adapters...", end=" ")
+    assert "claude" in cape.model_adapters, "No claude adapter"
+    assert "openai" in cape.model_adapters, "No openai adapter"
+    assert "generic" in cape.model_adapters, "No generic adapter"
+    print("✓")
+
+    print("  EnhancedSkillImporter: All tests passed!")
+    return cape
+
+
+async def test_code_executor(sandbox, code):
     """Test EnhancedCodeExecutor with imported skill."""
     print("\n=== Testing Direct Sandbox Execution ===")
 
-    with tempfile.TemporaryDirectory() as tmpdir:
-        skill_dir = create_test_skill(Path(tmpdir))
-        cape = import_skill_enhanced(skill_dir)
-
-        # Create sandbox directly for testing
-        from cape.runtime.sandbox import ProcessSandbox, SandboxConfig
-
-        print("  Test 1: Create ProcessSandbox...", end=" ")
-        config = SandboxConfig(type=SandboxType.PROCESS, timeout_seconds=30)
-        sandbox = ProcessSandbox(config)
-        await sandbox.setup()
+    print("  Test 1: Shared ProcessSandbox is ready...", end=" ")
+    assert sandbox.work_dir is not None and sandbox.work_dir.exists()
+    print("✓")
+
+    # (args, expected result) per calculation
+    cases = [
+        ({"a": 10, "b": 5, "operation": "add"}, 15),
+        ({"a": 7, "b": 8, "operation": "multiply"}, 56),
+        ({"a": 100, "b": 4, "operation": "divide"}, 25),
+    ]
+    # One request reused across cases; only its args change
+    request = ExecutionRequest(code=code)
+    for n, (args, expected) in enumerate(cases, start=2):
+        print(f"  Test {n}: Execute calculation ({args['operation']})...", end=" ")
+        request.args = args
+        response = await sandbox.execute(request)
+
+        assert response.success, (
+            f"Execution failed: {response.error}\nstderr: {response.stderr}"
+        )
+        assert response.output["result"] == expected, f"Wrong result: {response.output}"
         print("✓")
 
-        try:
-            # Read the main script
-            main_script = skill_dir / "scripts" / "main.py"
-            code = main_script.read_text()
-
-            # Execute with arguments
-            print("  Test 2: Execute calculation (add)...", end=" ")
-            response = await sandbox.execute(ExecutionRequest(
-                code=code,
-                args={"a": 10, "b": 5, "operation": "add"},
-            ))
-
-            assert response.success, f"Execution failed: {response.error}\nstderr: {response.stderr}"
-            assert response.output["result"] == 15, f"Wrong result: {response.output}"
-            print("✓")
-
-            # Test multiply
-            print("  Test 3: Execute calculation (multiply)...", end=" ")
-            response = await sandbox.execute(ExecutionRequest(
-                code=code,
-                args={"a": 7, "b": 8, "operation": "multiply"},
-            ))
-
-            assert response.success, f"Execution failed: {response.error}"
-            assert response.output["result"] == 56, f"Wrong result: {response.output}"
-            print("✓")
-
-            # Test divide
-            print("  Test 4: Execute calculation (divide)...", end=" ")
-            response = await sandbox.execute(ExecutionRequest(
-                code=code,
-                args={"a": 100, "b": 4, "operation": "divide"},
-            ))
-
-            assert response.success, f"Execution failed: {response.error}"
-            assert response.output["result"] == 25, f"Wrong result: {response.output}"
-            print("✓")
-
-            # Check file output
-            print("  Test 5: Check file output...", end=" ")
-            assert "output.json" in response.files_created, "output.json not created"
-            import json
-            output_data = json.loads(response.files_created["output.json"])
-            assert output_data["result"] == 25, f"Wrong file output: {output_data}"
-            print("✓")
-
-            print("  Direct Sandbox Execution: All tests passed!")
-
-        finally:
-            await sandbox.cleanup()
-
-
-async def test_error_handling():
-    """Test error handling in code execution."""
-    print("\n=== Testing Error Handling ===")
+    # Check file output
+    print("  Test 5: Check file output...", end=" ")
+    assert "output.json" in response.files_created, "output.json not created"
+    import json
+    output_data = json.loads(response.files_created["output.json"])
+    assert output_data["result"] == 25, f"Wrong file output: {output_data}"
+    print("✓")
 
-    with tempfile.TemporaryDirectory() as tmpdir:
-        skill_dir = create_test_skill(Path(tmpdir))
+    print("  Direct Sandbox Execution: All tests passed!")
 
-        from cape.runtime.sandbox import ProcessSandbox, SandboxConfig
-        config = SandboxConfig(type=SandboxType.PROCESS, timeout_seconds=30)
-        sandbox = ProcessSandbox(config)
-        await sandbox.setup()
 
-        try:
-            # Test invalid operation
-            print("  Test 1: Invalid operation handling...", end=" ")
+async def test_error_handling(sandbox, code):
+    """Test error handling in code execution."""
+    print("\n=== Testing Error Handling ===")
 
-            main_script = skill_dir / "scripts" / "main.py"
-            code = main_script.read_text()
+    # One request reused for both cases; only its args change
+    request = ExecutionRequest(code=code)
 
-            response = await sandbox.execute(ExecutionRequest(
-                code=code,
-                args={"a": 10, "b": 5, "operation": "invalid_op"},
-            ))
+    # Test invalid operation
+    print("  Test 1: Invalid operation handling...", end=" ")
 
-            # Should fail with ValueError
-            assert not response.success, "Should have failed with invalid operation"
-            assert "ValueError" in response.stderr or "Unknown operation" in str(response.error)
-            print("✓")
+    request.args = {"a": 10, "b": 5, "operation": "invalid_op"}
+    response = await sandbox.execute(request)
 
-            # Test division by zero
-            print("  Test 2: Division by zero...", end=" ")
-            response = await sandbox.execute(ExecutionRequest(
-                code=code,
-                args={"a": 10, "b": 0, "operation": "divide"},
-            ))
+    # Should fail with ValueError
+    assert not response.success, "Should have failed with invalid operation"
+    assert "ValueError" in response.stderr or "Unknown operation" in str(response.error)
+    print("✓")
 
-            # Should succeed but return infinity
-            assert response.success, f"Failed: {response.error}"
-            assert response.output["result"] == float('inf'), f"Expected inf, got {response.output}"
-            print("✓")
+    # Test division by zero
+    print("  Test 2: Division by zero...", end=" ")
+    request.args = {"a": 10, "b": 0, "operation": "divide"}
+    response = await sandbox.execute(request)
 
-            print("  Error Handling: All tests passed!")
+    # Should succeed but return infinity
+    assert response.success, f"Failed: {response.error}"
+    assert response.output["result"] == float('inf'), (
+        f"Expected inf, got {response.output}"
+    )
+    print("✓")
 
-        finally:
-            await sandbox.cleanup()
+    print("  Error Handling: All tests passed!")
 
 
-async def test_full_workflow():
+async def test_full_workflow(sandbox, skill_dir, cape):
     """Test complete import-to-execution workflow."""
     print("\n=== Testing Full Workflow ===")
 
-    with tempfile.TemporaryDirectory() as tmpdir:
-        # Step 1: Create skill
-        print("  Step 1: Create test skill...", end=" ")
-        skill_dir = create_test_skill(Path(tmpdir))
-        print("✓")
-
-        # Step 2: Import skill
-        print("  Step 2: Import with EnhancedSkillImporter...", end=" ")
-        cape = import_skill_enhanced(skill_dir)
-        print("✓")
+    # Step 1: Locate skill
+    print("  Step 1: Locate test skill...", end=" ")
+    assert (skill_dir / "SKILL.md").exists(), "SKILL.md missing"
+    print("✓")
 
-        # Step 3: Create sandbox from cape config
-        print("  Step 3: Create sandbox from cape config...", end=" ")
-        from cape.runtime.sandbox import ProcessSandbox, SandboxConfig
-        config = SandboxConfig(
-            type=SandboxType.PROCESS,
-            timeout_seconds=cape.execution.timeout_seconds,
-        )
-        sandbox = ProcessSandbox(config)
-        await sandbox.setup()
-        print("✓")
+    # Step 2: Imported skill (imported once in main)
+    print("  Step 2: Import with EnhancedSkillImporter...", end=" ")
+    assert cape.execution is not None, "No execution config"
+    print("✓")
 
-        try:
-            # Step 4: Load and execute main script
-            print("  Step 4: Execute cape script...", end=" ")
+    # Step 3: Check the shared sandbox fits the cape config
+    print("  Step 3: Check sandbox against cape config...", end=" ")
+    assert cape.execution.timeout_seconds >= sandbox.config.timeout_seconds, (
+        f"Cape timeout {cape.execution.timeout_seconds}s is shorter than "
+        f"sandbox timeout {sandbox.config.timeout_seconds}s"
+    )
+    print("✓")
 
-            main_script_path = skill_dir / cape.execution.entrypoint
-            code = main_script_path.read_text()
+    # Step 4: Load and execute main script
+    print("  Step 4: Execute cape script...", end=" ")
 
-            response = await sandbox.execute(ExecutionRequest(
-                code=code,
-                args={"a": 100, "b": 25, "operation": "subtract"},
-            ))
+    main_script_path = skill_dir / cape.execution.entrypoint
+    code = main_script_path.read_text()
 
-            assert response.success, f"Execution failed: {response.error}"
-            assert response.output["result"] == 75, f"Wrong result: {response.output}"
-            print("✓")
+    response = await sandbox.execute(ExecutionRequest(
+        code=code,
+        args={"a": 100, "b": 25, "operation": "subtract"},
+    ))
 
-            # Step 5: Verify output
-            print("  Step 5: Verify output structure...", end=" ")
-            assert "a" in response.output
-            assert "b" in response.output
-            assert "operation" in response.output
-            assert "result" in response.output
-            print("✓")
+    assert response.success, f"Execution failed: {response.error}"
+    assert response.output["result"] == 75, f"Wrong result: {response.output}"
+    print("✓")
 
-            print("  Full Workflow: All tests passed!")
+    # Step 5: Verify output
+    print("  Step 5: Verify output structure...", end=" ")
+    assert "a" in response.output
+    assert "b" in response.output
+    assert "operation" in response.output
+    assert "result" in response.output
+    print("✓")
 
-        finally:
-            await sandbox.cleanup()
+    print("  Full Workflow: All tests passed!")
 
 
 async def main():
@@ -347,27 +317,25 @@ async def main():
     print("Cape Code Execution Layer - Integration Tests")
     print("=" * 50)
 
-    try:
-        await test_skill_import()
-        await test_code_executor()
-        await test_error_handling()
-        await test_full_workflow()
-
-        print("\n" + "=" * 50)
-        print("ALL INTEGRATION TESTS PASSED!")
-        print("=" * 50)
-
-    except AssertionError as e:
-        print(f"\n❌ TEST FAILED: {e}")
-        import traceback
-        traceback.print_exc()
-        sys.exit(1)
-    except Exception as e:
-        print(f"\n❌ ERROR: {e}")
-        import traceback
-        traceback.print_exc()
-        sys.exit(1)
+    # One test skill for every test; none of them modify it
+    skill_dir = await create_test_skill(scratch_dir("skill"))
+    # Read the main script once for the direct execution tests
+    code = (skill_dir / "scripts" / "main.py").read_text()
+    # Import it once for the tests that look at the Cape
+    cape = import_skill_enhanced(skill_dir)
+
+    async with shared_sandbox() as sandbox:
+        await run_concurrently(
+            test_skill_import(cape),
+            test_code_executor(sandbox, code),
+            test_error_handling(sandbox, code),
+            test_full_workflow(sandbox, skill_dir, cape),
+        )
+
+    print("\n" + "=" * 50)
+    print("ALL INTEGRATION TESTS PASSED!")
+    print("=" * 50)
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main)
@@ -4,14 +4,11 @@ Quick test script for sandbox module.
 Run directly without pytest.
 """
 
-import asyncio
-import sys
-from pathlib import Path
+from tests._util import add_project_root, run, run_concurrently
 
-# Add project to path
-sys.path.insert(0, str(Path(__file__).parent))
+add_project_root()
 
-from cape.runtime.sandbox import (
+from cape.runtime.sandbox import (  # noqa: E402
     SandboxManager,
     SandboxConfig,
     SandboxType,
@@ -242,25 +239,18 @@ async def main():
     print("Cape Sandbox Module Tests")
     print("=" * 50)
 
-    try:
-        await test_inprocess_sandbox()
-        await test_process_sandbox()
-        await test_sandbox_manager()
-        await test_timeout()
-
-        print("\n" + "=" * 50)
-        print("ALL TESTS PASSED!")
-        print("=" * 50)
+    # Each test uses its own sandbox, so the 2s timeout test overlaps the rest
+    await run_concurrently(
+        test_inprocess_sandbox(),
+        test_process_sandbox(),
+        test_sandbox_manager(),
+        test_timeout(),
+    )
 
-    except AssertionError as e:
-        print(f"\n❌ TEST FAILED: {e}")
-        sys.exit(1)
-    except Exception as e:
-        print(f"\n❌ ERROR: {e}")
-        import traceback
-        traceback.print_exc()
-        sys.exit(1)
+    print("\n" + "=" * 50)
+    print("ALL TESTS PASSED!")
+    print("=" * 50)
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    run(main)
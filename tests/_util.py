@@ -0,0 +1,225 @@
+"""
+Helpers for the standalone test scripts in the project root (and a few
+fixtures shared by the pytest modules).
+
+Usage:
+    from tests._util import add_project_root, run, run_concurrently
+
+    add_project_root()
+    ...
+    if __name__ == "__main__":
+        run(main)
+"""
+
+import asyncio
+import atexit
+import inspect
+import io
+import itertools
+import os
+import shutil
+import sys
+import tempfile
+import traceback
+from contextlib import contextmanager, redirect_stdout
+from contextvars import ContextVar
+from pathlib import Path
+from typing import Dict, Optional
+
+try:
+    import uvloop
+except ImportError:
+    uvloop = None
+
+PROJECT_ROOT = Path(__file__).resolve().parent.parent
+
+# Per-process scratch root, created on first use and removed at exit
+_scratch_root: Optional[Path] = None
+_scratch_ids = itertools.count()
+
+
+def add_project_root() -> Path:
+    """Put the project root on sys.path (once) and return it."""
+    root = str(PROJECT_ROOT)
+    if root not in sys.path:
+        sys.path.insert(0, root)
+    return PROJECT_ROOT
+
+
+def temp_root() -> Optional[str]:
+    """
+    Parent directory for test scratch files.
+
+    Same choice as the sandbox work dirs: /dev/shm when it is writable and
+    has room, so scratch files stay in RAM, else None (tempfile's default
+    location).
+    """
+    add_project_root()
+    from cape.runtime.sandbox.process_sandbox import _default_work_root
+
+    return _default_work_root()
+
+
+def scratch_dir(prefix: str = "test") -> Path:
+    """
+    Create a fresh directory under the per-process scratch root.
+
+    The whole root is removed once at interpreter exit, so tests skip the
+    per-directory rmtree that TemporaryDirectory does on every exit.
+    """
+    global _scratch_root
+    if _scratch_root is None:
+        _scratch_root = Path(tempfile.mkdtemp(prefix="capes-test-", dir=temp_root()))
+        atexit.register(shutil.rmtree, _scratch_root, ignore_errors=True)
+
+    path = _scratch_root / f"{prefix}-{next(_scratch_ids)}"
+    path.mkdir()
+    return path
+
+
+def _write_file(path: Path, data: bytes) -> None:
+    """Write data to path through a raw fd, skipping the buffered file object."""
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
+
+
+def write_skill(
+    root: Path,
+    name: str,
+    skill_md: str,
+    scripts: Optional[Dict[str, str]] = None,
+    references: Optional[Dict[str, str]] = None,
+) -> Path:
+    """
+    Create a skill directory root/name with SKILL.md and optional files.
+
+    Each directory is created by one mkdir(parents=True) on its deepest
+    path and each file by a single open/write/close on a raw fd.
+
+    Args:
+        root: Skills directory
+        name: Skill directory name
+        skill_md: SKILL.md content
+        scripts: scripts/ file name -> content
+        references: references/ file name -> content
+
+    Returns:
+        The skill directory
+    """
+    skill_dir = root / name
+    subdirs = {
+        subdir: files
+        for subdir, files in (("scripts", scripts), ("references", references))
+        if files
+    }
+    if subdirs:
+        for subdir in subdirs:
+            (skill_dir / subdir).mkdir(parents=True, exist_ok=True)
+    else:
+        skill_dir.mkdir(parents=True, exist_ok=True)
+
+    _write_file(skill_dir / "SKILL.md", skill_md.encode("utf-8"))
+    for subdir, files in subdirs.items():
+        for filename, content in files.items():
+            _write_file(skill_dir / subdir / filename, content.encode("utf-8"))
+    return skill_dir
+
+
+def run(entry, *args):
+    """
+    Run a test entry point and exit with status 1 if it fails.
+
+    Coroutines run on uvloop when it is installed.
+
+    Args:
+        entry: Test function or coroutine function
+        *args: Arguments passed to entry
+
+    Returns:
+        Whatever entry returns
+    """
+    try:
+        result = entry(*args)
+        if inspect.iscoroutine(result):
+            # libuv event loop when installed, else the stdlib one
+            result = (uvloop.run if uvloop else asyncio.run)(result)
+        return result
+    except AssertionError as e:
+        print(f"\n❌ TEST FAILED: {e}")
+        traceback.print_exc()
+        sys.exit(1)
+    except Exception as e:
+        print(f"\n❌ ERROR: {e}")
+        traceback.print_exc()
+        sys.exit(1)
+
+
+# Per-task output buffer used while tests run concurrently
+_task_output: ContextVar[Optional[io.StringIO]] = ContextVar(
+    "task_output", default=None
+)
+
+
+class _TaskStdout:
+    """stdout proxy that routes writes to the current task's buffer."""
+
+    def __init__(self, stream):
+        self._stream = stream
+
+    def write(self, text):
+        return (_task_output.get() or self._stream).write(text)
+
+    def flush(self):
+        self._stream.flush()
+
+
+async def run_concurrently(*coros):
+    """
+    Run test coroutines concurrently.
+
+    Each test's output is buffered and printed in argument order once all
+    have finished; the first exception (in that order) is then re-raised.
+    """
+    buffers = [io.StringIO() for _ in coros]
+
+    async def buffered(coro, buffer):
+        _task_output.set(buffer)
+        return await coro
+
+    stdout = sys.stdout
+    sys.stdout = _TaskStdout(stdout)
+    try:
+        results = await asyncio.gather(
+            *(buffered(coro, buffer) for coro, buffer in zip(coros, buffers)),
+            return_exceptions=True,
+        )
+    finally:
+        sys.stdout = stdout
+
+    # One write for the whole group instead of one per print()
+    sys.stdout.write("".join(buffer.getvalue() for buffer in buffers))
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+
+
+@contextmanager
+def buffered_stdout():
+    """
+    Collect prints in memory and write them out in one go on exit.
+
+    The buffer is flushed even if the body raises, so output before a
+    failure is never lost.
+    """
+    buffer = io.StringIO()
+    try:
+        with redirect_stdout(buffer):
+            yield buffer
+    finally:
+        sys.stdout.write(buffer.getvalue())
+        sys.stdout.flush()
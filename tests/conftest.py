@@ -0,0 +1,21 @@
+"""
+pytest configuration shared by the test modules.
+"""
+
+import shutil
+import tempfile
+
+from tests._util import temp_root
+
+
+def pytest_configure(config):
+    # Keep tmp_path/tmp_path_factory scratch files in RAM (/dev/shm) when
+    # it has room, unless --basetemp was given
+    if config.option.basetemp is not None:
+        return
+    root = temp_root()
+    if root is not None:
+        config.option.basetemp = tempfile.mkdtemp(prefix="pytest-", dir=root)
+        config.add_cleanup(
+            lambda: shutil.rmtree(config.option.basetemp, ignore_errors=True)
+        )
@@ -34,6 +34,7 @@ class TestCapeAgent:
                 type=ExecutionType.CODE,
                 language="python",
                 code="result = f'Processed JSON: {inputs}'",
+                deterministic=True,
             ),
         ))
 
@@ -50,6 +51,7 @@ class TestCapeAgent:
                 type=ExecutionType.CODE,
                 language="python",
                 code="result = f'PDF processed: {inputs}'",
+                deterministic=True,
             ),
         ))
 
@@ -66,12 +68,10 @@ class TestCapeAgent:
                 type=ExecutionType.CODE,
                 language="python",
                 code="result = f'Code reviewed: {inputs}'",
+                deterministic=True,
             ),
         ))
 
-        # Rebuild matcher index
-        agent.registry.matcher.index(list(agent.registry.all()))
-
         return agent
 
     def test_agent_initialization(self, agent):
@@ -123,13 +123,25 @@ class TestCapeAgent:
 
         assert result.success is True
 
+    def test_sync_calls_reuse_event_loop(self, agent_with_capes):
+        """Test the *_sync methods share one event loop."""
+        agent_with_capes.run_sync("process json")
+        loop = agent_with_capes._loop
+        agent_with_capes.execute_sync(cape_id="json-processor", inputs={})
+
+        assert loop is not None and not loop.is_closed()
+        assert agent_with_capes._loop is loop
+
     def test_history_tracking(self, agent_with_capes):
         """Test that history is tracked."""
-        # Run a few requests
-        agent_with_capes.run_sync("process json")
-        agent_with_capes.run_sync("extract pdf")
-        agent_with_capes.run_sync("review code")
+        # Run a few requests concurrently on one event loop
+        results = agent_with_capes.run_batch_sync(
+            ["process json", "extract pdf", "review code"]
+        )
 
+        assert [r.cape_id for r in results] == [
+            "json-processor", "pdf-processor", "code-reviewer",
+        ]
         assert len(agent_with_capes.history) == 3
         assert agent_with_capes.history[0]["cape_id"] == "json-processor"
         assert agent_with_capes.history[1]["cape_id"] == "pdf-processor"
@@ -9,13 +9,14 @@ import asyncio
 import pytest
 from pathlib import Path
 
-# Check Docker availability
+# Check Docker availability; the client is kept and shared by every sandbox
 try:
     import docker
-    client = docker.from_env()
-    client.ping()
+    DOCKER_CLIENT = docker.from_env()
+    DOCKER_CLIENT.ping()
     DOCKER_AVAILABLE = True
 except Exception:
+    DOCKER_CLIENT = None
     DOCKER_AVAILABLE = False
 
 pytestmark = pytest.mark.skipif(
@@ -33,31 +34,66 @@ from cape.runtime.sandbox import (
 
 # Import DockerSandbox only if Docker is available
 if DOCKER_AVAILABLE:
-    from cape.runtime.sandbox import DockerSandbox
+    from cape.runtime.sandbox import (
+        DockerSandbox,
+        DockerSandboxPool,
+        build_base_image,
+    )
 
 
 # ============================================================
 # Fixtures
 # ============================================================
 
-@pytest.fixture
-async def docker_sandbox():
-    """Create a DockerSandbox for testing."""
+@pytest.fixture(scope="session", autouse=True)
+def docker_image():
+    """Build (or verify) the sandbox image once, before the first test."""
+    assert asyncio.run(build_base_image(client=DOCKER_CLIENT))
+
+
+@pytest.fixture(scope="session")
+def docker_pool():
+    """Warm containers shared by every test in the session."""
     config = SandboxConfig(
         type=SandboxType.DOCKER,
         timeout_seconds=30,
         max_memory_mb=256,
+        docker_client=DOCKER_CLIENT,
+    )
+    pool = DockerSandboxPool(config, size=2)
+    # Each test runs on its own event loop; tests lease one sandbox at a
+    # time, so acquire() never has to wait on a loop-bound future
+    asyncio.run(pool.start())
+    yield pool
+    asyncio.run(pool.close())
+
+
+@pytest.fixture(scope="class")
+def timeout_sandbox():
+    """One short-timeout container shared by the timeout tests."""
+    config = SandboxConfig(
+        type=SandboxType.DOCKER,
+        timeout_seconds=2,
+        docker_client=DOCKER_CLIENT,
     )
     sandbox = DockerSandbox(config)
-    await sandbox.setup()
+    asyncio.run(sandbox.setup())
     yield sandbox
-    await sandbox.cleanup()
+    asyncio.run(sandbox.cleanup())
+
+
+@pytest.fixture
+async def docker_sandbox(docker_pool):
+    """Lease a pooled DockerSandbox for one test."""
+    sandbox = await docker_pool.acquire()
+    yield sandbox
+    await docker_pool.release(sandbox)
 
 
 @pytest.fixture
 async def docker_manager():
     """Create a SandboxManager with Docker config."""
-    config = SandboxConfig(type=SandboxType.DOCKER)
+    config = SandboxConfig(type=SandboxType.DOCKER, docker_client=DOCKER_CLIENT)
     manager = SandboxManager(config)
     yield manager
     await manager.release_all()
@@ -128,6 +164,35 @@ result = "done"
         assert not response.success
         assert response.exit_code != 0
 
+    @pytest.mark.asyncio
+    async def test_execute_batch(self, docker_sandbox):
+        """Test several requests in one container exec."""
+        responses = await docker_sandbox.execute_batch([
+            ExecutionRequest(code="result = args['x'] + 1", args={"x": 1}),
+            ExecutionRequest(code="print('batched')\nresult = 'ok'"),
+            ExecutionRequest(code="result = 1 / 0"),
+        ])
+
+        assert [r.success for r in responses] == [True, True, False]
+        assert responses[0].output == 2
+        assert "batched" in responses[1].stdout
+        assert responses[2].exit_code != 0
+
+    @pytest.mark.asyncio
+    async def test_execute_batch_driver_exits_early(self, docker_sandbox):
+        """Test requests after an os._exit() fail instead of going missing."""
+        responses = await docker_sandbox.execute_batch([
+            ExecutionRequest(code="result = 'first'"),
+            ExecutionRequest(code="import os\nos._exit(0)"),
+            ExecutionRequest(code="result = 'never runs'"),
+        ])
+
+        assert len(responses) == 3
+        assert responses[0].success
+        assert responses[0].output == "first"
+        assert [r.success for r in responses[1:]] == [False, False]
+        assert all("stopped" in r.error for r in responses[1:])
+
 
 # ============================================================
 # File I/O Tests
@@ -199,56 +264,34 @@ class TestDockerTimeout:
     """Tests for timeout handling."""
 
     @pytest.mark.asyncio
-    async def test_timeout_kills_execution(self):
+    async def test_timeout_kills_execution(self, timeout_sandbox):
         """Test that long-running code is killed."""
-        config = SandboxConfig(
-            type=SandboxType.DOCKER,
-            timeout_seconds=2,
-        )
-        sandbox = DockerSandbox(config)
-        await sandbox.setup()
-
-        try:
-            response = await sandbox.execute(ExecutionRequest(
-                code="""
+        response = await timeout_sandbox.execute(ExecutionRequest(
+            code="""
 import time
 time.sleep(10)
 result = "Should not reach"
 """
-            ))
-
-            assert not response.success
-            assert "timeout" in response.error.lower()
+        ))
 
-        finally:
-            await sandbox.cleanup()
+        assert not response.success
+        assert "timeout" in response.error.lower()
 
     @pytest.mark.asyncio
-    async def test_container_recovery_after_timeout(self):
+    async def test_container_recovery_after_timeout(self, timeout_sandbox):
         """Test container is usable after timeout."""
-        config = SandboxConfig(
-            type=SandboxType.DOCKER,
-            timeout_seconds=2,
-        )
-        sandbox = DockerSandbox(config)
-        await sandbox.setup()
-
-        try:
-            # Trigger timeout
-            await sandbox.execute(ExecutionRequest(
-                code="import time; time.sleep(10)"
-            ))
-
-            # Should still work
-            response = await sandbox.execute(ExecutionRequest(
-                code="result = 'recovered'"
-            ))
+        # Trigger timeout
+        await timeout_sandbox.execute(ExecutionRequest(
+            code="import time; time.sleep(10)"
+        ))
 
-            assert response.success
-            assert response.output == "recovered"
+        # Should still work
+        response = await timeout_sandbox.execute(ExecutionRequest(
+            code="result = 'recovered'"
+        ))
 
-        finally:
-            await sandbox.cleanup()
+        assert response.success
+        assert response.output == "recovered"
 
 
 # ============================================================
@@ -400,12 +443,13 @@ result = len(data)
             code="""
 import json
 from pathlib import Path
+from statistics import fmean
 
 # Read input
 data = json.loads(Path("data.json").read_text())
 
 # Process
-avg_score = sum(d["score"] for d in data) / len(data)
+avg_score = fmean(d["score"] for d in data)
 result = {"average_score": avg_score, "count": len(data)}
 
 # Save results
@@ -7,44 +7,55 @@ Uses pytest and httpx for testing FastAPI endpoints.
 import asyncio
 import io
 import pytest
-import tempfile
-from pathlib import Path
+import pytest_asyncio
 
-# Check if httpx is available
+# Check if httpx and the API's dependencies are available; the app is
+# imported once here rather than inside a fixture
 try:
+    import httpx
     from httpx import AsyncClient, ASGITransport
+    from api.main import app
+    from api.storage import StorageConfig, get_storage, init_storage
     HTTPX_AVAILABLE = True
 except ImportError:
     HTTPX_AVAILABLE = False
 
-pytestmark = pytest.mark.skipif(
-    not HTTPX_AVAILABLE,
-    reason="httpx not installed"
-)
+pytestmark = [
+    pytest.mark.skipif(
+        not HTTPX_AVAILABLE, reason="httpx or API dependencies not installed"
+    ),
+    # One loop for the whole module, so the shared app and client fixtures
+    # (and storage's cleanup task) outlive a single test
+    pytest.mark.asyncio(loop_scope="session"),
+]
+
+# Upload bodies shared by the tests, built once at import
+PAYLOADS = {f"file{i}.txt": f"Content {i}".encode() for i in range(1, 6)}
 
 
 # ============================================================
 # Fixtures
 # ============================================================
 
-@pytest.fixture
-def temp_storage_dir():
-    """Create temporary storage directory."""
-    with tempfile.TemporaryDirectory() as temp_dir:
-        yield Path(temp_dir)
+@pytest.fixture(scope="session")
+def temp_storage_dir(tmp_path_factory):
+    """
+    Create temporary storage directory.
 
+    tmp_path_factory gives each pytest-xdist worker its own base directory,
+    so workers running this module in parallel never share storage.
+    """
+    return tmp_path_factory.mktemp("storage")
 
-@pytest.fixture
-async def test_app(temp_storage_dir):
-    """Create test FastAPI app with temporary storage."""
-    import os
-
-    # Set environment variables before importing
-    os.environ["CAPE_STORAGE_DIR"] = str(temp_storage_dir)
 
-    from api.main import app
-    from api.storage import init_storage, StorageConfig, get_storage
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
+async def test_app(temp_storage_dir):
+    """
+    Create test FastAPI app with temporary storage.
 
+    Initialized once per session; reset_storage() clears what each test
+    leaves behind.
+    """
     # Initialize storage with temp directory
     config = StorageConfig(base_dir=temp_storage_dir)
     await init_storage(config)
@@ -56,7 +67,7 @@ async def test_app(temp_storage_dir):
     await storage.shutdown()
 
 
-@pytest.fixture
+@pytest_asyncio.fixture(scope="session", loop_scope="session")
 async def client(test_app):
     """Create async test client."""
     transport = ASGITransport(app=test_app)
@@ -64,6 +75,90 @@ async def client(test_app):
         yield ac
 
 
+async def reset_storage(storage):
+    """Delete every file and session in storage."""
+    for session_id in list(storage._session_files):
+        await storage.delete_session(session_id)
+    for file_id in list(storage._files):
+        await storage.delete_file(file_id)
+
+
+@pytest_asyncio.fixture(autouse=True, loop_scope="session")
+async def clean_storage(request):
+    """Clear the shared storage after each test that used the app."""
+    yield
+    if "test_app" in request.fixturenames:
+        await reset_storage(get_storage())
+
+
+async def upload_batch(client, specs, session_id=None):
+    """
+    Upload several (name, content) files in one multipart request.
+
+    Content may be bytes or a file object. Plain bytes are the cheaper of
+    the two: httpx sends them as-is, while file objects are read in chunks.
+
+    Returns:
+        The upload response JSON
+    """
+    files = [("files", (name, content, "text/plain")) for name, content in specs]
+    data = {"session_id": session_id} if session_id else None
+    response = await client.post("/api/files/upload", files=files, data=data)
+    assert response.status_code == 200
+    return response.json()
+
+
+async def raw_asgi(app, method, path):
+    """
+    Call the ASGI app directly, skipping httpx's client machinery.
+
+    For body-less requests that need no cookies, redirects or multipart
+    encoding. Returns an httpx.Response so assertions read the same as
+    with the client.
+    """
+    path, _, query = path.partition("?")
+    scope = {
+        "type": "http",
+        "asgi": {"version": "3.0"},
+        "http_version": "1.1",
+        "method": method,
+        "scheme": "http",
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": "",
+        "query_string": query.encode(),
+        "headers": [(b"host", b"test")],
+        "client": ("testclient", 50000),
+        "server": ("test", 80),
+    }
+    request_sent = False
+    response_done = asyncio.Event()
+    start = {}
+    chunks = []
+
+    async def receive():
+        nonlocal request_sent
+        if not request_sent:
+            request_sent = True
+            return {"type": "http.request", "body": b"", "more_body": False}
+        # Streaming responses listen for a disconnect until they finish
+        await response_done.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            start.update(message)
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+            if not message.get("more_body", False):
+                response_done.set()
+
+    await app(scope, receive, send)
+    return httpx.Response(
+        start["status"], headers=start.get("headers", []), content=b"".join(chunks)
+    )
+
+
 # ============================================================
 # Upload Tests
 # ============================================================
@@ -71,45 +166,26 @@ async def client(test_app):
 class TestFileUpload:
     """Tests for file upload endpoint."""
 
-    @pytest.mark.asyncio
-    async def test_upload_single_file(self, client):
-        """Test uploading a single file."""
-        files = {"files": ("test.txt", b"Hello World", "text/plain")}
+    @pytest.mark.parametrize("count", [1, 2, 5])
+    async def test_upload_files(self, client, count):
+        """Test uploading one or more files in one request."""
+        names = list(PAYLOADS)[:count]
 
-        response = await client.post("/api/files/upload", files=files)
+        data = await upload_batch(client, [(name, PAYLOADS[name]) for name in names])
 
-        assert response.status_code == 200
-        data = response.json()
         assert data["session_id"]
-        assert len(data["files"]) == 1
-        assert data["files"][0]["original_name"] == "test.txt"
-
-    @pytest.mark.asyncio
-    async def test_upload_multiple_files(self, client):
-        """Test uploading multiple files."""
-        files = [
-            ("files", ("file1.txt", b"Content 1", "text/plain")),
-            ("files", ("file2.txt", b"Content 2", "text/plain")),
-        ]
-
-        response = await client.post("/api/files/upload", files=files)
-
-        assert response.status_code == 200
-        data = response.json()
-        assert len(data["files"]) == 2
+        assert [f["original_name"] for f in data["files"]] == names
+        assert data["total_size_bytes"] == sum(len(PAYLOADS[n]) for n in names)
 
-    @pytest.mark.asyncio
     async def test_upload_with_session_id(self, client):
         """Test uploading with custom session ID."""
-        files = {"files": ("test.txt", b"Hello", "text/plain")}
-        data = {"session_id": "custom-session-123"}
+        data = await upload_batch(
+            client, list(PAYLOADS.items())[:1], "custom-session-123"
+        )
 
-        response = await client.post("/api/files/upload", files=files, data=data)
+        assert data["session_id"] == "custom-session-123"
+        assert data["files"][0]["session_id"] == "custom-session-123"
 
-        assert response.status_code == 200
-        assert response.json()["session_id"] == "custom-session-123"
-
-    @pytest.mark.asyncio
     async def test_upload_invalid_file_type(self, client):
         """Test uploading invalid file type."""
         files = {"files": ("malware.exe", b"evil content", "application/octet-stream")}
@@ -118,6 +194,32 @@ class TestFileUpload:
 
         assert response.status_code == 415  # Unsupported Media Type
 
+    async def test_upload_rejected_file_stores_nothing(self, client):
+        """Test one invalid part rejects the whole multi-file upload."""
+        files = [
+            ("files", ("ok.txt", b"fine", "text/plain")),
+            ("files", ("bad.exe", b"evil", "application/octet-stream")),
+        ]
+
+        response = await client.post(
+            "/api/files/upload", files=files, data={"session_id": "mixed"}
+        )
+
+        assert response.status_code == 415
+        response = await client.get("/api/files/session/mixed")
+        assert response.json()["total_files"] == 0
+
+    async def test_concurrent_uploads(self, client):
+        """Test uploads into one session can be issued concurrently."""
+        responses = await asyncio.gather(*(
+            upload_batch(client, [item], "concurrent")
+            for item in list(PAYLOADS.items())[:3]
+        ))
+
+        assert all(r["session_id"] == "concurrent" for r in responses)
+        response = await client.get("/api/files/session/concurrent")
+        assert response.json()["total_files"] == 3
+
 
 # ============================================================
 # Download Tests
@@ -126,38 +228,44 @@ class TestFileUpload:
 class TestFileDownload:
     """Tests for file download endpoint."""
 
-    @pytest.mark.asyncio
-    async def test_download_file(self, client):
+    async def test_download_file(self, client, test_app):
         """Test downloading an uploaded file."""
         # Upload first
-        content = b"Test content for download"
-        files = {"files": ("download.txt", content, "text/plain")}
-        upload_response = await client.post("/api/files/upload", files=files)
-        file_id = upload_response.json()["files"][0]["file_id"]
+        content = PAYLOADS["file1.txt"]
+        data = await upload_batch(client, [("file1.txt", content)])
+        file_id = data["files"][0]["file_id"]
 
         # Download
-        response = await client.get(f"/api/files/{file_id}")
+        response = await raw_asgi(test_app, "GET", f"/api/files/{file_id}")
 
         assert response.status_code == 200
         assert response.content == content
         assert "attachment" in response.headers.get("content-disposition", "")
 
-    @pytest.mark.asyncio
-    async def test_download_inline(self, client):
+    async def test_download_streamed_upload(self, client):
+        """Test a file object upload round-trips byte for byte."""
+        content = PAYLOADS["file5.txt"] * 10_000
+        data = await upload_batch(client, [("stream.txt", io.BytesIO(content))])
+        file_id = data["files"][0]["file_id"]
+
+        response = await client.get(f"/api/files/{file_id}")
+
+        assert response.status_code == 200
+        assert response.content == content
+
+    async def test_download_inline(self, client, test_app):
         """Test downloading file inline."""
-        files = {"files": ("inline.txt", b"Inline content", "text/plain")}
-        upload_response = await client.post("/api/files/upload", files=files)
-        file_id = upload_response.json()["files"][0]["file_id"]
+        data = await upload_batch(client, [("file2.txt", PAYLOADS["file2.txt"])])
+        file_id = data["files"][0]["file_id"]
 
-        response = await client.get(f"/api/files/{file_id}?inline=true")
+        response = await raw_asgi(test_app, "GET", f"/api/files/{file_id}?inline=true")
 
         assert response.status_code == 200
         assert "inline" in response.headers.get("content-disposition", "")
 
-    @pytest.mark.asyncio
-    async def test_download_not_found(self, client):
+    async def test_download_not_found(self, test_app):
         """Test downloading non-existent file."""
-        response = await client.get("/api/files/non-existent-id")
+        response = await raw_asgi(test_app, "GET", "/api/files/non-existent-id")
 
         assert response.status_code == 404
 
@@ -169,19 +277,17 @@ class TestFileDownload:
 class TestFileMetadata:
     """Tests for file metadata endpoint."""
 
-    @pytest.mark.asyncio
-    async def test_get_metadata(self, client):
+    async def test_get_metadata(self, client, test_app):
         """Test getting file metadata."""
-        files = {"files": ("meta.txt", b"Metadata test", "text/plain")}
-        upload_response = await client.post("/api/files/upload", files=files)
-        file_id = upload_response.json()["files"][0]["file_id"]
+        data = await upload_batch(client, [("file3.txt", PAYLOADS["file3.txt"])])
+        file_id = data["files"][0]["file_id"]
 
-        response = await client.get(f"/api/files/{file_id}/metadata")
+        response = await raw_asgi(test_app, "GET", f"/api/files/{file_id}/metadata")
 
         assert response.status_code == 200
         data = response.json()
         assert data["file_id"] == file_id
-        assert data["original_name"] == "meta.txt"
+        assert data["original_name"] == "file3.txt"
         assert data["status"] == "uploaded"
 
 
@@ -192,12 +298,10 @@ class TestFileMetadata:
 class TestFileDelete:
     """Tests for file deletion endpoints."""
 
-    @pytest.mark.asyncio
     async def test_delete_file(self, client):
         """Test deleting a file."""
-        files = {"files": ("delete.txt", b"Delete me", "text/plain")}
-        upload_response = await client.post("/api/files/upload", files=files)
-        file_id = upload_response.json()["files"][0]["file_id"]
+        data = await upload_batch(client, [("file4.txt", PAYLOADS["file4.txt"])])
+        file_id = data["files"][0]["file_id"]
 
         # Delete
         response = await client.delete(f"/api/files/{file_id}")
@@ -207,15 +311,11 @@ class TestFileDelete:
         response = await client.get(f"/api/files/{file_id}")
         assert response.status_code == 404
 
-    @pytest.mark.asyncio
     async def test_delete_session(self, client):
         """Test deleting all files in a session."""
         session_id = "session-to-delete"
 
-        # Upload multiple files
-        for i in range(3):
-            files = {"files": (f"file{i}.txt", f"Content {i}".encode(), "text/plain")}
-            await client.post("/api/files/upload", files=files, data={"session_id": session_id})
+        await upload_batch(client, list(PAYLOADS.items())[:3], session_id)
 
         # Delete session
         response = await client.delete(f"/api/files/session/{session_id}")
@@ -234,15 +334,11 @@ class TestFileDelete:
 class TestSessionFiles:
     """Tests for session file listing."""
 
-    @pytest.mark.asyncio
     async def test_list_session_files(self, client):
         """Test listing files in a session."""
         session_id = "list-session"
 
-        # Upload files
-        for name in ["a.txt", "b.txt", "c.txt"]:
-            files = {"files": (name, f"Content of {name}".encode(), "text/plain")}
-            await client.post("/api/files/upload", files=files, data={"session_id": session_id})
+        await upload_batch(client, list(PAYLOADS.items())[:3], session_id)
 
         # List
         response = await client.get(f"/api/files/session/{session_id}")
@@ -260,13 +356,10 @@ class TestSessionFiles:
 class TestStorageStats:
     """Tests for storage statistics."""
 
-    @pytest.mark.asyncio
     async def test_get_stats(self, client):
         """Test getting storage statistics."""
         # Upload some files first
-        for i in range(2):
-            files = {"files": (f"stat{i}.txt", b"Stats test", "text/plain")}
-            await client.post("/api/files/upload", files=files)
+        await upload_batch(client, list(PAYLOADS.items())[:2])
 
         response = await client.get("/api/files/stats")
 
@@ -277,5 +370,129 @@ class TestStorageStats:
         assert "by_type" in data
 
 
+# ============================================================
+# Batch Tests
+# ============================================================
+
+class TestBatch:
+    """Tests for the multipart/mixed batch endpoint."""
+
+    @staticmethod
+    def _batch_body(paths, boundary="test_boundary"):
+        parts = []
+        for i, path in enumerate(paths, 1):
+            parts.append(
+                f"--{boundary}\r\n"
+                "Content-Type: application/http\r\n"
+                f"Content-ID: {i}\r\n\r\n"
+                f"GET {path} HTTP/1.1\r\n\r\n"
+            )
+        parts.append(f"--{boundary}--\r\n")
+        return "".join(parts).encode(), f"multipart/mixed; boundary={boundary}"
+
+    async def test_batch_get_requests(self, client):
+        """Test dispatching several GETs in one batch."""
+        from email.parser import BytesParser
+        from email.policy import HTTP
+
+        files = {"files": ("batch.txt", b"Batch test", "text/plain")}
+        upload_response = await client.post(
+            "/api/files/upload", files=files, data={"session_id": "batch-session"}
+        )
+        file_id = upload_response.json()["files"][0]["file_id"]
+
+        body, content_type = self._batch_body([
+            f"/api/files/{file_id}/metadata",
+            "/api/files/session/batch-session",
+            "/api/files/stats",
+        ])
+        response = await client.post(
+            "/api/batch", content=body, headers={"Content-Type": content_type}
+        )
+
+        assert response.status_code == 200
+        envelope = f"Content-Type: {response.headers['content-type']}\r\n\r\n"
+        message = BytesParser(policy=HTTP).parsebytes(
+            envelope.encode() + response.content
+        )
+        parts = list(message.iter_parts())
+        assert len(parts) == 3
+        assert [p["Content-ID"] for p in parts] == [
+            "response-1", "response-2", "response-3"
+        ]
+        for part in parts:
+            assert part.get_payload(decode=True).startswith(b"HTTP/1.1 200")
+        assert file_id.encode() in parts[0].get_payload(decode=True)
+
+    async def test_batch_rejects_nested_batch(self, client):
+        """Test nested batches are refused, including absolute-URL targets."""
+        from email.parser import BytesParser
+        from email.policy import HTTP
+
+        body, content_type = self._batch_body([
+            "http://test/api/batch",
+            "/api/./batch",
+            "/api/files/stats",
+        ])
+        response = await client.post(
+            "/api/batch", content=body, headers={"Content-Type": content_type}
+        )
+
+        assert response.status_code == 200
+        envelope = f"Content-Type: {response.headers['content-type']}\r\n\r\n"
+        message = BytesParser(policy=HTTP).parsebytes(
+            envelope.encode() + response.content
+        )
+        statuses = [
+            p.get_payload(decode=True).split(b" ", 2)[1] for p in message.iter_parts()
+        ]
+        assert statuses == [b"400", b"400", b"200"]
+
+    async def test_batch_rejects_non_multipart(self, client):
+        """Test batch endpoint requires multipart/mixed."""
+        response = await client.post("/api/batch", json={})
+
+        assert response.status_code == 415
+
+
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
+
+
+# ============================================================
+# Storage Tests
+# ============================================================
+
+class TestUploadMany:
+    """Tests for FileStorage.upload_many."""
+
+    async def test_upload_many(self, tmp_path):
+        """Test uploading several files into one session."""
+        from api.storage import FileStorage, StorageConfig
+
+        storage = FileStorage(StorageConfig(base_dir=tmp_path))
+        results = await storage.upload_many(
+            [(b"one", "a.txt"), (io.BytesIO(b"two"), "b.csv")],
+            session_id="bulk",
+        )
+
+        assert [m.original_name for m in results] == ["a.txt", "b.csv"]
+        assert [m.size_bytes for m in results] == [3, 3]
+        files = await storage.list_session_files("bulk")
+        assert {m.file_id for m in files} == {m.file_id for m in results}
+        for m in results:
+            assert (tmp_path / ".metadata" / f"{m.file_id}.json").exists()
+
+    async def test_upload_many_validates_first(self, tmp_path):
+        """Test that a rejected file leaves nothing behind."""
+        from api.storage import FileStorage, StorageConfig, InvalidFileTypeError
+
+        storage = FileStorage(StorageConfig(base_dir=tmp_path))
+        with pytest.raises(InvalidFileTypeError):
+            await storage.upload_many(
+                [(b"ok", "ok.txt"), (b"bad", "bad.exe")],
+                session_id="bulk",
+            )
+
+        assert await storage.list_session_files("bulk") == []
+        assert not (tmp_path / "uploads" / "bulk").exists()
@@ -2,17 +2,18 @@
 
 import pytest
 from pathlib import Path
-import tempfile
+import json
 import os
 
 from cape.importers.skill import SkillImporter
 from cape.core.models import ExecutionType, SourceType
+from tests._util import write_skill
 
 
 class TestSkillImporter:
     """Tests for SkillImporter."""
 
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def importer(self):
         """Create SkillImporter instance."""
         return SkillImporter()
@@ -113,94 +114,110 @@ Use the scripts in the scripts/ directory to process PDFs.
         assert "analyze" in actions
         assert "generate" in actions
 
-    def test_import_skill_basic(self, importer, sample_skill_md):
+    def test_import_skill_basic(self, importer, sample_skill_md, tmp_path):
         """Test importing a basic skill."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            skill_dir = Path(tmpdir) / "code-review"
-            skill_dir.mkdir()
-            (skill_dir / "SKILL.md").write_text(sample_skill_md)
-
-            cape = importer.import_skill(skill_dir)
-
-            assert cape.id == "code-review"
-            assert cape.metadata.source == SourceType.SKILL
-            assert "review" in cape.description.lower()
-            assert cape.execution.type == ExecutionType.LLM
-            # Check Claude adapter has the skill body
-            assert cape.model_adapters is not None
-            assert "claude" in cape.model_adapters
-            assert "system_prompt" in cape.model_adapters["claude"]
-
-    def test_import_skill_with_scripts(self, importer, skill_with_scripts):
+        skill_dir = write_skill(tmp_path, "code-review", sample_skill_md)
+
+        cape = importer.import_skill(skill_dir)
+
+        assert cape.id == "code-review"
+        assert cape.metadata.source == SourceType.SKILL
+        assert "review" in cape.description.lower()
+        assert cape.execution.type == ExecutionType.LLM
+        # Check Claude adapter has the skill body
+        assert cape.model_adapters is not None
+        assert "claude" in cape.model_adapters
+        assert "system_prompt" in cape.model_adapters["claude"]
+
+    def test_import_skill_with_scripts(self, importer, skill_with_scripts, tmp_path):
         """Test importing a skill with scripts."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            skill_dir = Path(tmpdir) / "pdf-processing"
-            skill_dir.mkdir()
-            (skill_dir / "SKILL.md").write_text(skill_with_scripts)
+        skill_dir = write_skill(
+            tmp_path,
+            "pdf-processing",
+            skill_with_scripts,
+            scripts={
+                "extract_text.py": "# Extract text",
+                "extract_tables.py": "# Extract tables",
+            },
+        )
+
+        cape = importer.import_skill(skill_dir)
+
+        assert cape.id == "pdf-processing"
+        # Should detect as HYBRID due to scripts
+        assert cape.execution.type in [ExecutionType.LLM, ExecutionType.HYBRID]
+        assert ".pdf" in cape.metadata.tags
+
+    def test_import_all(self, importer, sample_skill_md, skill_with_scripts, tmp_path):
+        """Test importing all skills from directory."""
+        skills_dir = tmp_path
 
-            # Create scripts directory
-            scripts_dir = skill_dir / "scripts"
-            scripts_dir.mkdir()
-            (scripts_dir / "extract_text.py").write_text("# Extract text")
-            (scripts_dir / "extract_tables.py").write_text("# Extract tables")
+        write_skill(skills_dir, "code-review", sample_skill_md)
+        write_skill(skills_dir, "pdf-processing", skill_with_scripts)
 
-            cape = importer.import_skill(skill_dir)
+        capes = importer.import_all(skills_dir)
 
-            assert cape.id == "pdf-processing"
-            # Should detect as HYBRID due to scripts
-            assert cape.execution.type in [ExecutionType.LLM, ExecutionType.HYBRID]
-            assert ".pdf" in cape.metadata.tags
+        assert len(capes) == 2
+        ids = [c.id for c in capes]
+        assert "code-review" in ids
+        assert "pdf-processing" in ids
 
-    def test_import_all(self, importer, sample_skill_md, skill_with_scripts):
-        """Test importing all skills from directory."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            skills_dir = Path(tmpdir)
+    def test_import_all_uses_index(self, importer, sample_skill_md, tmp_path):
+        """Test a skills-dir index limits import to the listed skills."""
+        skills_dir = tmp_path
 
-            # Create code-review skill
-            review_dir = skills_dir / "code-review"
-            review_dir.mkdir()
-            (review_dir / "SKILL.md").write_text(sample_skill_md)
+        for name in ("code-review", "unlisted"):
+            write_skill(skills_dir, name, sample_skill_md)
+        (skills_dir / "_index.json").write_text('{"skills": ["code-review"]}')
 
-            # Create pdf-processing skill
-            pdf_dir = skills_dir / "pdf-processing"
-            pdf_dir.mkdir()
-            (pdf_dir / "SKILL.md").write_text(skill_with_scripts)
+        capes = importer.import_all(skills_dir)
 
-            capes = importer.import_all(skills_dir)
+        assert [c.id for c in capes] == ["code-review"]
 
-            assert len(capes) == 2
-            ids = [c.id for c in capes]
-            assert "code-review" in ids
-            assert "pdf-processing" in ids
+    def test_import_all_parallel_keeps_order(self, importer, tmp_path):
+        """Test parallel import keeps index order and skips broken skills."""
+        skills_dir = tmp_path
+
+        names = [f"skill-{i}" for i in range(6)]
+        for name in names:
+            write_skill(
+                skills_dir,
+                name,
+                f"---\nname: {name}\ndescription: Skill {name}\n---\n\n# {name}\n",
+            )
+        write_skill(skills_dir, "broken", "no frontmatter")
+        (skills_dir / "_index.json").write_text(
+            json.dumps({"skills": names[:3] + ["broken"] + names[3:]})
+        )
+
+        capes = importer.import_all(skills_dir, max_workers=4)
+
+        assert [c.id for c in capes] == names
 
     def test_import_nonexistent_skill(self, importer):
         """Test importing non-existent skill."""
         cape = importer.import_skill(Path("/nonexistent/path"))
         assert cape is None
 
-    def test_import_invalid_skill(self, importer):
+    def test_import_invalid_skill(self, importer, tmp_path):
         """Test importing invalid skill (no SKILL.md)."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            skill_dir = Path(tmpdir) / "invalid-skill"
-            skill_dir.mkdir()
-            # No SKILL.md file
+        skill_dir = tmp_path / "invalid-skill"
+        skill_dir.mkdir()
+        # No SKILL.md file
 
-            cape = importer.import_skill(skill_dir)
-            assert cape is None
+        cape = importer.import_skill(skill_dir)
+        assert cape is None
 
-    def test_metadata_preservation(self, importer, sample_skill_md):
+    def test_metadata_preservation(self, importer, sample_skill_md, tmp_path):
         """Test that skill metadata is preserved in Cape."""
-        with tempfile.TemporaryDirectory() as tmpdir:
-            skill_dir = Path(tmpdir) / "code-review"
-            skill_dir.mkdir()
-            (skill_dir / "SKILL.md").write_text(sample_skill_md)
+        skill_dir = write_skill(tmp_path, "code-review", sample_skill_md)
 
-            cape = importer.import_skill(skill_dir)
+        cape = importer.import_skill(skill_dir)
 
-            # License should be preserved
-            assert cape.metadata.license == "MIT"
-            # Allowed tools should be in metadata
-            assert "code" in cape.metadata.tags or "review" in cape.metadata.tags
+        # License should be preserved
+        assert cape.metadata.license == "MIT"
+        # Allowed tools should be in metadata
+        assert "code" in cape.metadata.tags or "review" in cape.metadata.tags
 
     def test_intent_extraction_quality(self, importer):
         """Test quality of intent extraction."""
@@ -222,11 +239,11 @@ Use the scripts in the scripts/ directory to process PDFs.
 class TestSkillImporterEdgeCases:
     """Edge case tests for SkillImporter."""
 
-    @pytest.fixture
+    @pytest.fixture(scope="module")
     def importer(self):
         return SkillImporter()
 
-    def test_empty_description(self, importer):
+    def test_empty_description(self, importer, tmp_path):
         """Test handling empty description."""
         skill_md = '''---
 name: empty-desc
@@ -235,16 +252,13 @@ description: ""
 
 # Empty Description Skill
 '''
-        with tempfile.TemporaryDirectory() as tmpdir:
-            skill_dir = Path(tmpdir) / "empty-desc"
-            skill_dir.mkdir()
-            (skill_dir / "SKILL.md").write_text(skill_md)
+        skill_dir = write_skill(tmp_path, "empty-desc", skill_md)
 
-            cape = importer.import_skill(skill_dir)
-            assert cape is not None
-            assert cape.id == "empty-desc"
+        cape = importer.import_skill(skill_dir)
+        assert cape is not None
+        assert cape.id == "empty-desc"
 
-    def test_missing_name(self, importer):
+    def test_missing_name(self, importer, tmp_path):
         """Test handling missing name in frontmatter."""
         skill_md = '''---
 description: A skill without a name
@@ -252,17 +266,14 @@ description: A skill without a name
 
 # Unnamed Skill
 '''
-        with tempfile.TemporaryDirectory() as tmpdir:
-            skill_dir = Path(tmpdir) / "unnamed"
-            skill_dir.mkdir()
-            (skill_dir / "SKILL.md").write_text(skill_md)
+        skill_dir = write_skill(tmp_path, "unnamed", skill_md)
 
-            cape = importer.import_skill(skill_dir)
-            # Should use directory name as fallback
-            assert cape is not None
-            assert cape.id == "unnamed"
+        cape = importer.import_skill(skill_dir)
+        # Should use directory name as fallback
+        assert cape is not None
+        assert cape.id == "unnamed"
 
-    def test_unicode_content(self, importer):
+    def test_unicode_content(self, importer, tmp_path):
         """Test handling unicode content."""
         skill_md = '''---
 name: unicode-skill
@@ -273,11 +284,8 @@ description: 处理中文内容的技能，支持日本語和한국어
 
 支持多语言内容处理。
 '''
-        with tempfile.TemporaryDirectory() as tmpdir:
-            skill_dir = Path(tmpdir) / "unicode-skill"
-            skill_dir.mkdir()
-            (skill_dir / "SKILL.md").write_text(skill_md, encoding="utf-8")
-
-            cape = importer.import_skill(skill_dir)
-            assert cape is not None
-            assert "中文" in cape.description
+        skill_dir = write_skill(tmp_path, "unicode-skill", skill_md)
+
+        cape = importer.import_skill(skill_dir)
+        assert cape is not None
+        assert "中文" in cape.description
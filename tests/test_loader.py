@@ -2,25 +2,20 @@
 Tests for the skill loader.
 """
 
-import tempfile
-from pathlib import Path
-
 import pytest
 
 from langchain_skills.core.loader import SkillLoader
 from langchain_skills.core.skill import LoadLevel, SkillType
+from tests._util import write_skill
 
 
-@pytest.fixture
-def temp_skills_dir():
-    """Create a temporary skills directory with test skills."""
-    with tempfile.TemporaryDirectory() as tmpdir:
-        skills_dir = Path(tmpdir)
+@pytest.fixture(scope="module")
+def temp_skills_dir(tmp_path_factory):
+    """Create a temporary skills directory with test skills (read-only)."""
+    skills_dir = tmp_path_factory.mktemp("skills")
 
-        # Create a simple instruction skill
-        instruction_skill = skills_dir / "test-instruction"
-        instruction_skill.mkdir()
-        (instruction_skill / "SKILL.md").write_text('''---
+    # A simple instruction skill
+    write_skill(skills_dir, "test-instruction", '''---
 name: test-instruction
 description: A test instruction skill for unit testing. Use when testing the skill loader.
 ---
@@ -30,11 +25,8 @@ description: A test instruction skill for unit testing. Use when testing the ski
 This is a test skill body.
 ''')
 
-        # Create a tool skill with scripts
-        tool_skill = skills_dir / "test-tool"
-        tool_skill.mkdir()
-        (tool_skill / "scripts").mkdir()
-        (tool_skill / "SKILL.md").write_text('''---
+    # A tool skill with scripts
+    write_skill(skills_dir, "test-tool", '''---
 name: test-tool
 description: A test tool skill with scripts. Processes .txt files.
 allowed-tools:
@@ -44,14 +36,10 @@ allowed-tools:
 # Test Tool Skill
 
 Use the scripts in this skill.
-''')
-        (tool_skill / "scripts" / "process.py").write_text('print("hello")')
+''', scripts={"process.py": 'print("hello")'})
 
-        # Create a knowledge skill with references
-        knowledge_skill = skills_dir / "test-knowledge"
-        knowledge_skill.mkdir()
-        (knowledge_skill / "references").mkdir()
-        (knowledge_skill / "SKILL.md").write_text('''---
+    # A knowledge skill with references
+    write_skill(skills_dir, "test-knowledge", '''---
 name: test-knowledge
 description: A test knowledge skill with reference documents.
 ---
@@ -59,10 +47,9 @@ description: A test knowledge skill with reference documents.
 # Test Knowledge Skill
 
 Refer to the documentation.
-''')
-        (knowledge_skill / "references" / "guide.md").write_text("# Guide\n\nSome content.")
+''', references={"guide.md": "# Guide\n\nSome content."})
 
-        yield skills_dir
+    return skills_dir
 
 
 class TestSkillLoader:
@@ -1,5 +1,7 @@
 """Tests for Cape registry and matcher."""
 
+import sys
+
 import pytest
 from pathlib import Path
 import tempfile
@@ -9,6 +11,36 @@ from cape.registry.matcher import CapeMatcher
 from cape.core.models import Cape, CapeExecution, CapeMetadata, ExecutionType, SourceType
 
 
+class FakeEncoder:
+    """
+    Stand-in for the sentence-transformers model.
+
+    ``vector(text)`` gives the embedding of one Cape text; a query string
+    gets ``query`` if set, else ``vector(query)``. Records the number of
+    encode() calls and the size of every batch.
+    """
+
+    def __init__(self, vector, query=None):
+        self.vector = vector
+        self.query = query
+        self.calls = 0
+        self.batches = []
+
+    @property
+    def texts(self):
+        """Total Cape texts encoded so far."""
+        return sum(self.batches)
+
+    def encode(self, texts):
+        import numpy as np
+
+        self.calls += 1
+        if isinstance(texts, str):
+            return self.vector(texts) if self.query is None else self.query
+        self.batches.append(len(texts))
+        return np.stack([self.vector(text) for text in texts])
+
+
 class TestCapeMatcher:
     """Tests for CapeMatcher."""
 
@@ -103,6 +135,198 @@ class TestCapeMatcher:
             assert "Cape:" in explanation
             assert "Score:" in explanation
 
+    def test_hybrid_match(self, matcher, sample_capes):
+        """Test BM25 + heuristic rank fusion."""
+        results = matcher.match_hybrid("extract tables from a pdf", sample_capes)
+
+        assert results[0]["cape"].id == "pdf-processor"
+        assert results[0]["match_type"] == "hybrid"
+        assert "bm25_rank" in results[0]["details"]
+        assert all(r["cape"].id != "code-analyzer" for r in results)
+
+    def test_hybrid_exact_id_first(self, matcher, sample_capes):
+        """Test exact ID matches lead hybrid results."""
+        results = matcher.match_hybrid("find bugs with code-analyzer", sample_capes)
+
+        assert results[0]["cape"].id == "code-analyzer"
+        assert results[0]["match_type"] == "exact"
+        assert [r["cape"].id for r in results].count("code-analyzer") == 1
+
+    def test_hybrid_reindexes_changed_capes(self, matcher, sample_capes):
+        """Test the full-text index follows the Cape set passed in."""
+        assert matcher.match_hybrid("schemas", sample_capes)
+        assert matcher.match_hybrid("schemas", sample_capes[1:]) == []
+
+    def test_add_updates_indexes_in_place(self, matcher, sample_capes):
+        """Test add() extends the full-text and phrase indexes incrementally."""
+        first, rest = sample_capes[:1], sample_capes[1:]
+        assert matcher.match_hybrid("validate json schemas", first)
+        assert matcher._contained_phrases("process json", first)
+        fts = matcher._fts
+
+        for cape in rest:
+            matcher.add(cape)
+
+        assert matcher._fts is fts
+        assert matcher._fts_ids == tuple(c.id for c in sample_capes)
+        results = matcher.match_hybrid("extract tables from a pdf", sample_capes)
+        assert results[0]["cape"].id == "pdf-processor"
+        assert matcher._contained_phrases("read a .pdf", sample_capes) == {
+            "pdf-processor": {".pdf"}
+        }
+
+    def test_index_accepts_iterable(self, sample_capes, tmp_path):
+        """Test index() consumes any iterable, e.g. a generator or dict view."""
+        np = pytest.importorskip("numpy")
+
+        matcher = CapeMatcher(use_embeddings=True, cache_dir=tmp_path)
+        matcher._model = FakeEncoder(lambda text: np.ones(4, dtype=np.float32))
+        matcher.index(cape for cape in sample_capes)
+
+        assert set(matcher._rows) == {c.id for c in sample_capes}
+
+        matcher.index({c.id: c for c in sample_capes[:1]}.values())
+        assert set(matcher._rows) == {sample_capes[0].id}
+
+    def test_add_defers_encoding_to_match(self, sample_capes, tmp_path):
+        """Test added Capes are encoded in one batch on the next semantic match."""
+        np = pytest.importorskip("numpy")
+
+        axes = iter(np.eye(3, dtype=np.float32))
+        matcher = CapeMatcher(use_embeddings=True, cache_dir=tmp_path)
+        matcher._model = FakeEncoder(
+            lambda text: next(axes),
+            query=np.array([0.0, 1.0, 0.0], dtype=np.float32),
+        )
+        for cape in sample_capes:
+            matcher.add(cape)
+
+        assert matcher._model.batches == []
+        scores = matcher._semantic_scores("anything", sample_capes)
+        assert matcher._model.batches == [3]
+        assert scores == pytest.approx(
+            {"code-analyzer": 0.0, "json-processor": 1.0, "pdf-processor": 0.0}
+        )
+        assert np.allclose(np.linalg.norm(matcher._matrix, axis=1), 1.0)
+
+    def test_matrix_grows_by_doubling(self, sample_capes, tmp_path):
+        """Test one-at-a-time adds reuse a doubling buffer for the matrix."""
+        np = pytest.importorskip("numpy")
+
+        axes = iter(np.eye(3, dtype=np.float32))
+        matcher = CapeMatcher(use_embeddings=True, cache_dir=tmp_path)
+        matcher._model = FakeEncoder(
+            lambda text: next(axes),
+            query=np.array([0.0, 0.0, 1.0], dtype=np.float32),
+        )
+        capacities = []
+        for cape in sample_capes:
+            matcher.add(cape)
+            matcher._semantic_scores("anything", sample_capes)
+            capacities.append(len(matcher._buffer))
+
+        assert capacities == [1, 2, 4]
+        assert matcher._matrix.shape == (3, 3)
+        assert matcher._matrix.flags["C_CONTIGUOUS"]
+        scores = matcher._semantic_scores("anything", sample_capes)
+        assert scores[sample_capes[2].id] == pytest.approx(1.0)
+        assert scores[sample_capes[0].id] == pytest.approx(0.0)
+
+    def test_contained_phrases(self, matcher, sample_capes, monkeypatch):
+        """Test phrase lookup with and without pyahocorasick agree."""
+        query = "please extract pdf text and process json from a .pdf"
+        expected = {
+            "pdf-processor": {"extract pdf text", ".pdf"},
+            "json-processor": {"process json"},
+        }
+
+        assert matcher._contained_phrases(query, sample_capes) == expected
+
+        monkeypatch.setitem(sys.modules, "ahocorasick", None)
+        fallback = CapeMatcher(use_embeddings=False)
+        assert fallback._contained_phrases(query, sample_capes) == expected
+
+    def test_embedding_cache_reused(self, sample_capes, tmp_path):
+        """Test embeddings are written to and reloaded from the disk cache."""
+        np = pytest.importorskip("numpy")
+
+        def ones(text):
+            return np.ones(4, dtype=np.float32)
+
+        first = CapeMatcher(use_embeddings=True, cache_dir=tmp_path)
+        first._model = FakeEncoder(ones)
+        first.index(sample_capes)
+
+        assert first._model.calls == 1
+        assert len(list(tmp_path.glob("*.npz"))) == 1
+
+        second = CapeMatcher(use_embeddings=True, cache_dir=tmp_path)
+        second._model = FakeEncoder(ones)
+        second.index(sample_capes)
+
+        assert second._model.calls == 0
+        assert set(second._rows) == {c.id for c in sample_capes}
+
+        # Changing one Cape only re-encodes that Cape
+        sample_capes[0].description = "Process JSON quickly"
+        third = CapeMatcher(use_embeddings=True, cache_dir=tmp_path)
+        third._model = FakeEncoder(ones)
+        third.index(sample_capes)
+
+        assert third._model.texts == 1
+        assert len(third._read_cache()) == len(sample_capes)
+
+    def test_embedding_cache_hit_skips_model_load(
+        self, sample_capes, tmp_path, monkeypatch
+    ):
+        """Test a warm cache does not load the embedding model at index time."""
+        np = pytest.importorskip("numpy")
+
+        warm = CapeMatcher(use_embeddings=True, cache_dir=tmp_path)
+        warm._model = FakeEncoder(lambda text: np.ones(4, dtype=np.float32))
+        warm.index(sample_capes)
+
+        def fail_load(self):
+            raise AssertionError("model should not be loaded on a cache hit")
+
+        monkeypatch.setattr(CapeMatcher, "_get_model", fail_load)
+        monkeypatch.setattr(
+            "importlib.util.find_spec", lambda name, *args: object()
+        )
+
+        cold = CapeMatcher(use_embeddings=True, cache_dir=tmp_path)
+        cold.index(sample_capes)
+
+        assert cold._model is None
+        assert cold.use_embeddings
+        assert set(cold._rows) == {c.id for c in sample_capes}
+
+
+    def test_semantic_scores_use_normalized_matrix(self, sample_capes, tmp_path):
+        """Test Capes are scored against one normalized float32 matrix."""
+        np = pytest.importorskip("numpy")
+
+        axes = iter(2 * np.eye(3, dtype=np.float32))
+        matcher = CapeMatcher(use_embeddings=True, cache_dir=tmp_path)
+        matcher._model = FakeEncoder(
+            lambda text: next(axes),
+            query=np.array([0.0, 3.0, 0.0], dtype=np.float32),
+        )
+        matcher.index(sample_capes)
+
+        assert matcher._matrix.dtype == np.float32
+        assert matcher._matrix.flags["C_CONTIGUOUS"]
+        assert np.allclose(np.linalg.norm(matcher._matrix, axis=1), 1.0)
+
+        # Rows follow sorted Cape ids: code-analyzer, json-processor, pdf-processor
+        scores = matcher._semantic_scores("anything", sample_capes)
+        assert scores == pytest.approx(
+            {"code-analyzer": 0.0, "json-processor": 1.0, "pdf-processor": 0.0}
+        )
+
+        results = matcher.match("zzz", sample_capes, threshold=0.0)
+        assert results[0]["cape"].id == "json-processor"
+        assert results[0]["details"]["semantic_score"] == pytest.approx(1.0)
 
 class TestCapeRegistry:
     """Tests for CapeRegistry."""
@@ -264,6 +488,33 @@ Instructions for the skill.
         assert len(json_capes) == 1
         assert json_capes[0].id == "cape1"
 
+    def test_filter_by_pack_cache_invalidation(self):
+        """Test pack filtering follows register/unregister."""
+        registry = CapeRegistry(auto_load=False)
+
+        def pack_cape(cape_id):
+            return Cape(
+                id=cape_id,
+                name=cape_id,
+                version="1.0.0",
+                description="Pack member",
+                metadata=CapeMetadata(tags=["pack:doc"]),
+                execution=CapeExecution(type=ExecutionType.TOOL),
+            )
+
+        registry.register(pack_cape("a"))
+        assert [c.id for c in registry.filter_by_pack("doc")] == ["a"]
+
+        registry.register(pack_cape("b"))
+        assert [c.id for c in registry.filter_by_pack("doc")] == ["a", "b"]
+
+        registry.unregister("a")
+        assert [c.id for c in registry.filter_by_pack("doc")] == ["b"]
+
+        # Callers get a copy of the cached list
+        registry.filter_by_pack("doc").clear()
+        assert len(registry.filter_by_pack("doc")) == 1
+
     def test_filter_by_source(self):
         """Test filtering by source."""
         registry = CapeRegistry(auto_load=False)
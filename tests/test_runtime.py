@@ -117,6 +117,40 @@ class TestCodeExecutor:
         assert result.success is False
         assert "division" in result.error.lower() or "zero" in result.error.lower()
 
+    def test_compiled_code_cached_and_bounded(self, executor, monkeypatch):
+        """Test Cape code is compiled once per source and the cache is bounded."""
+        from cape.runtime import executors
+
+        monkeypatch.setattr(executors, "_CODE_CACHE", executors.OrderedDict())
+        monkeypatch.setattr(executors, "_CODE_CACHE_MAXSIZE", 2)
+
+        def make_cape(code):
+            return Cape(
+                id="test-cached",
+                name="Test Cached",
+                version="1.0.0",
+                description="Test",
+                execution=CapeExecution(
+                    type=ExecutionType.CODE,
+                    language="python",
+                    code=code,
+                ),
+            )
+
+        cape = make_cape("result = inputs['x'] + 1")
+        for x in (1, 2):
+            result = asyncio.run(executor.execute(cape, {"x": x}, ExecutionContext()))
+            assert result.output == x + 1
+        assert len(executors._CODE_CACHE) == 1
+
+        # Same id and version with new code is recompiled, never served stale
+        changed = make_cape("result = inputs['x'] * 10")
+        result = asyncio.run(executor.execute(changed, {"x": 2}, ExecutionContext()))
+        assert result.output == 20
+
+        asyncio.run(executor.execute(make_cape("result = 0"), {}, ExecutionContext()))
+        assert len(executors._CODE_CACHE) == 2
+
 
 class TestToolExecutor:
     """Tests for ToolExecutor."""
@@ -297,6 +331,40 @@ class TestCapeRuntime:
         # Context should be preserved
         assert ctx.trace_id == "test-trace-123"
 
+    def test_deterministic_results_cached(self, runtime, monkeypatch):
+        """Test deterministic Capes are served from the result cache."""
+        cape = Cape(
+            id="pure-cape",
+            name="Pure Cape",
+            version="1.0.0",
+            description="Same inputs, same output",
+            execution=CapeExecution(
+                type=ExecutionType.CODE,
+                language="python",
+                code="result = {'double': inputs['n'] * 2}",
+                deterministic=True,
+            ),
+        )
+        runtime.registry.register(cape)
+
+        executor = runtime._executors[ExecutionType.CODE]
+        calls = []
+
+        async def counting_execute(*args, **kwargs):
+            calls.append(args)
+            return await CodeExecutor.execute(executor, *args, **kwargs)
+
+        monkeypatch.setattr(executor, "execute", counting_execute)
+
+        first = asyncio.run(runtime.execute("pure-cape", {"n": 1}))
+        first.output["double"] = 99
+        again = asyncio.run(runtime.execute("pure-cape", {"n": 1}))
+        other = asyncio.run(runtime.execute("pure-cape", {"n": 2}))
+
+        assert len(calls) == 2
+        assert again.output == {"double": 2}
+        assert other.output == {"double": 4}
+
     def test_get_metrics(self, runtime_with_cape):
         """Test getting runtime metrics."""
         # Execute a few times
@@ -5,6 +5,8 @@ Tests ProcessSandbox and InProcessSandbox implementations.
 """
 
 import asyncio
+import os
+import sys
 import pytest
 from pathlib import Path
 
@@ -37,6 +39,19 @@ class TestProcessSandbox:
         yield sandbox
         await sandbox.cleanup()
 
+    @pytest.fixture
+    async def worker_sandbox(self):
+        """Create a ProcessSandbox that reuses warm workers."""
+        config = SandboxConfig(
+            type=SandboxType.PROCESS,
+            timeout_seconds=10,
+            worker_max_uses=50,
+        )
+        sandbox = ProcessSandbox(config)
+        await sandbox.setup()
+        yield sandbox
+        await sandbox.cleanup()
+
     @pytest.mark.asyncio
     async def test_simple_code_execution(self, sandbox):
         """Test basic code execution."""
@@ -59,6 +74,18 @@ class TestProcessSandbox:
         assert response.success
         assert response.output == 30
 
+    @pytest.mark.asyncio
+    async def test_json_literal_args(self, sandbox):
+        """Test args with JSON-only literals (true/false/null) and unicode."""
+        args = {"flag": True, "off": False, "missing": None, "name": "数据"}
+        response = await sandbox.execute(ExecutionRequest(
+            code="result = args",
+            args=args,
+        ))
+
+        assert response.success
+        assert response.output == args
+
     @pytest.mark.asyncio
     async def test_code_with_imports(self, sandbox):
         """Test code with standard library imports."""
@@ -164,6 +191,331 @@ result = "Done"
         assert response.success
         assert "Error message" in response.stderr
 
+    @pytest.mark.asyncio
+    async def test_worker_reused(self, worker_sandbox):
+        """Test executions share a warm worker but not globals or env."""
+        first = await worker_sandbox.execute(ExecutionRequest(
+            code="import os; marker = 1; result = (os.getpid(), os.environ.get('FOO'))",
+            env={"FOO": "bar"},
+        ))
+        second = await worker_sandbox.execute(ExecutionRequest(
+            code=(
+                "import os; "
+                "result = (os.getpid(), os.environ.get('FOO'), 'marker' in dir())"
+            ),
+        ))
+
+        assert first.success and second.success
+        assert first.output[0] == second.output[0]
+        assert first.output[1] == "bar"
+        assert second.output[1:] == [None, False]
+
+    @pytest.mark.asyncio
+    async def test_worker_with_threads_retired(self, worker_sandbox):
+        """Test a run that leaves a thread running does not reuse its worker."""
+        first = await worker_sandbox.execute(ExecutionRequest(
+            code=(
+                "import os, threading, time\n"
+                "threading.Thread(target=time.sleep, args=(30,), daemon=True).start()\n"
+                "result = os.getpid()"
+            ),
+        ))
+        second = await worker_sandbox.execute(ExecutionRequest(
+            code="import os; result = os.getpid()"
+        ))
+
+        assert first.success and second.success
+        assert first.output != second.output
+
+    @pytest.mark.asyncio
+    async def test_fresh_interpreter_by_default(self, sandbox):
+        """Test the default config does not carry interpreter state over."""
+        await sandbox.execute(ExecutionRequest(
+            code="import builtins; builtins.leaked = True"
+        ))
+        response = await sandbox.execute(ExecutionRequest(
+            code="import builtins; result = hasattr(builtins, 'leaked')"
+        ))
+
+        assert response.success
+        assert response.output is False
+
+    @pytest.mark.asyncio
+    async def test_workers_started_ahead_of_use(self):
+        """Test setup() and worker retirement boot the next worker early."""
+        config = SandboxConfig(type=SandboxType.PROCESS, worker_max_uses=1)
+        eager_sandbox = ProcessSandbox(config)
+        await eager_sandbox.setup()
+
+        try:
+            for _ in range(2):
+                [idle] = eager_sandbox._idle_workers
+                response = await eager_sandbox.execute(ExecutionRequest(
+                    code="import os; result = os.getpid()"
+                ))
+                assert response.output == idle.process.pid
+                assert not idle.alive
+        finally:
+            await eager_sandbox.cleanup()
+
+    @pytest.mark.asyncio
+    async def test_worker_replaced_after_timeout(self):
+        """Test a timed-out worker is killed and the next run gets a new one."""
+        config = SandboxConfig(
+            type=SandboxType.PROCESS, timeout_seconds=1, worker_max_uses=50
+        )
+        short_sandbox = ProcessSandbox(config)
+        await short_sandbox.setup()
+
+        try:
+            response = await short_sandbox.execute(ExecutionRequest(
+                code="while True: pass"
+            ))
+            assert not response.success
+
+            response = await short_sandbox.execute(ExecutionRequest(
+                code="result = 'ok'"
+            ))
+            assert response.success
+            assert response.output == "ok"
+        finally:
+            await short_sandbox.cleanup()
+
+    @pytest.mark.asyncio
+    async def test_cancelled_run_discards_worker(self, worker_sandbox):
+        """Test cancelling execute() kills the worker instead of reusing it."""
+        sandbox = worker_sandbox
+        task = asyncio.ensure_future(sandbox.execute(ExecutionRequest(
+            code="import time; time.sleep(0.5); result = 'stale'"
+        )))
+        await asyncio.sleep(0.2)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert not sandbox._idle_workers
+
+        response = await sandbox.execute(ExecutionRequest(code="result = 'fresh'"))
+        assert response.success
+        assert response.output == "fresh"
+
+    @pytest.mark.asyncio
+    @pytest.mark.skipif(sys.platform == "win32", reason="POSIX process groups")
+    @pytest.mark.parametrize("worker_max_uses", [50, 0])
+    async def test_timeout_kills_child_processes(self, tmp_path, worker_max_uses):
+        """Test a timeout kills subprocesses the script started, not just Python."""
+        config = SandboxConfig(
+            type=SandboxType.PROCESS,
+            timeout_seconds=1,
+            worker_max_uses=worker_max_uses,
+        )
+        short_sandbox = ProcessSandbox(config)
+        await short_sandbox.setup()
+        pid_file = tmp_path / "child.pid"
+
+        try:
+            response = await short_sandbox.execute(ExecutionRequest(
+                code="""
+import subprocess, sys, time
+from pathlib import Path
+child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(60)"])
+Path(args["pid_file"]).write_text(str(child.pid))
+time.sleep(60)
+""",
+                args={"pid_file": str(pid_file)},
+            ))
+            assert not response.success
+
+            child_pid = int(pid_file.read_text())
+            # The orphan is reparented to init, which reaps it shortly
+            for _ in range(50):
+                try:
+                    os.kill(child_pid, 0)
+                except ProcessLookupError:
+                    break
+                await asyncio.sleep(0.1)
+            else:
+                pytest.fail("child process survived the timeout")
+        finally:
+            await short_sandbox.cleanup()
+
+    @pytest.mark.asyncio
+    async def test_work_dir_on_shm(self, tmp_path, monkeypatch):
+        """Test auto-created work dirs go on the RAM filesystem when it has room."""
+        from cape.runtime.sandbox import process_sandbox
+
+        monkeypatch.setattr(process_sandbox, "SHM_DIR", str(tmp_path))
+        monkeypatch.setattr(process_sandbox, "SHM_MIN_FREE_BYTES", 0)
+        shm_sandbox = ProcessSandbox(SandboxConfig(type=SandboxType.PROCESS))
+        await shm_sandbox.setup()
+        try:
+            assert shm_sandbox.work_dir.parent == tmp_path
+        finally:
+            await shm_sandbox.cleanup()
+
+        monkeypatch.setattr(process_sandbox, "SHM_DIR", str(tmp_path / "missing"))
+        assert process_sandbox._default_work_root() is None
+
+    @pytest.mark.asyncio
+    async def test_fresh_process_per_execute(self):
+        """Test worker_max_uses=0 starts a new interpreter every time."""
+        config = SandboxConfig(type=SandboxType.PROCESS, worker_max_uses=0)
+        fresh_sandbox = ProcessSandbox(config)
+        await fresh_sandbox.setup()
+
+        try:
+            pids = [
+                (await fresh_sandbox.execute(ExecutionRequest(
+                    code="import os; result = os.getpid()"
+                ))).output
+                for _ in range(2)
+            ]
+            assert pids[0] != pids[1]
+
+            response = await fresh_sandbox.execute(ExecutionRequest(
+                code="import sys; print('out'); print('err', file=sys.stderr)"
+            ))
+            assert response.stdout == "out\n"
+            assert "err" in response.stderr
+            assert "_stdout.txt" not in response.files_created
+        finally:
+            await fresh_sandbox.cleanup()
+
+
+# ============================================================
+# DockerSandboxPool Tests
+# ============================================================
+
+class TestDockerSandboxPool:
+    """Tests for DockerSandboxPool bookkeeping (containers faked out)."""
+
+    @pytest.fixture
+    def failing(self):
+        """Names of the fake sandbox methods that should raise."""
+        return set()
+
+    @pytest.fixture
+    def started(self, monkeypatch, failing):
+        """Replace DockerSandbox with a fake; returns every fake started."""
+        from cape.runtime.sandbox import docker_sandbox
+
+        started = []
+
+        class FakeSandbox:
+            def __init__(self, config):
+                self.config = config
+                self.client = object()
+                self.resets = 0
+                self.cleaned = False
+                started.append(self)
+
+            async def setup(self):
+                if "setup" in failing:
+                    raise RuntimeError("container failed to start")
+
+            async def reset_workdir(self):
+                if "reset_workdir" in failing:
+                    raise RuntimeError("workspace reset failed")
+                self.resets += 1
+
+            async def cleanup(self):
+                self.cleaned = True
+
+        monkeypatch.setattr(docker_sandbox, "DockerSandbox", FakeSandbox)
+        return started
+
+    @pytest.mark.asyncio
+    async def test_start_shares_client(self, started):
+        """Test every container is started up front with one Docker client."""
+        from cape.runtime.sandbox import DockerSandboxPool
+
+        async with DockerSandboxPool(SandboxConfig(), size=3):
+            assert len(started) == 3
+            assert started[0].config.docker_client is None
+            assert {id(s.config.docker_client) for s in started[1:]} == {
+                id(started[0].client)
+            }
+
+        assert all(s.cleaned for s in started)
+
+    @pytest.mark.asyncio
+    async def test_release_resets_then_recycles(self, started):
+        """Test released sandboxes are reset, and replaced after max_uses."""
+        from cape.runtime.sandbox import DockerSandboxPool
+
+        async with DockerSandboxPool(SandboxConfig(), size=1, max_uses=2) as pool:
+            first = await pool.acquire()
+            await pool.release(first)
+            assert first.resets == 1
+
+            assert await pool.acquire() is first
+            await pool.release(first)
+            assert first.cleaned
+
+            second = await pool.acquire()
+            assert second is not first
+            assert started == [first, second]
+
+    @pytest.mark.asyncio
+    async def test_failed_reset_replaces_sandbox(self, started, failing):
+        """Test a sandbox whose reset fails is torn down and replaced."""
+        from cape.runtime.sandbox import DockerSandboxPool
+
+        async with DockerSandboxPool(SandboxConfig(), size=1) as pool:
+            first = await pool.acquire()
+            failing.add("reset_workdir")
+            await pool.release(first)
+
+            assert first.cleaned
+            second = await pool.acquire()
+            assert second is not first
+            assert started == [first, second]
+
+    @pytest.mark.asyncio
+    async def test_failed_replacement_empties_pool(self, started, failing):
+        """Test acquire() fails instead of hanging once every container is lost."""
+        from cape.runtime.sandbox import DockerSandboxPool
+
+        async with DockerSandboxPool(SandboxConfig(), size=2, max_uses=1) as pool:
+            first = await pool.acquire()
+            second = await pool.acquire()
+            waiter = asyncio.ensure_future(pool.acquire())
+            failing.add("setup")
+
+            await pool.release(first)
+            assert not waiter.done()
+            await pool.release(second)
+
+            assert first.cleaned and second.cleaned
+            with pytest.raises(RuntimeError, match="no containers left"):
+                await asyncio.wait_for(waiter, timeout=1)
+            with pytest.raises(RuntimeError, match="no containers left"):
+                await pool.acquire()
+
+
+class TestDockerImageCheck:
+    """Tests for the Docker image freshness check (no Docker needed)."""
+
+    def test_current_image_remembered(self, monkeypatch):
+        """Test an up-to-date image is inspected once per process."""
+        from types import SimpleNamespace
+        from cape.runtime.sandbox import docker_sandbox
+
+        monkeypatch.setattr(docker_sandbox, "_current_images", set())
+        labels = {docker_sandbox.BUILD_HASH_LABEL: "stale"}
+        inspected = []
+
+        def get(name):
+            inspected.append(name)
+            return SimpleNamespace(labels=labels)
+
+        client = SimpleNamespace(images=SimpleNamespace(get=get))
+
+        assert not docker_sandbox._image_is_current(client, "img")
+        labels[docker_sandbox.BUILD_HASH_LABEL] = docker_sandbox.image_build_hash()
+        assert docker_sandbox._image_is_current(client, "img")
+        assert docker_sandbox._image_is_current(client, "img")
+        assert inspected == ["img", "img"]
+
 
 # ============================================================
 # InProcessSandbox Tests
@@ -212,6 +564,21 @@ class TestInProcessSandbox:
         assert not response.success
         assert response.error is not None
 
+    @pytest.mark.asyncio
+    async def test_args_by_reference_and_code_cached(self, sandbox):
+        """Test args reach the code uncopied and reruns skip compilation."""
+        from cape.runtime.sandbox.inprocess_sandbox import _compile
+
+        data = {"items": [1, 2]}
+        code = "args['items'].append(3)\nresult = len(args['items'])"
+        misses = _compile.cache_info().misses
+        for expected in (3, 4):
+            response = await sandbox.execute(ExecutionRequest(code=code, args=data))
+            assert response.output == expected
+
+        assert data["items"] == [1, 2, 3, 3]
+        assert _compile.cache_info().misses == misses + 1
+
 
 # ============================================================
 # SandboxManager Tests
@@ -259,6 +626,82 @@ class TestSandboxManager:
 
         await manager.release_all()
 
+    @pytest.mark.asyncio
+    async def test_concurrent_get_creates_once(self, monkeypatch):
+        """Test concurrent lookups of a new ID share one sandbox."""
+        manager = SandboxManager(SandboxConfig(type=SandboxType.INPROCESS))
+        created = []
+
+        class SlowSetupSandbox(InProcessSandbox):
+            async def setup(self):
+                created.append(self)
+                await asyncio.sleep(0.01)
+                await super().setup()
+
+        monkeypatch.setattr(manager, "_create_sandbox", SlowSetupSandbox)
+
+        sandboxes = await asyncio.gather(
+            *(manager.get_sandbox("shared") for _ in range(5))
+        )
+
+        assert all(s is sandboxes[0] for s in sandboxes)
+        assert len(created) == 1
+        assert manager.get_sandbox_count() == 1
+
+        await manager.release_all()
+
+    @pytest.mark.asyncio
+    async def test_concurrent_get_different_ids_not_serialized(self, monkeypatch):
+        """Test setting up one ID does not block setting up another."""
+        manager = SandboxManager(SandboxConfig(type=SandboxType.INPROCESS))
+        b_started = asyncio.Event()
+
+        class WaitingSandbox(InProcessSandbox):
+            async def setup(self):
+                if self.config.timeout_seconds == 1:
+                    # Would deadlock if "b" had to wait for "a" to finish
+                    await asyncio.wait_for(b_started.wait(), timeout=5)
+                else:
+                    b_started.set()
+                await super().setup()
+
+        monkeypatch.setattr(manager, "_create_sandbox", WaitingSandbox)
+
+        await asyncio.gather(
+            manager.get_sandbox("a", SandboxConfig(timeout_seconds=1)),
+            manager.get_sandbox("b", SandboxConfig(timeout_seconds=2)),
+        )
+
+        assert sorted(manager.list_sandboxes()) == ["a", "b"]
+
+        await manager.release_all()
+
+    @pytest.mark.asyncio
+    async def test_failed_setup_propagates_to_waiters(self, monkeypatch):
+        """Test waiters on a failing setup get its error and can retry."""
+        manager = SandboxManager(SandboxConfig(type=SandboxType.INPROCESS))
+
+        class FailingSandbox(InProcessSandbox):
+            async def setup(self):
+                await asyncio.sleep(0.01)
+                raise RuntimeError("setup failed")
+
+        monkeypatch.setattr(manager, "_create_sandbox", FailingSandbox)
+
+        results = await asyncio.gather(
+            *(manager.get_sandbox("broken") for _ in range(3)),
+            return_exceptions=True,
+        )
+
+        assert all(isinstance(r, RuntimeError) for r in results)
+        assert manager.get_sandbox_count() == 0
+
+        monkeypatch.setattr(manager, "_create_sandbox", InProcessSandbox)
+        await manager.get_sandbox("broken")
+        assert manager.get_sandbox_count() == 1
+
+        await manager.release_all()
+
     @pytest.mark.asyncio
     async def test_multiple_sandboxes(self):
         """Test managing multiple sandboxes."""
@@ -307,9 +750,10 @@ result = "Data created"
             response2 = await sandbox.execute(ExecutionRequest(
                 code="""
 import json
+from statistics import fmean
 with open("data.json") as f:
     data = json.load(f)
-avg_score = sum(d["score"] for d in data) / len(data)
+avg_score = fmean(d["score"] for d in data)
 result = {"average_score": avg_score, "count": len(data)}
 """,
                 files={"data.json": response.files_created.get("data.json", b"[]")},
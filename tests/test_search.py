@@ -0,0 +1,198 @@
+"""Tests for the built-in web search tool."""
+
+import sys
+
+import pytest
+
+import cape.tools  # noqa: F401  (cape.tools.search is shadowed by the function)
+
+search_module = sys.modules["cape.tools.search"]
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    """Isolate tests from each other's cached provider responses."""
+    search_module.clear_search_cache()
+    yield
+    search_module.clear_search_cache()
+
+
+class TestSearchBatch:
+    """Tests for search_batch."""
+
+    @pytest.fixture
+    def calls(self, monkeypatch):
+        """Replace the network search with a recording stub."""
+        seen = []
+
+        def fake_search(query, max_results=5, provider=None, **kwargs):
+            seen.append(query)
+            return {"success": True, "query": query, "results": []}
+
+        monkeypatch.setattr(search_module, "search", fake_search)
+        return seen
+
+    def test_results_in_input_order(self, calls):
+        """Test results line up with the input queries."""
+        queries = ["alpha", "beta", "gamma"]
+
+        results = search_module.search_batch(queries)
+
+        assert [r["query"] for r in results] == queries
+        assert sorted(calls) == sorted(queries)
+
+    def test_duplicate_queries_searched_once(self, calls):
+        """Test duplicate queries share a single search."""
+        results = search_module.search_batch(["alpha", "beta", "alpha"])
+
+        assert len(results) == 3
+        assert results[0] == results[2]
+        assert results[0] is not results[2]
+        assert sorted(calls) == ["alpha", "beta"]
+
+    def test_empty_batch(self, calls):
+        """Test an empty batch returns no results."""
+        assert search_module.search_batch([]) == []
+        assert calls == []
+
+
+class TestDetectLanguage:
+    """Tests for query language detection."""
+
+    @pytest.mark.parametrize("query,expected", [
+        ("python tutorial", "en"),
+        ("", "en"),
+        ("café menu", "en"),
+        ("北京天气", "zh"),
+        ("ひらがな", "ja"),
+        ("カタカナ", "ja"),
+        ("한국어 검색", "ko"),
+        ("カタカナと漢字", "zh"),
+        ("한국 カタカナ", "ja"),
+    ])
+    def test_detect_language(self, query, expected):
+        """Test each supported script is detected."""
+        assert search_module._detect_language(query) == expected
+
+
+class TestSearchWebSummary:
+    """Tests for the search_web summary text."""
+
+    def _run(self, monkeypatch, **result):
+        monkeypatch.setattr(
+            search_module, "search", lambda *a, **kw: {"success": True, **result}
+        )
+        return search_module.search_web("query")["summary"]
+
+    def test_summary_with_answer(self, monkeypatch):
+        """Test the AI answer is placed before the result list."""
+        results = [{"title": f"T{i}", "url": "", "snippet": "body"} for i in range(5)]
+
+        summary = self._run(monkeypatch, answer="42", results=results)
+
+        assert summary == (
+            "AI 摘要: 42\n\n找到 5 条结果:\n"
+            "1. T0: body...\n2. T1: body...\n3. T2: body..."
+        )
+
+    def test_summary_truncates_snippets(self, monkeypatch):
+        """Test snippets are cut to SNIPPET_CHARS."""
+        results = [{"title": "T", "url": "", "snippet": "x" * 500}]
+
+        summary = self._run(monkeypatch, results=results)
+
+        assert summary == "找到 1 条结果:\n1. T: " + "x" * 200 + "..."
+
+
+class TestSearchCache:
+    """Tests for provider response caching."""
+
+    @pytest.fixture
+    def providers(self, monkeypatch):
+        """Stub both providers: Tavily fails, DuckDuckGo succeeds."""
+        calls = {"tavily": 0, "duckduckgo": 0}
+
+        def fake_tavily(query, **kwargs):
+            calls["tavily"] += 1
+            raise RuntimeError("Tavily search failed: rate limited")
+
+        def fake_ddg(query, **kwargs):
+            calls["duckduckgo"] += 1
+            return {
+                "success": True,
+                "provider": "duckduckgo",
+                "query": query,
+                "results": [],
+            }
+
+        monkeypatch.setattr(search_module, "_tavily_search", fake_tavily)
+        monkeypatch.setattr(search_module, "_ddg_search", fake_ddg)
+        return calls
+
+    def test_success_is_cached(self, providers):
+        """Test a repeated query is served from cache."""
+        ddg = search_module.SearchProvider.DUCKDUCKGO
+        first = search_module.search("python", provider=ddg)
+        second = search_module.search("python", provider=ddg)
+
+        assert first == second
+        assert first is not second
+        assert providers["duckduckgo"] == 1
+
+    def test_cached_result_not_shared(self, monkeypatch):
+        """Test mutating a returned result does not change the next hit."""
+        monkeypatch.setattr(search_module, "_ddg_search", lambda query, **kwargs: {
+            "success": True,
+            "provider": "duckduckgo",
+            "query": query,
+            "results": [{"title": "original"}],
+        })
+        ddg = search_module.SearchProvider.DUCKDUCKGO
+
+        for _ in range(2):
+            result = search_module.search("python", provider=ddg)
+            assert result["results"] == [{"title": "original"}]
+            result["results"][0]["title"] = "MUTATED"
+            result["results"].append({"title": "extra"})
+
+    def test_failure_cached_per_provider(self, providers):
+        """Test a failing provider is skipped while the fallback still runs."""
+        for _ in range(3):
+            result = search_module.search("python")
+            assert result["provider"] == "duckduckgo"
+
+        assert providers["tavily"] == 1
+        assert providers["duckduckgo"] == 1
+
+    def test_failure_expires(self, providers, monkeypatch):
+        """Test failures are retried once their TTL has passed."""
+        monkeypatch.setattr(search_module, "SEARCH_CACHE_TTL_ERR", 0.0)
+
+        search_module.search("python")
+        search_module.search("python")
+
+        assert providers["tavily"] == 2
+
+
+class TestTavilySearch:
+    def test_missing_result_fields_defaulted(self, monkeypatch):
+        """Test a Tavily result without some fields is kept, not a failure."""
+        class FakeTavilyClient:
+            def __init__(self, api_key):
+                pass
+
+            def search(self, **kwargs):
+                return {"results": [
+                    {"title": "Full", "url": "https://a", "content": "x", "score": 0.9},
+                    {"title": "No score", "url": "https://b"},
+                ]}
+
+        monkeypatch.setenv("TAVILY_API_KEY", "test")
+        monkeypatch.setattr(search_module, "_load_tavily", lambda: FakeTavilyClient)
+
+        result = search_module._tavily_search("python")
+
+        assert result["success"]
+        assert result["results"][1] == {
+            "title": "No score", "url": "https://b", "snippet": "", "score": 0,
+        }